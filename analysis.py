@@ -0,0 +1,5 @@
+from srt_test_runner.analysis import main
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+from srt_test_runner.cli import main
+
+
+if __name__ == '__main__':
+    main()
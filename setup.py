@@ -0,0 +1,23 @@
+import setuptools
+
+
+setuptools.setup(
+    name='srt-test-runner',
+    version='0.1.0',
+    description='Script designed to run SRT tests',
+    python_requires='>=3.6',
+    # Scripts in the root of the repository are not installed, they only
+    # run the modules of the package when it is not installed
+    packages=['srt_test_runner'],
+    install_requires=[
+        'attrs>=19.1.0',
+        'click>=7.0',
+        'fabric>=2.4.0',
+        'paramiko>=2.6.0',
+    ],
+    entry_points={
+        'console_scripts': [
+            'srt-test-runner=srt_test_runner.cli:main',
+        ],
+    },
+)
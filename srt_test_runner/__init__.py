@@ -0,0 +1,5 @@
+"""
+Scripts designed to run SRT tests. The scripts in the root of
+the repository (perform_test.py, etc.) run the modules of this package,
+so that they can be used without installing it.
+"""
@@ -0,0 +1,341 @@
+import configparser
+import itertools
+import json
+import logging
+import pathlib
+import random
+import statistics
+import typing
+
+import attr
+
+from srt_test_runner import generators
+from srt_test_runner import perform_test
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Metrics compared: name -> True if higher is better
+METRICS = {
+    'send_rate': True,
+    'extra_time': False,
+    'rtt_p99': False,
+}
+# Tests whose generator points can be compared
+TESTS = ['bw_loop_test', 'filecc_loop_test']
+BUILDS = ['A', 'B']
+# Up to this number of pairs all the sign flips are enumerated,
+# random ones are sampled above it
+EXACT_PERMUTATION_PAIRS = 16
+PERMUTATION_SAMPLES = 20000
+
+
+@attr.s
+class ABTestConfig:
+    """
+    A/B test config: build A is the one from `global` section, build B
+    is specified within `ab-test` section. Experiments of the `test`
+    generator are run for both builds alternately.
+    """
+    test: str = attr.ib()
+    b_snd_path_to_srt: str = attr.ib()
+    b_rcv_path_to_srt: str = attr.ib()
+    b_algdescr: str = attr.ib()
+    # Pairs of runs (one run of each build) per generator point. With
+    # less than 6 pairs no change is significant at 0.05 level
+    runs: int = attr.ib(default=6)
+    # Significance level of the paired permutation test
+    alpha: float = attr.ib(default=0.05)
+    # Relative change (percent) of a metric starting from which
+    # a significant change is reported
+    threshold: float = attr.ib(default=5)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        section = parsed_config['ab-test']
+        default = cls('', '', '', '')
+        config = cls(
+            section['test'],
+            section['b_snd_path_to_srt'],
+            section['b_rcv_path_to_srt'],
+            section['b_algdescr'],
+            section.getint('runs', default.runs),
+            section.getfloat('alpha', default.alpha),
+            section.getfloat('threshold', default.threshold)
+        )
+        if config.test not in TESTS:
+            raise ValueError(f'ab-test: test {config.test}, expected one of {TESTS}')
+        if config.runs < 1:
+            raise ValueError(f'ab-test: runs {config.runs}, expected at least 1')
+        return config
+
+    def build_b(self, global_config):
+        """
+        Returns:
+            Global config of build B.
+        """
+        return attr.evolve(
+            global_config,
+            snd_path_to_srt=self.b_snd_path_to_srt,
+            rcv_path_to_srt=self.b_rcv_path_to_srt,
+            algdescr=self.b_algdescr
+        )
+
+
+def run_order(run: int):
+    """
+    Returns:
+        The order of builds in pair `run`: ABBA..., so that a linear
+        drift of the path affects both builds equally.
+    """
+    return BUILDS if run % 2 == 0 else list(reversed(BUILDS))
+
+
+def metric_values(exper_result):
+    """
+    Returns:
+        A dictionary {metric: value or None} of `METRICS` from
+        an experiment result (`perform_test.ExperimentResult`).
+    """
+    rtt = exper_result.latencies.get('rtt') if exper_result.latencies else None
+    return {
+        'send_rate': exper_result.send_rate,
+        'extra_time': exper_result.extra_time,
+        'rtt_p99': rtt.p99 if rtt is not None else None,
+    }
+
+
+def paired_permutation_test(values_a: typing.List[float], values_b: typing.List[float]):
+    """
+    Two-sided paired permutation (sign-flip) test of the mean difference
+    of B and A. It makes no assumption about the distribution, which
+    matters for a few runs of extra time.
+
+    Returns:
+        p-value.
+    """
+    differences = [b - a for a, b in zip(values_a, values_b)]
+    observed = abs(sum(differences))
+    if observed == 0:
+        return 1.0
+
+    if len(differences) <= EXACT_PERMUTATION_PAIRS:
+        signs = itertools.product((1, -1), repeat=len(differences))
+        samples = 2 ** len(differences)
+    else:
+        rng = random.Random(0)
+        signs = (
+            [rng.choice((1, -1)) for _ in differences]
+            for _ in range(PERMUTATION_SAMPLES)
+        )
+        samples = PERMUTATION_SAMPLES
+    # A small tolerance, so that the observed assignment itself is
+    # counted despite floating point errors
+    extreme = sum(
+        1 for sign in signs
+        if abs(sum(s * d for s, d in zip(sign, differences))) >= observed - 1e-12
+    )
+    if len(differences) > EXACT_PERMUTATION_PAIRS:
+        # The observed assignment is counted as one of the samples
+        return (extreme + 1) / (samples + 1)
+    return extreme / samples
+
+
+@attr.s
+class Comparison:
+    description: str = attr.ib()
+    metric: str = attr.ib()
+    values_a: typing.List[float] = attr.ib()
+    values_b: typing.List[float] = attr.ib()
+    mean_a: typing.Optional[float] = attr.ib()
+    mean_b: typing.Optional[float] = attr.ib()
+    # Change of B relative to A (percent), positive means higher. None
+    # if the mean of A is 0 and the mean of B is not (`baseline_zero`)
+    change: typing.Optional[float] = attr.ib()
+    p_value: typing.Optional[float] = attr.ib()
+    verdict: str = attr.ib()
+    baseline_zero: bool = attr.ib(default=False)
+
+
+def compare(
+    description: str,
+    metric: str,
+    values_a: typing.List[typing.Optional[float]],
+    values_b: typing.List[typing.Optional[float]],
+    config: ABTestConfig
+):
+    """
+    Compares the values of a metric of the pairs of runs. Pairs where
+    a value of either build is missing are dropped.
+
+    Returns:
+        `Comparison`.
+    """
+    pairs = [(a, b) for a, b in zip(values_a, values_b) if a is not None and b is not None]
+    values_a = [a for a, _ in pairs]
+    values_b = [b for _, b in pairs]
+    if not pairs:
+        return Comparison(description, metric, [], [], None, None, None, None, 'insufficient data')
+
+    mean_a = statistics.mean(values_a)
+    mean_b = statistics.mean(values_b)
+    # E.g., extra time which has been 0 for build A, the relative change
+    # is not defined then
+    baseline_zero = mean_a == 0 and mean_b != 0
+    change = None
+    if mean_a != 0:
+        change = 100 * (mean_b - mean_a) / abs(mean_a)
+    elif mean_b == 0:
+        change = 0.0
+    p_value = paired_permutation_test(values_a, values_b) if len(pairs) > 1 else None
+
+    verdict = 'no change'
+    if p_value is None:
+        verdict = 'insufficient data'
+    elif baseline_zero:
+        # The threshold does not apply, any significant difference counts
+        if p_value < config.alpha:
+            better = mean_b > 0 if METRICS[metric] else mean_b < 0
+            verdict = 'improvement' if better else 'regression'
+    elif p_value < config.alpha and abs(change) >= config.threshold:
+        better = change > 0 if METRICS[metric] else change < 0
+        verdict = 'improvement' if better else 'regression'
+    return Comparison(
+        description,
+        metric,
+        values_a,
+        values_b,
+        mean_a,
+        mean_b,
+        change,
+        p_value,
+        verdict,
+        baseline_zero
+    )
+
+
+def format_table(comparisons: typing.List[Comparison]):
+    """
+    Returns:
+        A list of lines of the verdict table.
+    """
+    def number(value, fmt):
+        return '-' if value is None else format(value, fmt)
+
+    lines = [
+        f'{"experiment":<50} {"metric":<11} {"A":>10} {"B":>10} '
+        f'{"change %":>9} {"p-value":>8}  verdict'
+    ]
+    for c in comparisons:
+        change = 'from 0' if c.baseline_zero else number(c.change, '+.1f')
+        lines.append(
+            f'{c.description:<50} {c.metric:<11} {number(c.mean_a, ".3f"):>10} '
+            f'{number(c.mean_b, ".3f"):>10} {change:>9} '
+            f'{number(c.p_value, ".4f"):>8}  {c.verdict}'
+        )
+    return lines
+
+
+def save_report(filepath: pathlib.Path, config: ABTestConfig, comparisons: typing.List[Comparison]):
+    report = {
+        'config': attr.asdict(config),
+        'regressions': sum(1 for c in comparisons if c.verdict == 'regression'),
+        'comparisons': [attr.asdict(c) for c in comparisons],
+    }
+    with filepath.open('w', encoding='utf-8') as fp:
+        json.dump(report, fp, indent=4)
+
+
+def run(context: perform_test.TestContext, test_config: ABTestConfig):
+    """
+    Performs A/B test: each point of the test compared is streamed
+    `runs` times by each build in alternating order, and the metrics of
+    the builds are compared, see `compare`. The comparisons are logged
+    as a table and saved into
+    `{scenario}-alg-{algdescr}-vs-{b_algdescr}-ab.json` report.
+
+    Returns:
+        A list of tuples (test description, metric, verdict).
+    """
+    global_config = context.global_config
+    builds = {
+        'A': global_config,
+        'B': test_config.build_b(global_config),
+    }
+    if test_config.test == perform_test.TestName.bw_loop_test.value:
+        points = generators.bw_loop_test_generator(
+            global_config,
+            generators.BandwidthLoopTestConfig.from_config_filepath(context.config_filepath)
+        )
+    else:
+        points = generators.filecc_loop_test_generator(
+            global_config,
+            generators.FileCCLoopTestConfig.from_config_filepath(context.config_filepath)
+        )
+
+    comparisons = []
+    interrupted = False
+    for exper_params in points:
+        # {build: metric values by run, None if the run has failed},
+        # runs of both builds with the same index make a pair
+        values = {build: [] for build in BUILDS}
+        for run in range(test_config.runs):
+            for build in run_order(run):
+                run_params = generators.with_description(
+                    exper_params,
+                    f'{exper_params.description}-{build}-run-{run}'
+                )
+                logger.info(f'Build {build}, run {run}: {run_params.description}')
+                try:
+                    exper_result = context.perform_experiment(
+                        context.rotate_port(builds[build]),
+                        run_params
+                    )
+                    exper_result.save(context.results_dir)
+                    values[build].append(metric_values(exper_result))
+                    if context.build_timeline:
+                        context.timeline_descriptions.append(run_params.description)
+                except (KeyboardInterrupt, shared.ProcessHasNotBeenKilled):
+                    interrupted = True
+                    break
+                except (
+                    shared.ProcessHasNotBeenStartedSuccessfully,
+                    shared.ProcessHasNotBeenCreated
+                ) as error:
+                    values[build].append(None)
+                finally:
+                    context.retrieve(run_params.description)
+            if interrupted:
+                break
+
+        for metric in METRICS:
+            comparisons.append(compare(
+                exper_params.description,
+                metric,
+                [run_values and run_values[metric] for run_values in values['A']],
+                [run_values and run_values[metric] for run_values in values['B']],
+                test_config
+            ))
+        if interrupted:
+            break
+
+    for line in format_table(comparisons):
+        logger.info(line)
+    save_report(
+        context.results_dir / f'{global_config.scenario}-alg-{global_config.algdescr}-vs-{test_config.b_algdescr}-ab.json',
+        test_config,
+        comparisons
+    )
+    return [
+        (comparison.description, comparison.metric, comparison.verdict)
+        for comparison in comparisons
+    ]
@@ -0,0 +1,95 @@
+import logging
+import pathlib
+
+import attr
+import click
+
+from srt_test_runner import dissector
+from srt_test_runner import histogram
+from srt_test_runner import timeline
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Percentiles printed by `percentiles` command
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+@click.group()
+def main():
+    """ Analysis of the results of experiments performed before. """
+    pass
+
+
+@main.command()
+@click.argument(
+    'results_dir',
+    type=click.Path(exists=True)
+)
+@click.argument('description')
+@click.option(
+    '--port',
+    default=4200,
+    help=   'Port of the receiver (dst_port).',
+    show_default=True
+)
+def dissect(results_dir: str, description: str, port: int):
+    """
+    Decodes SRT headers of the sender capture of experiment DESCRIPTION
+    and saves protocol overhead into {DESCRIPTION}-srt.json file.
+    """
+    summary = dissector.dissect(pathlib.Path(results_dir), description, port)
+    if summary is None:
+        click.echo(f'No SRT packets captured: {description}')
+        return
+    for name, value in attr.asdict(summary).items():
+        click.echo(f'{name + ":":<24}{value}')
+
+
+@main.command('timeline')
+@click.argument(
+    'results_dir',
+    type=click.Path(exists=True)
+)
+@click.argument('description')
+def merge_timeline(results_dir: str, description: str):
+    """
+    Merges sender and receiver statistics and tshark capture of
+    experiment DESCRIPTION into {DESCRIPTION}-timeline.bin file.
+    """
+    filepath = timeline.merge(pathlib.Path(results_dir), description)
+    if filepath is None:
+        click.echo(f'No data to merge: {description}')
+        return
+    click.echo(f'Timeline: {filepath}')
+
+
+@main.command()
+@click.argument(
+    'filepath',
+    type=click.Path(exists=True)
+)
+def percentiles(filepath: str):
+    """
+    Prints percentiles (ms) of the histograms saved into FILEPATH, e.g.
+    {description}-latency.hist or {description}-connrate.hist.
+    """
+    for name, hist in histogram.load(pathlib.Path(filepath)).items():
+        if hist.total == 0:
+            click.echo(f'{name}: no values')
+            continue
+        # Values are recorded in microseconds
+        values = ', '.join(
+            f'p{percentile:g} {hist.percentile(percentile) / 1000:.3f}'
+            for percentile in PERCENTILES
+        )
+        click.echo(f'{name}: {hist.total} values, {values}, max {hist.max / 1000:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
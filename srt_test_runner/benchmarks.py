@@ -0,0 +1,201 @@
+import logging
+import os
+import pathlib
+import stat
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import click
+
+from srt_test_runner import perform_test, shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Invocations measured by `startup` benchmark: (name, module and args).
+# Help is printed, so that nothing but startup is measured
+STARTUP_COMMANDS = [
+    ('srt-test-runner --help', ['cli', '--help']),
+    ('srt-test-runner test --help', ['cli', 'test', '--help']),
+    ('srt-test-runner combined --help', ['cli', 'combined', '--help']),
+    ('srt-test-runner analysis --help', ['cli', 'analysis', '--help']),
+    ('perform_test --help', ['perform_test', '--help']),
+]
+# Modules which should not be imported at startup
+HEAVY_MODULES = ['fabric', 'paramiko', 'invoke']
+
+def count_open_fds():
+    """ Number of file descriptors opened by the script (Linux, macOS). """
+    for fds_dir in ('/proc/self/fd', '/dev/fd'):
+        if os.path.isdir(fds_dir):
+            return len(os.listdir(fds_dir))
+    return None
+
+
+def create_fake_srt(path: pathlib.Path, lifetime: int):
+    """
+    Creates a fake srt-test-messaging application in `path` which just
+    sleeps for `lifetime` seconds, so that launch paths can be benchmarked
+    without SRT and network.
+    """
+    filepath = path / 'srt-test-messaging'
+    filepath.write_text(f'#!/bin/sh\nexec sleep {lifetime}\n')
+    filepath.chmod(filepath.stat().st_mode | stat.S_IEXEC)
+
+
+@click.group()
+def main():
+    """ Benchmarks of the script itself. """
+    pass
+
+
+@main.command()
+@click.option(
+    '--quantity',
+    default=1000,
+    help=   'Number of senders to start.',
+    show_default=True
+)
+@click.option(
+    '--snd-mode',
+    type=click.Choice(['parallel', 'batch']),
+    default='batch',
+    help=   'Launch path to benchmark.',
+    show_default=True
+)
+@click.option(
+    '--lifetime',
+    default=15,
+    help=   'Time (s) each fake sender is running.',
+    show_default=True
+)
+def launcher(quantity: int, snd_mode: str, lifetime: int):
+    """
+    Starts QUANTITY fake local senders the same way as perform_test.py
+    does and reports time spent on starting, file descriptors and threads
+    used by the script.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        create_fake_srt(tmp_dir, lifetime)
+        fds_before = count_open_fds()
+        max_threads = threading.active_count()
+
+        start = time.monotonic()
+        if snd_mode == 'batch':
+            senders = perform_test.start_senders_in_batches(
+                quantity,
+                str(tmp_dir),
+                '127.0.0.1',
+                '4200',
+                description='benchmark',
+                results_dir=tmp_dir
+            )
+        else:
+            # Parallel mode can not do anything with a thread to monitor
+            # the number of threads, so it is sampled from here
+            def monitor():
+                nonlocal max_threads
+                while time.monotonic() - start < lifetime:
+                    max_threads = max(max_threads, threading.active_count())
+                    time.sleep(0.05)
+            threading.Thread(target=monitor, daemon=True).start()
+            senders = perform_test.start_several_senders(
+                quantity,
+                'parallel',
+                str(tmp_dir),
+                '127.0.0.1',
+                '4200',
+                description='benchmark'
+            )
+        spawn_time = time.monotonic() - start
+        fds_after = count_open_fds()
+
+        if snd_mode == 'batch':
+            running = senders.poll()
+            senders.cleanup()
+        else:
+            running = sum(
+                shared.process_is_running(process)[0]
+                for _, process in senders
+            )
+            for process_tuple in senders:
+                shared.cleanup_process(process_tuple)
+
+    click.echo(f'Mode:                   {snd_mode}')
+    click.echo(f'Senders:                {quantity}')
+    click.echo(f'Start time:             {spawn_time:.3f} s')
+    click.echo(f'Running after start:    {running}')
+    if fds_before is not None:
+        click.echo(f'Script fds per sender:  {(fds_after - fds_before) / quantity:.2f}')
+    click.echo(f'Max script threads:     {max_threads}')
+
+
+
+@main.command()
+@click.option(
+    '--runs',
+    default=10,
+    help=   'Number of runs of each invocation.',
+    show_default=True
+)
+def startup(runs: int):
+    """
+    Measures wall time of short invocations of the script in fresh
+    interpreters and checks which heavy modules (fabric, paramiko) are
+    imported at startup by each of the entry points.
+    """
+    # Modules are run from the directory containing the package, so that
+    # it does not have to be installed
+    package_dir = pathlib.Path(__file__).resolve().parent
+    baseline = []
+    for _ in range(runs):
+        start = time.monotonic()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        baseline.append(time.monotonic() - start)
+    click.echo(f'{"python -c pass":<34}median {statistics.median(baseline) * 1000:.0f} ms')
+
+    for name, (module, *args) in STARTUP_COMMANDS:
+        times = []
+        for _ in range(runs):
+            start = time.monotonic()
+            subprocess.run(
+                [sys.executable, '-m', f'{__package__}.{module}'] + args,
+                cwd=package_dir.parent,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=True
+            )
+            times.append(time.monotonic() - start)
+        click.echo(
+            f'{name:<34}median {statistics.median(times) * 1000:.0f} ms, '
+            f'min {min(times) * 1000:.0f} ms'
+        )
+
+    for module in ['cli', 'perform_test', 'perform_combined_test']:
+        imported = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                f'import sys, {__package__}.{module}; '
+                f'print(" ".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+            ],
+            cwd=package_dir.parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True
+        ).stdout.decode('utf-8').strip()
+        click.echo(f'Heavy modules imported by {module}: {imported or "none"}')
+
+
+if __name__ == '__main__':
+    main()
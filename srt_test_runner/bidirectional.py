@@ -0,0 +1,106 @@
+import json
+import logging
+import pathlib
+import typing
+
+import attr
+
+from srt_test_runner import generators
+from srt_test_runner import perform_test
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class BidirectionalPoint:
+    description: str = attr.ib()
+    # Forward and reverse bitrates (bps)
+    bitrate: int = attr.ib()
+    reverse_bitrate: int = attr.ib()
+    # Extra time (s) spent on forward streaming
+    extra_time: int = attr.ib()
+    # Median forward sending rate and reverse receiving rate (Mbps)
+    send_rate: typing.Optional[float] = attr.ib()
+    reverse_recv_rate: typing.Optional[float] = attr.ib()
+    # Forward sending rate relative to the one without reverse flow
+    # at the same forward bitrate
+    relative_send_rate: typing.Optional[float] = attr.ib()
+
+
+def build_report(exper_results: typing.List[typing.Any]):
+    """
+    Builds the report of how forward throughput degrades as reverse load
+    increases from the results of bidirectional experiments
+    (`perform_test.ExperimentResult`).
+
+    Returns:
+        A list of `BidirectionalPoint` sorted by forward and reverse
+        bitrates.
+    """
+    baselines = {
+        result.bitrate: result.send_rate
+        for result in exper_results
+        if not result.reverse_bitrate
+    }
+    points = []
+    for result in exper_results:
+        baseline = baselines.get(result.bitrate)
+        relative_send_rate = None
+        if baseline and result.send_rate is not None:
+            relative_send_rate = result.send_rate / baseline
+        points.append(BidirectionalPoint(
+            result.description,
+            result.bitrate,
+            result.reverse_bitrate or 0,
+            result.extra_time,
+            result.send_rate,
+            result.reverse_recv_rate,
+            relative_send_rate
+        ))
+    return sorted(points, key=lambda point: (point.bitrate, point.reverse_bitrate))
+
+
+def save_report(filepath: pathlib.Path, points: typing.List[BidirectionalPoint]):
+    with filepath.open('w', encoding='utf-8') as fp:
+        json.dump([attr.asdict(point) for point in points], fp, indent=4)
+
+
+def run(context: perform_test.TestContext, test_config: generators.BidirectionalTestConfig):
+    """
+    Performs bidirectional test: the experiments generated by
+    `generators.bidirectional_test_generator` are performed with
+    `perform_test.perform_experiments`, and the report is saved into
+    `{scenario}-alg-{algdescr}-bidirectional.json` file.
+
+    Returns:
+        A list of tuples (test description, bitrate, extra time needed to
+        finish with streaming).
+    """
+    global_config = context.global_config
+    points = perform_test.perform_experiments(
+        context,
+        list(generators.bidirectional_test_generator(global_config, test_config))
+    )
+    if points:
+        report = build_report([exper_result for _, exper_result in points])
+        save_report(
+            context.results_dir / f'{global_config.scenario}-alg-{global_config.algdescr}-bidirectional.json',
+            report
+        )
+        for point in report:
+            logger.info(
+                f'Forward {point.bitrate} bps, reverse {point.reverse_bitrate} '
+                f'bps: extra time {point.extra_time} s, send rate '
+                f'{point.send_rate} Mbps ({point.relative_send_rate} of the '
+                f'one without reverse flow), reverse receive rate '
+                f'{point.reverse_recv_rate} Mbps'
+            )
+    return [
+        (exper_result.description, exper_params.bitrate, exper_result.extra_time)
+        for exper_params, exper_result in points
+    ]
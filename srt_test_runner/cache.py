@@ -0,0 +1,306 @@
+import configparser
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import time
+import typing
+
+import attr
+
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Metadata file of a cache entry. Its modification time is updated
+# on every hit and used as the last access time for LRU eviction
+ENTRY_FILENAME = 'entry.json'
+REMOTE_QUERY_TIMEOUT = 60
+# Entries are written into `{key}.*.part` directories first. Scenarios
+# run in parallel share the cache, so the ones of other processes still
+# writing are only removed once older than the grace period (s)
+PART_SUFFIX = '.part'
+PART_GRACE_PERIOD = 3600
+
+
+@attr.s
+class CacheConfig:
+    """
+    Experiment cache config. The section is optional, default values
+    are used if it is not specified within config file.
+    """
+    cache_dir: str = attr.ib(default='_cache')
+    # Time to live of an entry (hours)
+    ttl: float = attr.ib(default=24)
+    # Maximum disk size of the cache (MB), least recently used entries
+    # are evicted above it
+    max_size: int = attr.ib(default=1024)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('cache'):
+            return cls()
+        section = parsed_config['cache']
+        default = cls()
+        return cls(
+            section.get('cache_dir', default.cache_dir),
+            section.getfloat('ttl', default.ttl),
+            section.getint('max_size', default.max_size)
+        )
+
+
+def fingerprint(material: dict):
+    """
+    Returns:
+        sha256 hash of `material` serialized to JSON with sorted keys.
+    """
+    data = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def file_hash(filepath: pathlib.Path):
+    """
+    Returns:
+        sha256 hash of a local file or None if it does not exist.
+    """
+    if not filepath.is_file():
+        return None
+    sha256 = hashlib.sha256()
+    with filepath.open('rb') as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def remote_file_hash(ssh_username: str, ssh_host: str, filepath: str):
+    """
+    Returns:
+        sha256 hash of a file on a remote machine or None if it has not
+        been calculated.
+    """
+    # `filepath` is not quoted, so that ~ is expanded by the remote shell
+    try:
+        result = shared.run_via_ssh(
+            ssh_username,
+            ssh_host,
+            f'sha256sum {filepath}',
+            REMOTE_QUERY_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired) as error:
+        logger.info(
+            f'{filepath} has not been hashed on {ssh_host}. Exception '
+            f'occured ({error.__class__.__name__}): {error}'
+        )
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        logger.info(
+            f'{filepath} has not been hashed on {ssh_host}, returncode '
+            f'{result.returncode}, stderr: {result.stderr}'
+        )
+        return None
+    return result.stdout.split()[0]
+
+
+def experiment_artefacts(results_dir: pathlib.Path, description: str):
+    """
+    Returns:
+        A list of files in `results_dir` which belong to the experiment
+        `description`: statistics, .pcapng, summary, etc. Files of the
+        repeated runs `{description}-run-{i}` are not included.
+    """
+    artefacts = []
+    if not results_dir.is_dir():
+        return artefacts
+    for filepath in results_dir.iterdir():
+        name = filepath.name
+        if not filepath.is_file() or not name.startswith(description):
+            continue
+        rest = name[len(description):]
+        if not rest or rest[0] not in '-.' or rest.startswith('-run-'):
+            continue
+        artefacts.append(filepath)
+    return sorted(artefacts)
+
+
+def get_dir_size(path: pathlib.Path):
+    return sum(
+        filepath.stat().st_size
+        for filepath in path.rglob('*')
+        if filepath.is_file()
+    )
+
+
+class ExperimentCache:
+    """
+    Content-addressed cache of experiment results: each entry is
+    a directory named by the key and holding the experiment artefacts.
+    """
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self.cache_dir = pathlib.Path(config.cache_dir)
+
+    def _entry_dir(self, key: str):
+        return self.cache_dir / key
+
+    def _is_expired(self, entry_dir: pathlib.Path):
+        try:
+            with (entry_dir / ENTRY_FILENAME).open('r', encoding='utf-8') as fp:
+                created = json.load(fp)['created']
+        except (OSError, ValueError, KeyError):
+            return True
+        return time.time() - created > self.config.ttl * 3600
+
+    def restore(self, key: str, results_dir: pathlib.Path):
+        """
+        Copies the artefacts of a cached experiment into `results_dir`.
+        If the entry is removed or replaced by another process meanwhile,
+        the files restored so far are removed and it is a cache miss.
+
+        Returns:
+            A list of restored files or None if there is no valid entry
+            for `key`.
+        """
+        entry_dir = self._entry_dir(key)
+        if not entry_dir.is_dir() or self._is_expired(entry_dir):
+            return None
+
+        restored = []
+        try:
+            results_dir.mkdir(parents=True, exist_ok=True)
+            for filepath in sorted(entry_dir.iterdir()):
+                if filepath.name == ENTRY_FILENAME:
+                    continue
+                shutil.copy2(filepath, results_dir / filepath.name)
+                restored.append(results_dir / filepath.name)
+            # Mark the entry as recently used
+            os.utime(entry_dir / ENTRY_FILENAME)
+        except OSError as error:
+            logger.info(
+                f'Cache: {key[:12]} has not been restored. Exception '
+                f'occured ({error.__class__.__name__}): {error}'
+            )
+            for filepath in restored:
+                try:
+                    filepath.unlink()
+                except OSError:
+                    pass
+            return None
+        return restored
+
+    def store(
+        self,
+        key: str,
+        description: str,
+        filepaths: typing.List[pathlib.Path],
+        material: typing.Optional[dict]=None
+    ):
+        """
+        Stores the artefacts of an experiment. The entry is written into
+        a temporary directory of its own first, so that an interrupted
+        write never looks like a valid entry and concurrent writers do
+        not interfere. Failures are logged, the experiment is just not
+        cached then.
+
+        Returns:
+            True if stored.
+        """
+        entry_dir = self._entry_dir(key)
+        tmp_dir = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_dir = pathlib.Path(tempfile.mkdtemp(
+                prefix=f'{key}.',
+                suffix=PART_SUFFIX,
+                dir=self.cache_dir
+            ))
+            for filepath in filepaths:
+                shutil.copy2(filepath, tmp_dir / filepath.name)
+            with (tmp_dir / ENTRY_FILENAME).open('w', encoding='utf-8') as fp:
+                json.dump(
+                    {
+                        'key': key,
+                        'description': description,
+                        'created': time.time(),
+                        'files': [filepath.name for filepath in filepaths],
+                        'material': material,
+                    },
+                    fp,
+                    indent=4,
+                    default=str
+                )
+
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            tmp_dir.rename(entry_dir)
+        except OSError as error:
+            logger.info(
+                f'Cache: {description} has not been stored. Exception '
+                f'occured ({error.__class__.__name__}): {error}'
+            )
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        return True
+
+    def evict(self):
+        """
+        Removes expired entries and partial writes older than
+        `PART_GRACE_PERIOD`, and then least recently used entries while
+        the cache is larger than `max_size`.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+
+        removed = 0
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            if not entry_dir.is_dir():
+                continue
+            try:
+                if entry_dir.name.endswith(PART_SUFFIX):
+                    if time.time() - entry_dir.stat().st_mtime > PART_GRACE_PERIOD:
+                        shutil.rmtree(entry_dir, ignore_errors=True)
+                        removed += 1
+                    continue
+                if self._is_expired(entry_dir):
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    removed += 1
+                    continue
+                entries.append((
+                    (entry_dir / ENTRY_FILENAME).stat().st_mtime,
+                    get_dir_size(entry_dir),
+                    entry_dir
+                ))
+            except OSError:
+                # Removed or replaced by another process meanwhile
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        max_size = self.config.max_size * 1024 * 1024
+        for _, size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            removed += 1
+
+        if removed > 0:
+            logger.info(f'Cache: {removed} entries evicted')
+        return removed
@@ -0,0 +1,52 @@
+import importlib
+
+import click
+
+
+# Subcommands: (module of the package, click command of the module, short
+# help). Modules are imported only when their subcommand is invoked, so
+# that `--help` and short invocations do not pay for importing all
+# the others
+SUBCOMMANDS = {
+    'test': ('perform_test', 'main', 'Perform one of the tests.'),
+    'combined': ('perform_combined_test', 'main', 'Perform one of the combined tests.'),
+    'matrix': ('matrix', 'main', 'Perform a test for several scenarios.'),
+    'analysis': ('analysis', 'main', 'Analyze the results of experiments.'),
+    'benchmark': ('benchmarks', 'main', 'Benchmarks of the script itself.'),
+}
+
+
+class LazyGroup(click.Group):
+    """
+    Click group which imports the module of a subcommand only when
+    the subcommand is resolved. The list of subcommands is printed from
+    `SUBCOMMANDS` without importing any of them.
+    """
+
+    def list_commands(self, ctx):
+        return list(SUBCOMMANDS)
+
+    def get_command(self, ctx, name):
+        if name not in SUBCOMMANDS:
+            return None
+        module_name, command_name, _ = SUBCOMMANDS[name]
+        return getattr(importlib.import_module(f'.{module_name}', __package__), command_name)
+
+    def format_commands(self, ctx, formatter):
+        with formatter.section('Commands'):
+            formatter.write_dl([
+                (name, short_help)
+                for name, (_, _, short_help) in SUBCOMMANDS.items()
+            ])
+
+
+@click.group(cls=LazyGroup)
+def main():
+    """
+    SRT test runner. Use COMMAND --help to get the options of a command.
+    """
+    pass
+
+
+if __name__ == '__main__':
+    main()
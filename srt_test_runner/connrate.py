@@ -0,0 +1,382 @@
+import configparser
+import json
+import logging
+import math
+import pathlib
+import signal
+import time
+import typing
+
+import attr
+
+from srt_test_runner import dissector
+from srt_test_runner import generators
+from srt_test_runner import histogram
+from srt_test_runner import launcher
+from srt_test_runner import perform_test
+from srt_test_runner import placement
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Percentiles of connection and handshake times reported
+PERCENTILES = [50, 90, 99]
+
+
+@attr.s
+class ConnRateTestConfig:
+    """
+    Connection rate test config: short-lived connections opened against
+    one listener, `concurrency` of them at a time.
+    """
+    # Numbers of connections in flight, one experiment per number
+    concurrency: typing.List[int] = attr.ib()
+    # Connections opened at each concurrency level
+    connections: int = attr.ib()
+    # Messages sent over each connection before it is closed
+    messages: int = attr.ib(default=1)
+    # Time (s) after which a connection which has not finished is killed
+    # and counted as failed
+    timeout: float = attr.ib(default=10)
+    # Maximum number of connections queued by the listener
+    maxcon: int = attr.ib(default=50)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        section = parsed_config['conn-rate-test']
+        default = cls([], 0)
+        return cls(
+            [int(concurrency) for concurrency in section['concurrency'].split(',')],
+            int(section['connections']),
+            section.getint('messages', default.messages),
+            section.getfloat('timeout', default.timeout),
+            section.getint('maxcon', default.maxcon)
+        )
+
+
+@attr.s
+class ConnRateExperimentParams:
+    # Receiver and sender params of each connection
+    exper_params: generators.ExperimentParams = attr.ib()
+    concurrency: int = attr.ib()
+    connections: int = attr.ib()
+    timeout: float = attr.ib()
+
+    @property
+    def description(self):
+        return self.exper_params.description
+
+
+def conn_rate_test_generator(global_config, test_config: ConnRateTestConfig):
+    for concurrency in test_config.concurrency:
+        rcv_attrs_values = [
+            ('rcvbuf', '12058624'),
+            ('congestion', 'live'),
+            ('maxcon', str(test_config.maxcon))
+        ]
+        rcv_options_values = [
+            ('-msgsize', '1456'),
+            ('-reply', '0'),
+            ('-printmsg', '0')
+        ]
+        snd_attrs_values = [
+            ('sndbuf', '12058624'),
+            ('congestion', 'live'),
+        ]
+        snd_options_values = [
+            ('-msgsize', '1456'),
+            ('-reply', '0'),
+            ('-printmsg', '0'),
+            ('-repeat', str(test_config.messages)),
+        ]
+        description = f'{global_config.scenario}-alg-{global_config.algdescr}-conn-{concurrency}'
+
+        yield ConnRateExperimentParams(
+            generators.ExperimentParams(
+                rcv_attrs_values,
+                rcv_options_values,
+                snd_attrs_values,
+                snd_options_values,
+                0,
+                description,
+                0
+            ),
+            concurrency,
+            test_config.connections,
+            test_config.timeout
+        )
+
+
+@attr.s
+class ConnRatePoint:
+    """
+    Result of a connection rate experiment at one concurrency level.
+    Times are in ms.
+    """
+    description: str = attr.ib()
+    concurrency: int = attr.ib()
+    attempts: int = attr.ib()
+    accepted: int = attr.ib()
+    failed: int = attr.ib()
+    # Killed after `timeout`, counted as failed as well
+    timed_out: int = attr.ib()
+    failure_rate: float = attr.ib()
+    # Time (s) from the first connection started to the last one finished
+    duration: float = attr.ib()
+    # Connections accepted per second
+    accept_rate: float = attr.ib()
+    # Time from a sender started to finished for accepted connections:
+    # handshake, sending messages and closing, {percentile: value}
+    connect_time: typing.Dict[int, typing.Optional[float]] = attr.ib()
+    connect_time_max: typing.Optional[float] = attr.ib()
+    # Time from the first to the last handshake packet of a connection
+    # decoded from the capture, None if tshark has not been run
+    handshake_time: typing.Optional[typing.Dict[int, typing.Optional[float]]] = attr.ib(default=None)
+    handshake_time_max: typing.Optional[float] = attr.ib(default=None)
+
+
+def record_ms(values: typing.Iterable[float]):
+    """
+    Returns:
+        `histogram.Histogram` of `values` (s) recorded in microseconds.
+    """
+    hist = histogram.Histogram()
+    for value in values:
+        hist.record(value * 1000000)
+    return hist
+
+
+def percentiles_ms(hist: histogram.Histogram):
+    """
+    Returns:
+        A tuple ({percentile: ms}, maximum ms) of a histogram recorded
+        by `record_ms`.
+    """
+    if hist.total == 0:
+        return ({percentile: None for percentile in PERCENTILES}, None)
+    return (
+        {
+            percentile: hist.percentile(percentile) / 1000
+            for percentile in PERCENTILES
+        },
+        hist.max / 1000
+    )
+
+
+def analyze(
+    results_dir: pathlib.Path,
+    exper_params: ConnRateExperimentParams,
+    table: launcher.ProcessTable,
+    handshake_durations: typing.Optional[typing.List[float]]=None
+):
+    """
+    Calculates accepted connections per second, failure rate and
+    the distribution of connection times from the senders of
+    an experiment, and of handshake times if decoded from the capture.
+    The histograms are saved into `{description}-connrate.hist` file.
+
+    Returns:
+        `ConnRatePoint`.
+    """
+    attempts = len(table)
+    accepted = [i for i in range(attempts) if table.returncodes[i] == 0]
+    timed_out = sum(
+        1 for returncode in table.returncodes
+        if returncode == -signal.SIGKILL
+    )
+    ended = [end for end in table.end_times if not math.isnan(end)]
+    duration = max(ended) - min(table.start_times) if ended else 0
+
+    histograms = {
+        'connect': record_ms(
+            table.end_times[i] - table.start_times[i] for i in accepted
+        ),
+    }
+    if handshake_durations is not None:
+        histograms['handshake'] = record_ms(handshake_durations)
+    histogram.save(results_dir / f'{exper_params.description}-connrate.hist', histograms)
+
+    connect_time, connect_time_max = percentiles_ms(histograms['connect'])
+    handshake_time = handshake_time_max = None
+    if handshake_durations is not None:
+        handshake_time, handshake_time_max = percentiles_ms(histograms['handshake'])
+    return ConnRatePoint(
+        exper_params.description,
+        exper_params.concurrency,
+        attempts,
+        len(accepted),
+        attempts - len(accepted),
+        timed_out,
+        (attempts - len(accepted)) / attempts if attempts else 0,
+        duration,
+        len(accepted) / duration if duration > 0 else 0,
+        connect_time,
+        connect_time_max,
+        handshake_time,
+        handshake_time_max
+    )
+
+
+def save_report(filepath: pathlib.Path, points: typing.List[ConnRatePoint]):
+    with filepath.open('w', encoding='utf-8') as fp:
+        json.dump([attr.asdict(point) for point in points], fp, indent=4)
+
+
+def perform_experiment(
+    global_config,
+    exper_params: ConnRateExperimentParams,
+    rcv: str,
+    run_tshark: bool=False,
+    results_dir: pathlib.Path=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Performs one connection rate experiment: starts a receiver and opens
+    `connections` short-lived connections to it, `concurrency` at a time,
+    see `perform_test.start_senders_churning`. If tshark has been run,
+    handshakes are decoded from the capture.
+
+    Returns:
+        `ConnRatePoint`.
+
+    Raises:
+        The same as `perform_test.perform_experiment`.
+    """
+    processes = []
+    try:
+        if rcv == 'remotely':
+            rcv_srt_process = perform_test.start_receiver(
+                global_config.rcv_ssh_host,
+                global_config.rcv_ssh_username,
+                global_config.rcv_path_to_srt,
+                '',
+                global_config.dst_port,
+                exper_params.exper_params.rcv_attrs_values,
+                exper_params.exper_params.rcv_options_values,
+                exper_params.description,
+                False,
+                results_dir,
+                placement_config.receiver() if placement_config else None
+            )
+            processes.append(rcv_srt_process)
+
+        if run_tshark:
+            snd_tshark_process = shared.start_tshark(
+                global_config.snd_tshark_iface,
+                global_config.dst_port,
+                results_dir,
+                dissector.capture_filepath(results_dir, exper_params.description).name,
+                placement=placement_config.tshark() if placement_config else None
+            )
+            processes.append(snd_tshark_process)
+            time.sleep(3)
+
+        table = perform_test.start_senders_churning(
+            exper_params.connections,
+            exper_params.concurrency,
+            global_config.snd_path_to_srt,
+            global_config.dst_host,
+            global_config.dst_port,
+            exper_params.exper_params.snd_attrs_values,
+            exper_params.exper_params.snd_options_values,
+            exper_params.description,
+            results_dir,
+            exper_params.timeout,
+            placement_config
+        )
+
+        handshake_durations = None
+        if run_tshark:
+            # The capture is complete once tshark has been stopped
+            shared.cleanup_process(snd_tshark_process)
+            processes.remove(snd_tshark_process)
+            handshake_durations = dissector.handshake_durations(
+                dissector.capture_filepath(results_dir, exper_params.description),
+                int(global_config.dst_port)
+            )
+
+        point = analyze(results_dir, exper_params, table, handshake_durations)
+        logger.info(
+            f'Concurrency {point.concurrency}: {point.accept_rate:.1f} '
+            f'connections/s accepted, failure rate {point.failure_rate:.1%}, '
+            f'connection time p50/p99 {point.connect_time[50]}/'
+            f'{point.connect_time[99]} ms\r'
+        )
+        logger.info('Done\r')
+        return point
+    except KeyboardInterrupt:
+        logger.info('KeyboardInterrupt has been caught')
+        raise
+    except (
+        shared.ProcessHasNotBeenStartedSuccessfully,
+        shared.ProcessHasNotBeenCreated
+    ) as error:
+        logger.info(
+            f'Exception occured ({error.__class__.__name__}): {error}'
+        )
+        raise
+    finally:
+        logger.info('Cleaning up\r')
+        for process_tuple in reversed(processes):
+            try:
+                shared.cleanup_process(process_tuple)
+            except shared.ProcessHasNotBeenKilled as error:
+                logger.info(
+                    f'During cleaning up an exception occured '
+                    f'({error.__class__.__name__}): {error}. The next '
+                    f'experiment can not be done further!'
+                )
+                raise
+        perform_test.reap_remote_processes()
+        logger.info('Done')
+
+
+def run(context: perform_test.TestContext, test_config: ConnRateTestConfig):
+    """
+    Performs connection rate test: one experiment per concurrency
+    generated by `conn_rate_test_generator`. The points are saved into
+    `{scenario}-alg-{algdescr}-conn-rate.json` report.
+
+    Returns:
+        A list of tuples (test description, accepted connections per
+        second, failure rate).
+    """
+    global_config = context.global_config
+    points = []
+    for conn_rate_params in conn_rate_test_generator(global_config, test_config):
+        try:
+            point = perform_experiment(
+                context.rotate_port(),
+                conn_rate_params,
+                context.rcv,
+                context.run_tshark,
+                context.results_dir,
+                context.placement_config
+            )
+        except (KeyboardInterrupt, shared.ProcessHasNotBeenKilled):
+            break
+        except (
+            shared.ProcessHasNotBeenStartedSuccessfully,
+            shared.ProcessHasNotBeenCreated
+        ) as error:
+            continue
+        points.append(point)
+
+    if points:
+        save_report(
+            context.results_dir / f'{global_config.scenario}-alg-{global_config.algdescr}-conn-rate.json',
+            points
+        )
+    return [
+        (point.description, point.accept_rate, point.failure_rate)
+        for point in points
+    ]
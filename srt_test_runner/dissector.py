@@ -0,0 +1,362 @@
+import array
+import json
+import pathlib
+import struct
+import typing
+
+import attr
+
+from srt_test_runner import pcapng
+
+
+# Link types of the interfaces tshark captures on
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = [0x8100, 0x88A8]
+IPPROTO_UDP = 17
+# IPv6 extension headers skipped on the way to UDP header
+IPV6_EXTENSION_HEADERS = [0, 43, 60]
+
+SRT_HEADER_LENGTH = 16
+# Control packet types, see SRT RFC draft, section 3.2
+CONTROL_TYPES = {
+    0x0000: 'handshake',
+    0x0001: 'keepalive',
+    0x0002: 'ack',
+    0x0003: 'nak',
+    0x0004: 'congestion',
+    0x0005: 'shutdown',
+    0x0006: 'ackack',
+    0x0007: 'dropreq',
+    0x0008: 'peererror',
+    0x7FFF: 'userdefined',
+}
+# Packet kinds in the decoded columns
+DATA = 0
+RETRANSMITTED = 1
+CONTROL = 2
+# Resolution (s) of the per-interval series
+INTERVAL = 1.0
+
+
+def udp_payload(linktype: int, data: bytes):
+    """
+    Returns:
+        A tuple (source port, destination port, UDP payload) or None if
+        it is not a UDP packet over IPv4/IPv6.
+    """
+    ip_version = None
+    offset = 0
+    if linktype == LINKTYPE_ETHERNET:
+        ethertype, = struct.unpack_from('!H', data, 12)
+        offset = 14
+        while ethertype in ETHERTYPE_VLAN:
+            ethertype, = struct.unpack_from('!H', data, offset + 2)
+            offset += 4
+    elif linktype == LINKTYPE_LINUX_SLL:
+        ethertype, = struct.unpack_from('!H', data, 14)
+        offset = 16
+    elif linktype == LINKTYPE_LINUX_SLL2:
+        ethertype, = struct.unpack_from('!H', data, 0)
+        offset = 20
+    elif linktype in (LINKTYPE_NULL, LINKTYPE_LOOP):
+        # Address family in the byte order of the capturing host,
+        # the version of IP header is checked instead
+        ethertype = None
+        offset = 4
+    elif linktype in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        ethertype = None
+    else:
+        return None
+
+    if ethertype is None:
+        ip_version = data[offset] >> 4
+    elif ethertype == ETHERTYPE_IPV4:
+        ip_version = 4
+    elif ethertype == ETHERTYPE_IPV6:
+        ip_version = 6
+
+    if ip_version == 4:
+        header_length = (data[offset] & 0x0F) * 4
+        protocol = data[offset + 9]
+        fragment = struct.unpack_from('!H', data, offset + 6)[0] & 0x1FFF
+        if protocol != IPPROTO_UDP or fragment != 0:
+            return None
+        offset += header_length
+    elif ip_version == 6:
+        next_header = data[offset + 6]
+        offset += 40
+        while next_header in IPV6_EXTENSION_HEADERS:
+            next_header = data[offset]
+            offset += (data[offset + 1] + 1) * 8
+        if next_header != IPPROTO_UDP:
+            return None
+    else:
+        return None
+
+    src_port, dst_port = struct.unpack_from('!HH', data, offset)
+    return (src_port, dst_port, data[offset + 8:])
+
+
+@attr.s
+class DecodedCapture:
+    """
+    SRT headers of a capture decoded into columns, one row per packet.
+    """
+    # Unix time (s)
+    time: array.array = attr.ib(factory=lambda: array.array('d'))
+    # DATA, RETRANSMITTED or CONTROL
+    kind: array.array = attr.ib(factory=lambda: array.array('b'))
+    # Packet sequence number for data packets, control type for
+    # control packets
+    number: array.array = attr.ib(factory=lambda: array.array('l'))
+    # Length of UDP payload (bytes)
+    length: array.array = attr.ib(factory=lambda: array.array('l'))
+    # (time, first lost sequence number, last lost sequence number)
+    # for each loss list entry of NAK packets
+    losses: typing.List[typing.Tuple[float, int, int]] = attr.ib(factory=list)
+
+
+def decode(filepath: pathlib.Path, port: int):
+    """
+    Decodes SRT headers of UDP packets from or to `port` captured into
+    .pcapng file without tshark dissection. Packets are located one by
+    one, since link and IP headers vary in length, and the fixed part of
+    their SRT headers is collected into one buffer and decoded in a batch.
+
+    Returns:
+        `DecodedCapture`.
+    """
+    decoded = DecodedCapture()
+    # The first two 32-bit words of SRT header of each packet
+    headers = bytearray()
+    # (time, loss list) of NAK packets
+    naks = []
+    for packet in pcapng.read_packets(filepath):
+        try:
+            udp = udp_payload(packet.linktype, packet.data)
+        except (IndexError, struct.error):
+            # Truncated by the snapshot length
+            continue
+        if udp is None:
+            continue
+        src_port, dst_port, payload = udp
+        if port not in (src_port, dst_port) or len(payload) < SRT_HEADER_LENGTH:
+            continue
+        headers += payload[:8]
+        decoded.time.append(packet.timestamp)
+        # Original payload length, the capture may be truncated
+        decoded.length.append(packet.original_length - (len(packet.data) - len(payload)))
+        # Control flag set and control type 0x0003
+        if payload[0] == 0x80 and payload[1] == 0x03:
+            naks.append((packet.timestamp, payload[SRT_HEADER_LENGTH:]))
+
+    words = list(struct.iter_unpack('!II', headers))
+    decoded.kind.extend(
+        CONTROL if first & 0x80000000
+        # R flag of the message number field
+        else RETRANSMITTED if (second >> 26) & 1
+        else DATA
+        for first, second in words
+    )
+    decoded.number.extend(
+        (first >> 16) & 0x7FFF if first & 0x80000000 else first
+        for first, _ in words
+    )
+
+    for timestamp, loss_list in naks:
+        # Loss list: a sequence number, or a range of them where
+        # the first one has the highest bit set
+        entries = [entry for entry, in struct.iter_unpack('!I', loss_list[:len(loss_list) // 4 * 4])]
+        i = 0
+        while i < len(entries):
+            if entries[i] & 0x80000000 and i + 1 < len(entries):
+                decoded.losses.append((timestamp, entries[i] & 0x7FFFFFFF, entries[i + 1]))
+                i += 2
+            else:
+                decoded.losses.append((timestamp, entries[i] & 0x7FFFFFFF, entries[i] & 0x7FFFFFFF))
+                i += 1
+    return decoded
+
+
+def handshake_durations(filepath: pathlib.Path, port: int):
+    """
+    Measures SRT handshakes of the connections to or from `port` captured
+    into .pcapng file: from the first to the last handshake packet
+    exchanged with each peer port, so that retransmitted requests are
+    included. A peer port reused by a later connection starts a new
+    handshake once other packets have been exchanged over it.
+
+    Returns:
+        A list of handshake durations (s).
+    """
+    # Peer port: [first handshake packet time, last one, other packets seen]
+    handshakes = {}
+    durations = []
+    for packet in pcapng.read_packets(filepath):
+        try:
+            udp = udp_payload(packet.linktype, packet.data)
+        except (IndexError, struct.error):
+            continue
+        if udp is None:
+            continue
+        src_port, dst_port, payload = udp
+        if port not in (src_port, dst_port) or len(payload) < SRT_HEADER_LENGTH:
+            continue
+
+        peer_port = dst_port if src_port == port else src_port
+        first, = struct.unpack_from('!I', payload)
+        handshake = handshakes.get(peer_port)
+        if first & 0x80000000 and (first >> 16) & 0x7FFF == 0x0000:
+            if handshake is None or handshake[2]:
+                if handshake is not None:
+                    durations.append(handshake[1] - handshake[0])
+                handshakes[peer_port] = [packet.timestamp, packet.timestamp, False]
+            else:
+                handshake[1] = packet.timestamp
+        elif handshake is not None:
+            handshake[2] = True
+    durations += [last - first for first, last, _ in handshakes.values()]
+    return durations
+
+
+@attr.s
+class IntervalStats:
+    # Start (s) since the first packet
+    start: float = attr.ib()
+    data: int = attr.ib(default=0)
+    retransmitted: int = attr.ib(default=0)
+    # Packets by control type name
+    control: typing.Dict[str, int] = attr.ib(factory=dict)
+    # Packets reported lost by NAKs
+    lost: int = attr.ib(default=0)
+
+    @property
+    def retransmission_ratio(self):
+        sent = self.data + self.retransmitted
+        return self.retransmitted / sent if sent else None
+
+
+@attr.s
+class ProtocolSummary:
+    """
+    SRT protocol overhead of an experiment decoded from the capture.
+    """
+    data_packets: int = attr.ib()
+    retransmitted_packets: int = attr.ib()
+    # Retransmitted / all data packets
+    retransmission_ratio: typing.Optional[float] = attr.ib()
+    # Control packets by type name
+    control_packets: typing.Dict[str, int] = attr.ib()
+    # Per second over the capture duration
+    ack_rate: float = attr.ib()
+    ackack_rate: float = attr.ib()
+    nak_rate: float = attr.ib()
+    # Control bytes / all bytes of SRT packets
+    control_overhead: typing.Optional[float] = attr.ib()
+    # Lengths (packets) of distinct loss ranges reported by NAKs
+    loss_bursts: int = attr.ib()
+    mean_loss_burst: typing.Optional[float] = attr.ib()
+    max_loss_burst: typing.Optional[int] = attr.ib()
+    duration: float = attr.ib()
+
+
+def seq_distance(first: int, last: int):
+    # Sequence numbers are 31 bit and wrap around
+    return (last - first) % 0x80000000
+
+
+def analyze(decoded: DecodedCapture, interval: float=INTERVAL):
+    """
+    Returns:
+        A tuple (`ProtocolSummary`, list of `IntervalStats`).
+    """
+    if not decoded.time:
+        return (None, [])
+    origin = min(decoded.time)
+    duration = max(decoded.time) - origin
+    intervals = {}
+    control_packets = {}
+    data_bytes = control_bytes = 0
+    for timestamp, kind, number, length in zip(
+        decoded.time, decoded.kind, decoded.number, decoded.length
+    ):
+        index = int((timestamp - origin) // interval)
+        stats = intervals.setdefault(index, IntervalStats(index * interval))
+        if kind == CONTROL:
+            name = CONTROL_TYPES.get(number, f'type-{number}')
+            stats.control[name] = stats.control.get(name, 0) + 1
+            control_packets[name] = control_packets.get(name, 0) + 1
+            control_bytes += length
+        else:
+            if kind == RETRANSMITTED:
+                stats.retransmitted += 1
+            else:
+                stats.data += 1
+            data_bytes += length
+
+    # NAKs are repeated until the packets are recovered, so each loss
+    # range is counted once
+    bursts = {}
+    for timestamp, first, last in decoded.losses:
+        if (first, last) not in bursts:
+            bursts[(first, last)] = seq_distance(first, last) + 1
+            index = int((timestamp - origin) // interval)
+            stats = intervals.setdefault(index, IntervalStats(index * interval))
+            stats.lost += bursts[(first, last)]
+
+    data = sum(stats.data for stats in intervals.values())
+    retransmitted = sum(stats.retransmitted for stats in intervals.values())
+    rate_duration = max(duration, interval)
+    summary = ProtocolSummary(
+        data,
+        retransmitted,
+        retransmitted / (data + retransmitted) if data + retransmitted else None,
+        control_packets,
+        control_packets.get('ack', 0) / rate_duration,
+        control_packets.get('ackack', 0) / rate_duration,
+        control_packets.get('nak', 0) / rate_duration,
+        control_bytes / (data_bytes + control_bytes) if data_bytes + control_bytes else None,
+        len(bursts),
+        sum(bursts.values()) / len(bursts) if bursts else None,
+        max(bursts.values()) if bursts else None,
+        duration
+    )
+    return (summary, [intervals[index] for index in sorted(intervals)])
+
+
+def capture_filepath(results_dir: pathlib.Path, description: str):
+    return results_dir / f'{description}-snd.pcapng'
+
+
+def dissect(results_dir: pathlib.Path, description: str, port: int, interval: float=INTERVAL):
+    """
+    Decodes the sender capture of an experiment and saves the summary
+    and per-interval series into `{description}-srt.json` file.
+
+    Returns:
+        `ProtocolSummary` or None if there are no SRT packets.
+    """
+    decoded = decode(capture_filepath(results_dir, description), port)
+    summary, intervals = analyze(decoded, interval)
+    if summary is None:
+        return None
+    filepath = results_dir / f'{description}-srt.json'
+    with filepath.open('w', encoding='utf-8') as fp:
+        json.dump({
+            'summary': attr.asdict(summary),
+            'interval': interval,
+            'intervals': [
+                dict(attr.asdict(stats), retransmission_ratio=stats.retransmission_ratio)
+                for stats in intervals
+            ],
+        }, fp, indent=4)
+    return summary
@@ -0,0 +1,315 @@
+import json
+import logging
+import pathlib
+import statistics
+import time
+import typing
+
+import attr
+
+from srt_test_runner import generators
+from srt_test_runner import perform_test
+from srt_test_runner import placement
+from srt_test_runner import shared
+from srt_test_runner import stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+def jain_index(values: typing.List[float]):
+    """
+    Returns:
+        Jain's fairness index (sum x)^2 / (n * sum x^2) of `values`: 1 if
+        all the flows get the same throughput, 1/n if one flow gets
+        everything. None if there are no values or all of them are zero.
+    """
+    squares = sum(value * value for value in values)
+    if not values or squares == 0:
+        return None
+    return sum(values) ** 2 / (len(values) * squares)
+
+
+def read_throughput_series(filepath: pathlib.Path, start_offset: int):
+    """
+    Reads per-second sending rate of one flow from sender statistics.
+
+    Returns:
+        A dictionary {time (s) since the start of the first flow: Mbps}.
+    """
+    if not filepath.exists():
+        return {}
+    columns = stats.read_stats(filepath)
+    series = {}
+    for time_ms, rate in zip(columns.get(stats.TIME, []), columns.get(stats.SEND_RATE, [])):
+        series[start_offset + int(round(time_ms / 1000))] = rate
+    return series
+
+
+def convergence_time(
+    jain_series: typing.List[typing.Tuple[int, float]],
+    since: int,
+    threshold: float
+):
+    """
+    Returns:
+        Time (s) after `since` from which Jain's fairness index stays
+        at or above `threshold` until the end of the series, None if
+        the index never settles.
+    """
+    converged_at = None
+    for second, index in jain_series:
+        if index is not None and index >= threshold:
+            if converged_at is None:
+                converged_at = second
+        else:
+            converged_at = None
+    if converged_at is None:
+        return None
+    return max(0, converged_at - since)
+
+
+@attr.s
+class FlowSummary:
+    description: str = attr.ib()
+    congestion: str = attr.ib()
+    # in bps, 0 for unlimited
+    bitrate: int = attr.ib()
+    start_offset: int = attr.ib()
+    # Mean sending rate (Mbps) while all the flows are streaming
+    mean_throughput: typing.Optional[float] = attr.ib()
+    # A list of (time (s) since the start of the first flow, Mbps)
+    series: typing.List[typing.Tuple[int, float]] = attr.ib()
+
+
+@attr.s
+class FairnessSummary:
+    """
+    Result of a fairness experiment. It is saved into
+    `{description}-fairness.json` file in the results directory.
+    """
+    description: str = attr.ib()
+    flows: typing.List[FlowSummary] = attr.ib()
+    # Time window (s) when all the flows are streaming
+    overlap_start: int = attr.ib()
+    overlap_end: int = attr.ib()
+    # Jain's fairness index of mean throughputs within the overlap
+    jain_index: typing.Optional[float] = attr.ib()
+    # A list of (time (s), Jain's fairness index) within the overlap
+    jain_series: typing.List[typing.Tuple[int, typing.Optional[float]]] = attr.ib()
+    # Time (s) since the last flow has started until the index settles
+    # at or above `convergence_threshold`
+    convergence_time: typing.Optional[int] = attr.ib()
+    convergence_threshold: float = attr.ib()
+
+    def save(self, results_dir: pathlib.Path):
+        filepath = results_dir / f'{self.description}-fairness.json'
+        with filepath.open('w', encoding='utf-8') as fp:
+            json.dump(attr.asdict(self), fp, indent=4)
+
+
+def analyze(
+    results_dir: pathlib.Path,
+    exper_params: generators.FairnessExperimentParams,
+    convergence_threshold: float
+):
+    """
+    Calculates per-flow throughput time series, Jain's fairness index
+    and convergence time from sender statistics of the flows.
+
+    Returns:
+        `FairnessSummary`.
+    """
+    flows = exper_params.flows
+    overlap_start = max(flow.start_offset for flow in flows)
+    overlap_end = min(flow.start_offset for flow in flows) + exper_params.time_to_stream
+
+    all_series = [
+        read_throughput_series(
+            stats.sender_stats_filepath(results_dir, flow.exper_params.description),
+            flow.start_offset
+        )
+        for flow in flows
+    ]
+
+    jain_series = [
+        (second, jain_index([series.get(second, 0) for series in all_series]))
+        for second in range(overlap_start + 1, overlap_end + 1)
+    ]
+
+    flow_summaries = []
+    for flow, series in zip(flows, all_series):
+        in_overlap = [
+            rate for second, rate in series.items()
+            if overlap_start < second <= overlap_end
+        ]
+        flow_summaries.append(FlowSummary(
+            flow.exper_params.description,
+            flow.congestion,
+            flow.exper_params.bitrate,
+            flow.start_offset,
+            statistics.mean(in_overlap) if in_overlap else None,
+            sorted(series.items())
+        ))
+
+    means = [flow.mean_throughput or 0 for flow in flow_summaries]
+    return FairnessSummary(
+        exper_params.description,
+        flow_summaries,
+        overlap_start,
+        overlap_end,
+        jain_index(means),
+        jain_series,
+        convergence_time(jain_series, overlap_start, convergence_threshold),
+        convergence_threshold
+    )
+
+
+def perform_experiment(
+    global_config,
+    exper_params: generators.FairnessExperimentParams,
+    rcv: str,
+    results_dir: pathlib.Path,
+    convergence_threshold: float,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Performs one fairness experiment: starts a receiver and a sender per
+    flow, each flow on its own port `dst_port + port_offset`, starts the
+    senders at their start offsets and stops each of them `time_to_stream`
+    seconds after its start. SRT statistics are always collected.
+
+    Returns:
+        `FairnessSummary`.
+
+    Raises:
+        The same as `perform_test.perform_experiment`.
+    """
+    processes = []
+    try:
+        if rcv == 'remotely':
+            for flow in exper_params.flows:
+                rcv_srt_process = perform_test.start_receiver(
+                    global_config.rcv_ssh_host,
+                    global_config.rcv_ssh_username,
+                    global_config.rcv_path_to_srt,
+                    '',
+                    str(int(global_config.dst_port) + flow.port_offset),
+                    flow.exper_params.rcv_attrs_values,
+                    flow.exper_params.rcv_options_values,
+                    flow.exper_params.description,
+                    True,
+                    results_dir,
+                    placement_config.receiver() if placement_config else None
+                )
+                processes.append(rcv_srt_process)
+
+        # (end time, sender process) of the flows started
+        windows = []
+        start = time.monotonic()
+        for number, flow in enumerate(sorted(exper_params.flows, key=lambda flow: flow.start_offset)):
+            time.sleep(max(0, start + flow.start_offset - time.monotonic()))
+            logger.info(
+                f'Starting flow {flow.port_offset} ({flow.congestion}, '
+                f'{flow.exper_params.bitrate or "unlimited"} bps) at '
+                f'{time.monotonic() - start:.1f} s\r'
+            )
+            snd_srt_process = perform_test.start_sender(
+                0,
+                global_config.snd_path_to_srt,
+                global_config.dst_host,
+                str(int(global_config.dst_port) + flow.port_offset),
+                flow.exper_params.snd_attrs_values,
+                flow.exper_params.snd_options_values,
+                flow.exper_params.description,
+                True,
+                results_dir,
+                placement_config.sender(number) if placement_config else None
+            )
+            processes.append(snd_srt_process)
+            windows.append((
+                start + flow.start_offset + exper_params.time_to_stream,
+                snd_srt_process
+            ))
+
+        # Stop each flow at the end of its window
+        for end, snd_srt_process in sorted(windows, key=lambda window: window[0]):
+            time.sleep(max(0, end - time.monotonic()))
+            shared.cleanup_process(snd_srt_process)
+
+        summary = analyze(results_dir, exper_params, convergence_threshold)
+        logger.info(
+            f'Jain\'s fairness index: {summary.jain_index}, convergence '
+            f'time: {summary.convergence_time} s\r'
+        )
+        logger.info('Done\r')
+        return summary
+    except KeyboardInterrupt:
+        logger.info('KeyboardInterrupt has been caught')
+        raise
+    except (
+        shared.ProcessHasNotBeenStartedSuccessfully,
+        shared.ProcessHasNotBeenCreated
+    ) as error:
+        logger.info(
+            f'Exception occured ({error.__class__.__name__}): {error}'
+        )
+        raise
+    finally:
+        logger.info('Cleaning up\r')
+        for process_tuple in reversed(processes):
+            try:
+                shared.cleanup_process(process_tuple)
+            except shared.ProcessHasNotBeenKilled as error:
+                logger.info(
+                    f'During cleaning up an exception occured '
+                    f'({error.__class__.__name__}): {error}. The next '
+                    f'experiment can not be done further!'
+                )
+                raise
+        perform_test.reap_remote_processes()
+        logger.info('Done')
+
+
+def run(context: perform_test.TestContext, test_config: generators.FairnessTestConfig):
+    """
+    Performs fairness test: one fairness experiment per set of flows
+    generated by `generators.fairness_test_generator`, the summary of each
+    is saved into `{description}-fairness.json` file.
+
+    Returns:
+        A list of tuples (test description, Jain's fairness index,
+        convergence time).
+    """
+    result = []
+    for fairness_params in generators.fairness_test_generator(context.global_config, test_config):
+        try:
+            summary = perform_experiment(
+                context.rotate_port(),
+                fairness_params,
+                context.rcv,
+                context.results_dir,
+                test_config.convergence_threshold,
+                context.placement_config
+            )
+            summary.save(context.results_dir)
+        except (KeyboardInterrupt, shared.ProcessHasNotBeenKilled):
+            break
+        except (
+            shared.ProcessHasNotBeenStartedSuccessfully,
+            shared.ProcessHasNotBeenCreated
+        ) as error:
+            continue
+        finally:
+            context.retrieve(fairness_params.description)
+
+        result.append((
+            summary.description,
+            summary.jain_index,
+            summary.convergence_time
+        ))
+    return result
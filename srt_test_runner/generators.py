@@ -0,0 +1,640 @@
+import configparser
+import pathlib
+import typing
+
+import attr
+
+from srt_test_runner import profiles
+from srt_test_runner import shared
+
+# TODO:     Make constructors from section instead of filepath,
+#           Check whether generator will work as a property of ExperimentParams
+
+
+@attr.s
+class GlobalConfig:
+    """
+    Global configuration settings.
+    """
+    rcv_ssh_host: str = attr.ib()
+    rcv_ssh_username: str = attr.ib()
+    rcv_path_to_srt: str = attr.ib()
+    snd_path_to_srt: str = attr.ib()
+    snd_tshark_iface: str = attr.ib()
+    dst_host: str = attr.ib()
+    dst_port: str = attr.ib()
+    algdescr: str = attr.ib()
+    scenario: str = attr.ib()
+
+    
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        return cls(
+            parsed_config['global']['rcv_ssh_host'],
+            parsed_config['global']['rcv_ssh_username'],
+            parsed_config['global']['rcv_path_to_srt'],
+            parsed_config['global']['snd_path_to_srt'],
+            parsed_config['global']['snd_tshark_iface'],
+            parsed_config['global']['dst_host'],
+            parsed_config['global']['dst_port'],
+            parsed_config['global']['algdescr'],
+            parsed_config['global']['scenario']
+        )
+
+
+@attr.s
+class BandwidthLoopTestConfig:
+    """
+    Bandwidth loop test config.
+    """
+    bitrate_min: int = attr.ib()
+    bitrate_max: int = attr.ib()
+    bitrate_step: int = attr.ib()
+    time_to_stream: int = attr.ib()
+    # Traffic profiles each bitrate is streamed with as the average one,
+    # constant bitrate only if empty
+    profiles: typing.List['profiles.TrafficProfile'] = attr.ib(factory=list)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        profile_names = [
+            name.strip()
+            for name in parsed_config['bw-loop-test'].get('profiles', '').split(',')
+            if name.strip()
+        ]
+        return cls(
+            int(parsed_config['bw-loop-test']['bitrate_min']),
+            int(parsed_config['bw-loop-test']['bitrate_max']),
+            int(parsed_config['bw-loop-test']['bitrate_step']),
+            int(parsed_config['bw-loop-test']['time_to_stream']),
+            profiles.read_profiles(parsed_config, profile_names)
+        )
+
+
+@attr.s
+class BandwidthEstimationConfig:
+    """
+    Bandwidth estimation config. The section is optional, default values
+    are used if it is not specified within config file.
+    """
+    # Time to stream (s) at line rate
+    time_to_stream: int = attr.ib(default=5)
+    # Upper bound of the link capacity (bps) used to calculate the amount
+    # of data to send
+    bitrate_max: int = attr.ib(default=1000000000)
+    # Bitrate range of the bandwidth loop test seeded by the estimated
+    # capacity, relative to it: [capacity * (1 - margin_below),
+    # capacity * (1 + margin_above)]
+    margin_below: float = attr.ib(default=0.5)
+    margin_above: float = attr.ib(default=0.2)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('bw-estimation'):
+            return cls()
+        section = parsed_config['bw-estimation']
+        default = cls()
+        return cls(
+            section.getint('time_to_stream', default.time_to_stream),
+            section.getint('bitrate_max', default.bitrate_max),
+            section.getfloat('margin_below', default.margin_below),
+            section.getfloat('margin_above', default.margin_above)
+        )
+
+
+@attr.s
+class FlowConfig:
+    """
+    One flow of fairness test.
+    """
+    congestion: str = attr.ib()
+    # Bitrate (bps), 0 for unlimited
+    bitrate: int = attr.ib()
+    # Delay (s) of the flow start relative to the first flow
+    start_offset: int = attr.ib()
+
+    @classmethod
+    def from_string(cls, flow: str):
+        """ Parses a flow in a format congestion:bitrate:offset. """
+        congestion, bitrate, start_offset = flow.strip().split(':')
+        return cls(congestion, int(bitrate), int(start_offset))
+
+
+@attr.s
+class FairnessTestConfig:
+    """
+    Fairness test config: several flows with their own congestion control,
+    bitrate and start offset competing on the same path.
+    """
+    flows: typing.List[FlowConfig] = attr.ib()
+    # Time to stream (s) of each flow
+    time_to_stream: int = attr.ib()
+    # Upper bound of the link capacity (bps) used to calculate the amount
+    # of data to send by unlimited flows
+    bitrate_max: int = attr.ib(default=1000000000)
+    # Jain's fairness index starting from which the flows are considered
+    # to have converged
+    convergence_threshold: float = attr.ib(default=0.9)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        section = parsed_config['fairness-test']
+        return cls(
+            [
+                FlowConfig.from_string(flow)
+                for flow in section['flows'].split(',')
+                if flow.strip()
+            ],
+            int(section['time_to_stream']),
+            section.getint('bitrate_max', 1000000000),
+            section.getfloat('convergence_threshold', 0.9)
+        )
+
+
+@attr.s
+class BidirectionalTestConfig:
+    """
+    Bidirectional test config: bandwidth loop in forward direction with
+    a reverse flow of each of `reverse_bitrates` streaming at the same time.
+    """
+    bitrate_min: int = attr.ib()
+    bitrate_max: int = attr.ib()
+    bitrate_step: int = attr.ib()
+    # in bps, 0 means no reverse flow
+    reverse_bitrates: typing.List[int] = attr.ib()
+    time_to_stream: int = attr.ib()
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        section = parsed_config['bidirectional-test']
+        return cls(
+            int(section['bitrate_min']),
+            int(section['bitrate_max']),
+            int(section['bitrate_step']),
+            [int(bitrate) for bitrate in section['reverse_bitrates'].split(',')],
+            int(section['time_to_stream'])
+        )
+
+
+def determine_msg_size(msg_size: str):
+    """ In Bytes """
+    if msg_size == '1456B':
+        return 1456
+    if msg_size == '4MB':
+        return 4 * 1024 * 1024
+    if msg_size == '8MB':
+        return 8 * 1024 * 1024
+
+
+@attr.s
+class FileCCLoopTestConfig:
+    """
+    File CC (Congestion Control) loop test config.
+    """ 
+    msg_size: int = attr.ib()
+    bandwidth: int = attr.ib()
+    rtt: int = attr.ib()
+    cc_algorithms: typing.List[str] = attr.ib()
+    time_to_stream: int = attr.ib()
+    # Calculate flow control and buffers from bandwidth and RTT instead
+    # of using hard-coded values. Used when bandwidth and RTT have been
+    # measured, see `perform_combined_test.bw_filecc_loop_test`
+    size_to_link: bool = attr.ib(default=False)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+
+        return cls(
+            determine_msg_size(parsed_config['filecc-loop-test']['msg_size']),
+            int(parsed_config['filecc-loop-test']['bandwidth']),
+            int(parsed_config['filecc-loop-test']['rtt']),
+            parsed_config['filecc-loop-test']['congestion'].split(','),
+            int(parsed_config['filecc-loop-test']['time_to_stream'])
+        )
+
+
+@attr.s
+class ExperimentParams:
+    # TODO: Make default = None
+    rcv_attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]] = attr.ib()
+    rcv_options_values: typing.Optional[typing.List[typing.Tuple[str, str]]] = attr.ib()
+    snd_attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]] = attr.ib()
+    snd_options_values: typing.Optional[typing.List[typing.Tuple[str, str]]] = attr.ib()
+    # in bps
+    bitrate: int = attr.ib()
+    # Information needed to form .csv stats and .pcapng WireShark
+    # files' names
+    description: str = attr.ib()
+    # in s
+    time_to_stream: int = attr.ib()
+    # Maximum extra time (s) to wait for senders to finish streaming,
+    # senders are stopped after that. Wait until finished if None
+    max_extra_time: typing.Optional[int] = attr.ib(default=None)
+    # Reverse flow streaming from a receiver side to a sender side
+    # during the experiment, see `bidirectional_test_generator`
+    reverse: typing.Optional['ExperimentParams'] = attr.ib(default=None)
+    # Name of the traffic profile `bitrate` is the average bitrate of,
+    # see `profiles.TrafficProfile`
+    profile: typing.Optional[str] = attr.ib(default=None)
+
+
+def with_description(exper_params: ExperimentParams, description: str):
+    """
+    Returns:
+        Experiment params renamed to `description`, e.g. for a rerun, with
+        the reverse flow renamed to `{description}-reverse` accordingly,
+        so that the files of the runs do not overwrite each other.
+    """
+    reverse = exper_params.reverse
+    if reverse is not None:
+        reverse = attr.evolve(reverse, description=f'{description}-reverse')
+    return attr.evolve(exper_params, description=description, reverse=reverse)
+
+
+def bw_loop_test_generator(
+    global_config,
+    test_config
+):
+
+    # TODO: Check whether it will work as a property of ExperimentParams
+
+    for bitrate, profile in (
+        (bitrate, profile)
+        for bitrate in range(test_config.bitrate_min, test_config.bitrate_max, test_config.bitrate_step)
+        for profile in (test_config.profiles or [None])
+    ):
+        # Calculate number of packets for time_to_stream sec of streaming
+        # based on the target bitrate and packet size
+        repeat = test_config.time_to_stream * bitrate // (1456 * 8)
+        segments = None
+        if profile is not None and profile.type != profiles.CBR:
+            segments = profile.segments(bitrate, test_config.time_to_stream)
+        # Bursts are not to be limited by maxbw, including the bitrate
+        # raised to make up for the connection overhead of segments
+        peak_bitrate = max(b for _, b in segments) * profiles.MAX_RATE_RAISE if segments else bitrate
+        maxbw  = int(peak_bitrate // 8 * 1.25)
+        
+        rcv_attrs_values = [
+            ('rcvbuf', '12058624'), 
+            ('congestion', 'live'), 
+            ('maxcon', '50')
+        ]
+        rcv_options_values = [
+            ('-msgsize', '1456'), 
+            ('-reply', '0'), 
+            ('-printmsg', '0')
+        ]
+        snd_attrs_values = [
+            ('sndbuf', '12058624'), 
+            ('congestion', 'live'), 
+            ('maxbw', str(maxbw)),
+        ]
+        snd_options_values = [
+            ('-msgsize', '1456'), 
+            ('-reply', '0'), 
+            ('-printmsg', '0'), 
+            ('-bitrate', str(bitrate)),
+            ('-repeat', str(repeat)),
+        ]
+        if segments is not None:
+            snd_options_values += [(profiles.SEGMENTS_OPTION, profiles.format_segments(segments))]
+        description = f'{global_config.scenario}-alg-{global_config.algdescr}-bitr-{bitrate / shared.DELIMETER}Mbps'
+        if profile is not None:
+            description += f'-prof-{profile.name}'
+        
+        exper_params = ExperimentParams(
+            rcv_attrs_values,
+            rcv_options_values,
+            snd_attrs_values,
+            snd_options_values,
+            bitrate,
+            description,
+            test_config.time_to_stream,
+            profile=profile.name if profile is not None else None
+        )
+
+        yield exper_params
+
+
+# Reverse flow of bidirectional test uses port dst_port + REVERSE_PORT_OFFSET
+REVERSE_PORT_OFFSET = 1
+
+def bidirectional_test_generator(
+    global_config,
+    test_config
+):
+    """
+    Generates live mode experiments for each forward bitrate from
+    [bitrate_min, bitrate_max) and each reverse bitrate. The reverse flow
+    is streamed by a sender started on a receiver side as a listener to
+    a receiver started on a sender side as a caller, so it does not
+    require a sender side to be reachable from a receiver side. The
+    reverse flow streams longer than the forward one and is stopped when
+    the forward one has finished.
+    """
+    for bitrate in range(test_config.bitrate_min, test_config.bitrate_max, test_config.bitrate_step):
+        forward = next(bw_loop_test_generator(
+            global_config,
+            BandwidthLoopTestConfig(
+                bitrate,
+                bitrate + 1,
+                1,
+                test_config.time_to_stream
+            )
+        ))
+        for reverse_bitrate in test_config.reverse_bitrates:
+            description = (
+                f'{forward.description}-rev-{reverse_bitrate / shared.DELIMETER}Mbps'
+            )
+            reverse = None
+            if reverse_bitrate > 0:
+                # Streams twice longer, stopped after the forward flow
+                repeat = 2 * test_config.time_to_stream * reverse_bitrate // (1456 * 8)
+                maxbw  = int(reverse_bitrate // 8 * 1.25)
+                reverse = ExperimentParams(
+                    [
+                        ('rcvbuf', '12058624'),
+                        ('congestion', 'live'),
+                    ],
+                    [
+                        ('-msgsize', '1456'),
+                        ('-reply', '0'),
+                        ('-printmsg', '0')
+                    ],
+                    [
+                        ('sndbuf', '12058624'),
+                        ('congestion', 'live'),
+                        ('maxbw', str(maxbw)),
+                    ],
+                    [
+                        ('-msgsize', '1456'),
+                        ('-reply', '0'),
+                        ('-printmsg', '0'),
+                        ('-bitrate', str(reverse_bitrate)),
+                        ('-repeat', str(repeat)),
+                    ],
+                    reverse_bitrate,
+                    f'{description}-reverse',
+                    2 * test_config.time_to_stream
+                )
+            yield attr.evolve(forward, description=description, reverse=reverse)
+
+
+def bw_estimation_generator(
+    global_config,
+    test_config
+):
+    """
+    Generates one experiment which sends packet trains at line rate
+    (file congestion control, no bitrate limit) for `time_to_stream`
+    seconds. SRT receiver measures packet pairs dispersion and reports
+    the estimated link capacity back to the sender, where it appears
+    in `mbpsBandwidth` column of sender statistics.
+    """
+    # Enough packets to keep streaming at bitrate_max for time_to_stream
+    # seconds, the sender is stopped after that anyway
+    repeat = test_config.time_to_stream * test_config.bitrate_max // (1456 * 8)
+
+    rcv_attrs_values = [
+        ('rcvbuf', '12058624'),
+        ('congestion', 'file'),
+        ('maxcon', '50')
+    ]
+    rcv_options_values = [
+        ('-msgsize', '1456'),
+        ('-reply', '0'),
+        ('-printmsg', '0')
+    ]
+    snd_attrs_values = [
+        ('sndbuf', '12058624'),
+        ('congestion', 'file'),
+    ]
+    snd_options_values = [
+        ('-msgsize', '1456'),
+        ('-reply', '0'),
+        ('-printmsg', '0'),
+        ('-repeat', str(repeat)),
+    ]
+    description = f'{global_config.scenario}-alg-{global_config.algdescr}-bw-estimation'
+
+    yield ExperimentParams(
+        rcv_attrs_values,
+        rcv_options_values,
+        snd_attrs_values,
+        snd_options_values,
+        test_config.bitrate_max,
+        description,
+        test_config.time_to_stream,
+        max_extra_time=0
+    )
+
+
+@attr.s
+class FlowParams:
+    """
+    Parameters of one flow of a fairness experiment. The flow has its own
+    receiver listening on `dst_port + port_offset`, because SRT rejects
+    connections with congestion control different from the listener's one.
+    """
+    exper_params: ExperimentParams = attr.ib()
+    port_offset: int = attr.ib()
+    start_offset: int = attr.ib()
+    congestion: str = attr.ib()
+
+
+@attr.s
+class FairnessExperimentParams:
+    description: str = attr.ib()
+    time_to_stream: int = attr.ib()
+    flows: typing.List[FlowParams] = attr.ib()
+
+
+def fairness_test_generator(
+    global_config,
+    test_config
+):
+    """
+    Generates one fairness experiment with one sender per flow. Flows with
+    bitrate 0 stream as fast as their congestion control allows, the others
+    are limited to their bitrate. Each flow streams for `time_to_stream`
+    seconds starting from its start offset.
+    """
+    description = f'{global_config.scenario}-alg-{global_config.algdescr}-fairness'
+    flows = []
+    for i, flow in enumerate(test_config.flows):
+        bitrate = flow.bitrate or test_config.bitrate_max
+        repeat = test_config.time_to_stream * bitrate // (1456 * 8)
+
+        rcv_attrs_values = [
+            ('rcvbuf', '12058624'),
+            ('congestion', flow.congestion),
+            ('maxcon', '50')
+        ]
+        rcv_options_values = [
+            ('-msgsize', '1456'),
+            ('-reply', '0'),
+            ('-printmsg', '0')
+        ]
+        snd_attrs_values = [
+            ('sndbuf', '12058624'),
+            ('congestion', flow.congestion),
+        ]
+        snd_options_values = [
+            ('-msgsize', '1456'),
+            ('-reply', '0'),
+            ('-printmsg', '0'),
+        ]
+        if flow.bitrate:
+            snd_attrs_values += [('maxbw', str(int(flow.bitrate // 8 * 1.25)))]
+            snd_options_values += [('-bitrate', str(flow.bitrate))]
+        snd_options_values += [('-repeat', str(repeat))]
+
+        exper_params = ExperimentParams(
+            rcv_attrs_values,
+            rcv_options_values,
+            snd_attrs_values,
+            snd_options_values,
+            flow.bitrate,
+            f'{description}-flow-{i}-CC-{flow.congestion}',
+            test_config.time_to_stream,
+            max_extra_time=0
+        )
+        flows.append(FlowParams(exper_params, i, flow.start_offset, flow.congestion))
+
+    yield FairnessExperimentParams(description, test_config.time_to_stream, flows)
+
+
+def seed_bw_loop_test_config(
+    test_config: BandwidthLoopTestConfig,
+    estimation_config: BandwidthEstimationConfig,
+    capacity: int
+):
+    """
+    Returns:
+        A copy of bandwidth loop test config with `bitrate_min` and
+        `bitrate_max` narrowed to the region around estimated link
+        `capacity` (bps), rounded to `bitrate_step`.
+    """
+    step = test_config.bitrate_step
+    bitrate_min = int(capacity * (1 - estimation_config.margin_below)) // step * step
+    bitrate_max = -(-int(capacity * (1 + estimation_config.margin_above)) // step) * step
+    return attr.evolve(
+        test_config,
+        bitrate_min=max(step, bitrate_min),
+        # bitrate_max is not included into the loop
+        bitrate_max=bitrate_max + step
+    )
+
+
+# Packet size (B, Bytes)
+PACKET_SIZE = 1472
+
+# Minimum flow control (packets) accepted by SRT
+MIN_FLOW_CONTROL = 32
+
+def calculate_flow_control(snd_rate, rtt, size_to_link: bool=False):
+    """ 
+    Attributes:
+        snd_rate: 
+            Sending rate (bytes/s).
+        rtt:
+            Round trip time (ms).
+        size_to_link:
+            Calculate flow control from sending rate and RTT instead of
+            using the hard-coded value.
+
+    Returns:
+        Flow control in packets.
+    """
+    if size_to_link:
+        # Twice the bandwidth-delay product with 10 ms added to RTT
+        fc = snd_rate * ((rtt + 10) / 1000) * 2 / PACKET_SIZE
+        return max(MIN_FLOW_CONTROL, int(round(fc, 0)))
+    # FIXME: Adjust formula for the hard-coded case as well
+    return 60000
+
+def calculate_buffer_size(msg_size, fc, size_to_link: bool=False):
+    """
+    Returns:
+        Sender and receiver buffer size in bytes.
+    """
+    if size_to_link:
+        return max(2 * fc * PACKET_SIZE, 5 * msg_size)
+    # FIXME: Adjust formula for the hard-coded case as well
+    # 1Gb in bytes
+    return 125000000
+
+
+def filecc_loop_test_generator(
+    global_config,
+    test_config
+):
+
+    # TODO: Check whether it will work as a property of ExperimentParams
+
+    for cc_algorithm in test_config.cc_algorithms:
+        # Calculate number of packets for time_to_stream sec of streaming
+        # based on the available bandwidth (in bytes) and message size
+        repeat = test_config.time_to_stream * test_config.bandwidth // test_config.msg_size
+        # We set the value of sending rate equal to available bandwidth,
+        # because we would like to stream with the maximum available rate 
+        fc = calculate_flow_control(
+            test_config.bandwidth,
+            test_config.rtt,
+            test_config.size_to_link
+        )
+        buffer_size = calculate_buffer_size(
+            test_config.msg_size,
+            fc,
+            test_config.size_to_link
+        )
+        
+        rcv_attrs_values = [
+            ('rcvbuf', str(buffer_size)),
+            ('sndbuf', str(buffer_size)),
+            ('fc', str(fc)),
+            ('congestion', cc_algorithm),
+        ]
+        rcv_options_values = [
+            ('-msgsize', str(test_config.msg_size)), 
+            ('-reply', '0'), 
+            ('-printmsg', '0')
+        ]
+        snd_attrs_values = rcv_attrs_values
+        snd_options_values = [
+            ('-msgsize', str(test_config.msg_size)), 
+            ('-reply', '0'), 
+            ('-printmsg', '0'),
+            ('-repeat', str(repeat)),
+        ]
+        description = f'{global_config.scenario}-alg-{global_config.algdescr}-CC-{cc_algorithm}-msgsize-{test_config.msg_size}'
+        
+        exper_params = ExperimentParams(
+            rcv_attrs_values,
+            rcv_options_values,
+            snd_attrs_values,
+            snd_options_values,
+            test_config.bandwidth * 8,
+            description,
+            test_config.time_to_stream
+        )
+
+        yield exper_params
\ No newline at end of file
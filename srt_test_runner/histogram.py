@@ -0,0 +1,118 @@
+import json
+import pathlib
+import struct
+import typing
+
+
+# Histogram file format: MAGIC, header length (uint32), header (JSON with
+# histogram names and settings), then for each histogram the number of
+# non-empty buckets (uint32) followed by (bucket index (uint32), count
+# (uint64)) records
+MAGIC = b'SRTHIST1'
+
+
+class Histogram:
+    """
+    Log-linear histogram of non-negative integer values in the spirit
+    of HdrHistogram: values are recorded with a relative error below
+    1 / `sub_bucket_half`, memory does not depend on the number of values
+    recorded, and only non-empty buckets are stored.
+    """
+
+    def __init__(self, sub_bucket_bits: int=8):
+        """
+        Attributes:
+            sub_bucket_bits:
+                8 gives 256 sub-buckets, i.e. 2 significant decimal digits.
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_half = 1 << (sub_bucket_bits - 1)
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    def index(self, value: int):
+        bucket = max(0, value.bit_length() - self.sub_bucket_bits)
+        return bucket * self.sub_bucket_half + (value >> bucket)
+
+    def highest_equivalent_value(self, index: int):
+        if index < 2 * self.sub_bucket_half:
+            return index
+        bucket = index // self.sub_bucket_half - 1
+        sub_bucket = index - bucket * self.sub_bucket_half
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, value: int, count: int=1):
+        value = max(0, int(value))
+        index = self.index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'Histogram'):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float):
+        """
+        Returns:
+            The value below or equal to which `percentile` percent of
+            the recorded values fall, None if the histogram is empty.
+        """
+        if self.total == 0:
+            return None
+        # At least one value has to be counted, so that 0th percentile
+        # is the minimum
+        threshold = max(1, percentile / 100 * self.total)
+        counted = 0
+        for index in sorted(self.counts):
+            counted += self.counts[index]
+            if counted >= threshold:
+                return min(self.highest_equivalent_value(index), self.max)
+        return self.max
+
+
+def save(filepath: pathlib.Path, histograms: typing.Dict[str, Histogram]):
+    names = list(histograms)
+    header = json.dumps({
+        'names': names,
+        'sub_bucket_bits': [histograms[name].sub_bucket_bits for name in names],
+    }).encode('utf-8')
+    with filepath.open('wb') as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack('<I', len(header)))
+        fp.write(header)
+        for name in names:
+            counts = histograms[name].counts
+            fp.write(struct.pack('<I', len(counts)))
+            for index in sorted(counts):
+                fp.write(struct.pack('<IQ', index, counts[index]))
+
+
+def load(filepath: pathlib.Path):
+    """
+    Returns:
+        A dictionary {name: `Histogram`} read from a file written
+        by `save`. The maximum values are approximated by bucket bounds.
+    """
+    with filepath.open('rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{filepath} is not a histogram file')
+        header_length, = struct.unpack('<I', fp.read(4))
+        header = json.loads(fp.read(header_length).decode('utf-8'))
+        histograms = {}
+        for name, sub_bucket_bits in zip(header['names'], header['sub_bucket_bits']):
+            histogram = Histogram(sub_bucket_bits)
+            buckets, = struct.unpack('<I', fp.read(4))
+            for _ in range(buckets):
+                index, count = struct.unpack('<IQ', fp.read(12))
+                histogram.counts[index] = count
+                histogram.total += count
+                histogram.max = max(
+                    histogram.max,
+                    histogram.highest_equivalent_value(index)
+                )
+            histograms[name] = histogram
+    return histograms
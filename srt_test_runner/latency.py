@@ -0,0 +1,122 @@
+import logging
+import pathlib
+import threading
+import typing
+
+import attr
+
+from srt_test_runner import histogram
+from srt_test_runner import stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Histograms collected by name: statistics column (ms) the values are
+# taken from. Values are recorded in microseconds
+METRICS = {
+    'rtt': stats.RTT,
+    'snd_buffer': stats.SND_BUFFER,
+}
+PERCENTILES = [50, 99, 99.9]
+# Minimum number of values for a percentile to be meaningful. The values
+# are sampled once per `-statsfreq` interval (whole seconds), e.g. ~60
+# per sender for a 1 min experiment, so a tail percentile of fewer values
+# is close to the maximum. It is reported anyway and listed in
+# `LatencySummary.low_count`
+MIN_COUNTS = {99: 100, 99.9: 1000}
+# Interval (s) of reading new rows of statistics files
+POLL_INTERVAL = 0.5
+
+
+@attr.s
+class LatencySummary:
+    """
+    Latency percentiles (ms) of one metric during an experiment. These
+    are percentiles of SRT statistics sampled by the senders (`msRTT` is
+    smoothed by SRT), not of end-to-end message latency.
+    """
+    count: int = attr.ib()
+    p50: typing.Optional[float] = attr.ib()
+    p99: typing.Optional[float] = attr.ib()
+    p99_9: typing.Optional[float] = attr.ib()
+    max: typing.Optional[float] = attr.ib()
+    # Percentiles calculated from fewer values than `MIN_COUNTS` requires
+    low_count: typing.List[float] = attr.ib(factory=list)
+
+    @classmethod
+    def from_histogram(cls, hist: histogram.Histogram):
+        def to_ms(value):
+            return None if value is None else value / 1000
+
+        p50, p99, p99_9 = [to_ms(hist.percentile(p)) for p in PERCENTILES]
+        return cls(
+            hist.total,
+            p50,
+            p99,
+            p99_9,
+            to_ms(hist.max) if hist.total else None,
+            [p for p in PERCENTILES if hist.total < MIN_COUNTS.get(p, 0)]
+        )
+
+
+class LatencyCollector:
+    """
+    Follows SRT statistics files of the senders while they are streaming
+    and records latency values into histograms, so that values are not
+    buffered in memory and the statistics files are read only once.
+    """
+
+    def __init__(self, filepaths: typing.List[pathlib.Path]):
+        self.tails = [stats.StatsTail(filepath) for filepath in filepaths]
+        self.histograms = {name: histogram.Histogram() for name in METRICS}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _collect(self):
+        for tail in self.tails:
+            for row in tail.read_new_rows():
+                for name, column in METRICS.items():
+                    value = row.get(column)
+                    if value is not None:
+                        self.histograms[name].record(round(value * 1000))
+
+    def _run(self):
+        while not self.stop_event.wait(POLL_INTERVAL):
+            try:
+                self._collect()
+            except OSError as error:
+                logger.info(
+                    f'Latency has not been collected. Exception occured '
+                    f'({error.__class__.__name__}): {error}'
+                )
+
+    def stop(self, filepath: typing.Optional[pathlib.Path]=None):
+        """
+        Stops following, reads the rest of statistics files and, if
+        `filepath` is specified, saves the histograms there.
+
+        Returns:
+            A dictionary {metric name: `LatencySummary`} for the metrics
+            with at least one value recorded.
+        """
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+            self._collect()
+            if filepath is not None:
+                histogram.save(filepath, self.histograms)
+        return {
+            name: LatencySummary.from_histogram(hist)
+            for name, hist in self.histograms.items()
+            if hist.total > 0
+        }
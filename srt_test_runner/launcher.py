@@ -0,0 +1,311 @@
+import array
+import logging
+import os
+import pathlib
+import signal
+import subprocess
+import time
+import typing
+
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Number of processes spawned at once, and pause (s) between batches
+# not to flood a listener with simultaneous connection requests
+SPAWN_BATCH_SIZE = 50
+SPAWN_BATCH_INTERVAL = 0.05
+# File descriptors and processes reserved for the script itself and
+# the other processes of the user (logs, SSH, tshark, etc.)
+RESERVED_FDS = 256
+RESERVED_PROCESSES = 256
+# Return code of a process which is still running
+RUNNING = -(2 ** 31)
+# Return code of a process reaped somewhere else, its exit status is
+# lost, so it is counted as failed
+UNKNOWN = RUNNING + 1
+# Interval (s) of reaping processes spawned with limited concurrency,
+# the resolution of their end times
+CHURN_POLL_INTERVAL = 0.002
+
+
+class ResourceLimitTooLow(Exception):
+    pass
+
+
+def ensure_limit(name: str, required: int):
+    """
+    Raises the soft limit of a resource `name` (e.g., 'RLIMIT_NOFILE',
+    'RLIMIT_NPROC') up to the hard limit if it is lower than `required`.
+    Limits are inherited by child processes.
+
+    Returns:
+        The soft limit.
+
+    Raises:
+        ResourceLimitTooLow
+    """
+    # Not available on Windows
+    import resource
+
+    limit = getattr(resource, name)
+    soft, hard = resource.getrlimit(limit)
+    if soft == resource.RLIM_INFINITY or soft >= required:
+        return soft
+
+    new_soft = required if hard == resource.RLIM_INFINITY else min(required, hard)
+    resource.setrlimit(limit, (new_soft, hard))
+    logger.info(f'{name} soft limit raised from {soft} to {new_soft}\r')
+    if new_soft < required:
+        raise ResourceLimitTooLow(f'{name}: {required} required, hard limit is {hard}')
+    return new_soft
+
+
+def waitstatus_to_exitcode(status: int):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class ProcessTable:
+    """
+    Compact table of child processes: pids, start and end times and return
+    codes are stored in arrays instead of a list of (name, Popen) tuples.
+    Not supported on Windows.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pids = array.array('i')
+        self.start_times = array.array('d')
+        # NaN while running
+        self.end_times = array.array('d')
+        self.returncodes = array.array('i')
+
+    def __len__(self):
+        return len(self.pids)
+
+    def spawn(self, args: typing.List[str], log_filepath: pathlib.Path):
+        """
+        Spawns a process with stdout and stderr redirected into
+        `log_filepath`. The file is opened in the child, so the script
+        does not hold any file descriptors of the process.
+
+        Returns:
+            Index of the process in the table.
+
+        Raises:
+            shared.ProcessHasNotBeenCreated
+        """
+        args = [str(arg) for arg in args]
+        try:
+            if hasattr(os, 'posix_spawn'):
+                pid = os.posix_spawn(
+                    args[0],
+                    args,
+                    os.environ,
+                    file_actions=[
+                        (
+                            os.POSIX_SPAWN_OPEN, 1, str(log_filepath),
+                            os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+                        ),
+                        (os.POSIX_SPAWN_DUP2, 1, 2),
+                        (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                    ]
+                )
+            else:
+                # Python < 3.8
+                with log_filepath.open('wb') as fp:
+                    pid = subprocess.Popen(
+                        args,
+                        stdin=subprocess.DEVNULL,
+                        stdout=fp,
+                        stderr=subprocess.STDOUT
+                    ).pid
+        except OSError as e:
+            raise shared.ProcessHasNotBeenCreated(
+                f'{self.name} {len(self)}. Error: {e}'
+            )
+
+        self.pids.append(pid)
+        self.start_times.append(time.monotonic())
+        self.end_times.append(float('nan'))
+        self.returncodes.append(RUNNING)
+        return len(self) - 1
+
+    def reap(self, i: int):
+        """
+        Reaps process `i` if it has finished.
+
+        Returns:
+            True if the process has finished.
+        """
+        if self.returncodes[i] != RUNNING:
+            return True
+        try:
+            wpid, status = os.waitpid(self.pids[i], os.WNOHANG)
+        except ChildProcessError:
+            # Already reaped somewhere else
+            self.returncodes[i] = UNKNOWN
+            self.end_times[i] = time.monotonic()
+            return True
+        if wpid == 0:
+            return False
+        self.returncodes[i] = waitstatus_to_exitcode(status)
+        self.end_times[i] = time.monotonic()
+        return True
+
+    def poll(self):
+        """
+        Reaps finished processes.
+
+        Returns:
+            Number of processes still running.
+        """
+        return sum(not self.reap(i) for i in range(len(self)))
+
+    def failed(self):
+        """
+        Returns:
+            A list of indexes of the processes finished with non-zero
+            return code.
+        """
+        return [
+            i for i, returncode in enumerate(self.returncodes)
+            if returncode not in (RUNNING, 0)
+        ]
+
+    def send_signal(self, sig):
+        """
+        Sends a signal to the processes which are still running. Processes
+        which have finished, but have not been reaped by `poll` yet, keep
+        their pids, so a pid can not be reused by another process here.
+        """
+        for i, pid in enumerate(self.pids):
+            if self.returncodes[i] != RUNNING:
+                continue
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def calculate_extra_time(self, max_extra_time: typing.Optional[int]=None):
+        """
+        Calculate extra time needed for processes to finish, the same
+        as `shared.calculate_extra_time`.
+        """
+        extra_time = 0
+        while self.poll() > 0:
+            if max_extra_time is not None and extra_time >= max_extra_time:
+                break
+            time.sleep(1)
+            extra_time += 1
+        return extra_time
+
+    def cleanup(self):
+        """
+        Clean up actions for all the processes in the table: SIGINT and,
+        if processes are still running in 3 s, SIGKILL.
+
+        Raises:
+            shared.ProcessHasNotBeenKilled
+        """
+        if self.poll() == 0:
+            logger.info(f'{self.name}: processes are not running\r')
+            return
+
+        logger.info(f'{self.name}: terminating {len(self)} processes\r')
+        self.send_signal(signal.SIGINT)
+        for i in range(3):
+            time.sleep(1)
+            if self.poll() == 0:
+                logger.info(f'{self.name}: terminated\r')
+                return
+
+        logger.info(f'{self.name}: killing\r')
+        self.send_signal(signal.SIGKILL)
+        time.sleep(1)
+        running = self.poll()
+        if running > 0:
+            raise shared.ProcessHasNotBeenKilled(
+                f'{self.name}: {running} processes are still running'
+            )
+        logger.info(f'{self.name}: killed\r')
+
+
+def spawn_in_batches(
+    table: ProcessTable,
+    processes_args: typing.Iterable[typing.Tuple[typing.List[str], pathlib.Path]],
+    batch_size: int=SPAWN_BATCH_SIZE,
+    on_spawned: typing.Optional[typing.Callable[[int, int], None]]=None
+):
+    """
+    Spawns processes from (args, log_filepath) tuples in batches of
+    `batch_size` processes. `on_spawned(index, pid)` is called right after
+    each process has been spawned.
+
+    Raises:
+        shared.ProcessHasNotBeenCreated
+    """
+    for args, log_filepath in processes_args:
+        i = table.spawn(args, log_filepath)
+        if on_spawned is not None:
+            on_spawned(i, table.pids[i])
+        if (i + 1) % batch_size == 0:
+            time.sleep(SPAWN_BATCH_INTERVAL)
+
+
+def spawn_with_concurrency(
+    table: ProcessTable,
+    processes_args: typing.Iterable[typing.Tuple[typing.List[str], pathlib.Path]],
+    concurrency: int,
+    timeout: typing.Optional[float]=None,
+    on_spawned: typing.Optional[typing.Callable[[int, int], None]]=None
+):
+    """
+    Spawns processes from (args, log_filepath) tuples keeping `concurrency`
+    of them running: the next process is spawned as soon as one has
+    finished, e.g. to open short-lived connections one after another.
+    Processes running for longer than `timeout` seconds are killed.
+    Returns once all the processes have finished, their end times
+    are known to `CHURN_POLL_INTERVAL`.
+
+    Raises:
+        shared.ProcessHasNotBeenCreated
+    """
+    processes_args = iter(processes_args)
+    running = []
+    exhausted = False
+    while True:
+        while not exhausted and len(running) < concurrency:
+            try:
+                args, log_filepath = next(processes_args)
+            except StopIteration:
+                exhausted = True
+                break
+            i = table.spawn(args, log_filepath)
+            if on_spawned is not None:
+                on_spawned(i, table.pids[i])
+            running.append(i)
+        if not running:
+            return
+
+        time.sleep(CHURN_POLL_INTERVAL)
+        now = time.monotonic()
+        still_running = []
+        for i in running:
+            if table.reap(i):
+                continue
+            if timeout is not None and now - table.start_times[i] > timeout:
+                try:
+                    os.kill(table.pids[i], signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            still_running.append(i)
+        running = still_running
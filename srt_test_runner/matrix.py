@@ -0,0 +1,268 @@
+import concurrent.futures
+import configparser
+import json
+import logging
+import pathlib
+import subprocess
+import sys
+import time
+import typing
+
+import attr
+import click
+
+from srt_test_runner import perform_test
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Sections of scenarios are named [scenario:NAME], their keys override
+# the keys of `global` section
+SCENARIO_SECTION_PREFIX = 'scenario:'
+INDEX_FILENAME = 'index.json'
+
+
+@attr.s
+class Scenario:
+    name: str = attr.ib()
+    # Scenarios with the same bottleneck label share a part of the path
+    # (e.g., the same uplink) and are not run at the same time
+    bottleneck: str = attr.ib()
+    # Keys of `global` section with the overrides of the scenario applied
+    global_values: typing.Dict[str, str] = attr.ib()
+
+
+def read_scenarios(config_filepath: pathlib.Path):
+    """
+    Reads [scenario:NAME] sections of config file. The bottleneck of
+    a scenario defaults to its sender network interface, so that scenarios
+    sharing the sender uplink are run one after another unless configured
+    otherwise.
+
+    Returns:
+        A list of `Scenario` in order of the sections.
+    """
+    parsed_config = configparser.ConfigParser()
+    with config_filepath.open('r', encoding='utf-8') as fp:
+        parsed_config.read_file(fp)
+
+    scenarios = []
+    for section_name in parsed_config.sections():
+        if not section_name.startswith(SCENARIO_SECTION_PREFIX):
+            continue
+        name = section_name[len(SCENARIO_SECTION_PREFIX):].strip()
+        section = parsed_config[section_name]
+        global_values = dict(parsed_config['global']) if parsed_config.has_section('global') else {}
+        global_values.update(
+            (key, value) for key, value in section.items()
+            if key != 'bottleneck'
+        )
+        global_values['scenario'] = name
+        scenarios.append(Scenario(
+            name,
+            section.get('bottleneck', global_values.get('snd_tshark_iface', '')),
+            global_values
+        ))
+    return scenarios
+
+
+def write_scenario_config(
+    config_filepath: pathlib.Path,
+    scenario: Scenario,
+    filepath: pathlib.Path
+):
+    """
+    Writes a config file for one scenario: `global` section is replaced
+    with the values of the scenario, scenario sections are removed, and
+    all the other sections are kept as is.
+    """
+    parsed_config = configparser.ConfigParser()
+    with config_filepath.open('r', encoding='utf-8') as fp:
+        parsed_config.read_file(fp)
+    for section_name in parsed_config.sections():
+        if section_name.startswith(SCENARIO_SECTION_PREFIX):
+            parsed_config.remove_section(section_name)
+    parsed_config['global'] = scenario.global_values
+    with filepath.open('w', encoding='utf-8') as fp:
+        parsed_config.write(fp)
+
+
+def group_by_bottleneck(scenarios: typing.List[Scenario]):
+    """
+    Returns:
+        A list of groups of scenarios. Scenarios within a group share
+        a bottleneck and are run one after another, groups are
+        independent and can be run in parallel.
+    """
+    groups = {}
+    for scenario in scenarios:
+        groups.setdefault(scenario.bottleneck, []).append(scenario)
+    return list(groups.values())
+
+
+@attr.s
+class ScenarioRun:
+    """
+    Entry of the combined results index.
+    """
+    scenario: str = attr.ib()
+    bottleneck: str = attr.ib()
+    results_dir: str = attr.ib()
+    returncode: typing.Optional[int] = attr.ib(default=None)
+    # Start and finish (Unix time)
+    started: typing.Optional[float] = attr.ib(default=None)
+    finished: typing.Optional[float] = attr.ib(default=None)
+    # Experiment summaries (`perform_test.ExperimentResult`) as saved
+    summaries: typing.List[dict] = attr.ib(factory=list)
+
+
+def run_scenario(
+    test_name: str,
+    config_filepath: pathlib.Path,
+    scenario: Scenario,
+    results_dir: pathlib.Path,
+    test_args: typing.List[str]
+):
+    """
+    Runs perform_test for one scenario in a separate process with its
+    output written into `{results_dir}/{scenario}.log`.
+
+    Returns:
+        `ScenarioRun`.
+    """
+    scenario_dir = results_dir / scenario.name
+    run = ScenarioRun(scenario.name, scenario.bottleneck, str(scenario_dir))
+    scenario_config_filepath = results_dir / f'{scenario.name}.ini'
+    write_scenario_config(config_filepath, scenario, scenario_config_filepath)
+
+    args = [
+        sys.executable,
+        '-m', perform_test.__name__,
+        test_name,
+        str(scenario_config_filepath),
+        '--results-dir', str(scenario_dir),
+    ]
+    args += test_args
+
+    logger.info(f'Starting scenario {scenario.name} (bottleneck {scenario.bottleneck})')
+    run.started = time.time()
+    with (results_dir / f'{scenario.name}.log').open('wb') as log_fp:
+        run.returncode = subprocess.call(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=log_fp,
+            stderr=subprocess.STDOUT
+        )
+    run.finished = time.time()
+    logger.info(
+        f'Finished scenario {scenario.name}, returncode {run.returncode}, '
+        f'{run.finished - run.started:.0f} s'
+    )
+
+    for filepath in sorted(scenario_dir.glob('*-summary.json')):
+        with filepath.open('r', encoding='utf-8') as fp:
+            run.summaries.append(json.load(fp))
+    return run
+
+
+def run_group(
+    test_name: str,
+    config_filepath: pathlib.Path,
+    group: typing.List[Scenario],
+    results_dir: pathlib.Path,
+    test_args: typing.List[str]
+):
+    return [
+        run_scenario(test_name, config_filepath, scenario, results_dir, test_args)
+        for scenario in group
+    ]
+
+
+@click.command(context_settings=dict(ignore_unknown_options=True))
+@click.argument(
+    'test_name',
+    type=click.Choice(perform_test.TEST_NAMES)
+)
+@click.argument(
+    'config_filepath',
+    type=click.Path(exists=True)
+)
+@click.argument(
+    'test_args',
+    nargs=-1,
+    type=click.UNPROCESSED
+)
+@click.option(
+    '--results-dir',
+    default='_results',
+    help=   'Directory to store results, each scenario is stored in its '
+            'own subdirectory.',
+    show_default=True
+)
+@click.option(
+    '--max-parallel',
+    default=4,
+    help=   'Maximum number of scenarios run in parallel.',
+    show_default=True
+)
+def main(
+    test_name: str,
+    config_filepath: str,
+    test_args: typing.Tuple[str],
+    results_dir: str,
+    max_parallel: int
+):
+    """
+    Runs TEST_NAME for each [scenario:NAME] section of CONFIG_FILEPATH.
+    Scenarios with different bottlenecks are run in parallel processes.
+    TEST_ARGS are passed to perform_test.py as is, e.g.
+    -- --collect-stats --snd-quantity 2.
+    """
+    config_filepath = pathlib.Path(config_filepath)
+    results_dir = pathlib.Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    scenarios = read_scenarios(config_filepath)
+    if not scenarios:
+        raise click.UsageError(
+            f'No [{SCENARIO_SECTION_PREFIX}NAME] sections in {config_filepath}'
+        )
+    groups = group_by_bottleneck(scenarios)
+    logger.info(
+        f'Scenarios: {len(scenarios)}, independent bottlenecks: {len(groups)}'
+    )
+
+    runs = []
+    # Each scenario runs in its own process, threads only wait for them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = [
+            executor.submit(
+                run_group,
+                test_name,
+                config_filepath,
+                group,
+                results_dir,
+                list(test_args)
+            )
+            for group in groups
+        ]
+        for future in futures:
+            runs += future.result()
+
+    index = {
+        'test_name': test_name,
+        'config': str(config_filepath),
+        'scenarios': [attr.asdict(run) for run in runs],
+    }
+    with (results_dir / INDEX_FILENAME).open('w', encoding='utf-8') as fp:
+        json.dump(index, fp, indent=4)
+    logger.info(f'Results index: {results_dir / INDEX_FILENAME}')
+
+
+if __name__ == '__main__':
+    main()
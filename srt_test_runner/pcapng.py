@@ -0,0 +1,119 @@
+import pathlib
+import struct
+import typing
+
+import attr
+
+
+# Block types, see https://datatracker.ietf.org/doc/draft-ietf-opsawg-pcapng/
+SECTION_HEADER_BLOCK = 0x0A0D0D0A
+INTERFACE_DESCRIPTION_BLOCK = 0x00000001
+ENHANCED_PACKET_BLOCK = 0x00000006
+BYTE_ORDER_MAGIC = 0x1A2B3C4D
+# Interface option with timestamps resolution
+IF_TSRESOL = 9
+
+
+class InvalidPcapng(Exception):
+    pass
+
+
+@attr.s
+class Packet:
+    # Unix time (s)
+    timestamp: float = attr.ib()
+    linktype: int = attr.ib()
+    data: bytes = attr.ib()
+    # Length of the packet on the wire, `data` may be truncated
+    # to the snapshot length
+    original_length: int = attr.ib()
+
+
+def parse_tsresol(value: int):
+    """
+    Returns:
+        The number of timestamp units per second.
+    """
+    if value & 0x80:
+        return 2 ** (value & 0x7F)
+    return 10 ** value
+
+
+def parse_interface(body: bytes, endian: str):
+    """
+    Returns:
+        A tuple (linktype, timestamp units per second).
+    """
+    linktype, _, _ = struct.unpack(endian + 'HHI', body[:8])
+    units_per_second = 10 ** 6
+    offset = 8
+    while offset + 4 <= len(body):
+        code, length = struct.unpack(endian + 'HH', body[offset:offset + 4])
+        if code == 0:
+            break
+        if code == IF_TSRESOL and length >= 1:
+            units_per_second = parse_tsresol(body[offset + 4])
+        offset += 4 + (length + 3) // 4 * 4
+    return (linktype, units_per_second)
+
+
+def read_packets(filepath: pathlib.Path) -> typing.Iterator[Packet]:
+    """
+    Reads packets from a .pcapng file written by tshark. Only Enhanced
+    Packet Blocks are read, the other blocks except the ones describing
+    sections and interfaces are skipped. A truncated last block, e.g.
+    when tshark has been killed, ends the file.
+
+    Raises:
+        InvalidPcapng
+    """
+    with filepath.open('rb') as fp:
+        endian = None
+        # (linktype, timestamp units per second) by interface id within
+        # the current section
+        interfaces = []
+        while True:
+            header = fp.read(8)
+            if len(header) < 8:
+                return
+            # The block type of a section header is the same in both
+            # byte orders
+            is_section_header = struct.unpack('<I', header[:4])[0] == SECTION_HEADER_BLOCK
+            if endian is None or is_section_header:
+                if not is_section_header:
+                    raise InvalidPcapng(f'{filepath} is not a pcapng file')
+                magic = fp.read(4)
+                if len(magic) < 4:
+                    return
+                if struct.unpack('<I', magic)[0] == BYTE_ORDER_MAGIC:
+                    endian = '<'
+                elif struct.unpack('>I', magic)[0] == BYTE_ORDER_MAGIC:
+                    endian = '>'
+                else:
+                    raise InvalidPcapng(f'{filepath}: unknown byte order')
+                _, total_length = struct.unpack(endian + 'II', header)
+                fp.seek(total_length - 12, 1)
+                interfaces = []
+                continue
+
+            block_type, total_length = struct.unpack(endian + 'II', header)
+            if total_length < 12:
+                raise InvalidPcapng(f'{filepath}: block of length {total_length}')
+            body = fp.read(total_length - 8)
+            if len(body) < total_length - 8:
+                return
+            # The body is followed by the repeated total length
+            body = body[:-4]
+
+            if block_type == INTERFACE_DESCRIPTION_BLOCK:
+                interfaces.append(parse_interface(body, endian))
+            elif block_type == ENHANCED_PACKET_BLOCK:
+                interface_id, ts_high, ts_low, captured_length, original_length = \
+                    struct.unpack(endian + 'IIIII', body[:20])
+                linktype, units_per_second = interfaces[interface_id]
+                yield Packet(
+                    ((ts_high << 32) | ts_low) / units_per_second,
+                    linktype,
+                    body[20:20 + captured_length],
+                    original_length
+                )
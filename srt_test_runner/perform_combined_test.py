@@ -0,0 +1,503 @@
+import enum
+import logging
+import pathlib
+import signal
+import time
+import typing
+
+import attr
+import click
+
+from srt_test_runner import generators, perform_test, planner, scheduler, shared, stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+@enum.unique
+class CombinedTestName(shared.AutoName):
+    bw_filecc_loop_test = enum.auto()
+    iterative_bw_loop_test = enum.auto()
+    iterative_filecc_loop_test = enum.auto()
+
+COMBINED_TEST_NAMES = [name for name, member in CombinedTestName.__members__.items()]
+
+
+def get_max_sustained_bitrate(bw_loop_result: typing.List[typing.Tuple[str, int, int]]):
+    """
+    Returns:
+        A tuple (description, bitrate) of the experiment with the maximum
+        bitrate (bps) sustained by the link, i.e. streamed with extra time
+        below `perform_test.EXTRA_TIME_THRESHOLD`, or None if there is no
+        such experiment.
+    """
+    sustained = [
+        (description, bitrate)
+        for description, bitrate, extra_time in bw_loop_result
+        if extra_time < perform_test.EXTRA_TIME_THRESHOLD
+    ]
+    if not sustained:
+        return None
+    return max(sustained, key=lambda item: item[1])
+
+
+def get_measured_rtt(results_dir: pathlib.Path, description: str):
+    """
+    Returns:
+        Median RTT (ms) reported by the first sender in SRT statistics of
+        the experiment, or None if statistics have not been collected.
+    """
+    filepath = stats.sender_stats_filepath(results_dir, description)
+    if not filepath.exists():
+        return None
+    return stats.median(
+        stats.read_stats(filepath).get(stats.RTT, []),
+        skip_zeros=True
+    )
+
+
+def build_filecc_loop_test_config(
+    config_filepath: pathlib.Path,
+    bw_loop_result: typing.List[typing.Tuple[str, int, int]],
+    bw_results_dir: pathlib.Path
+):
+    """
+    Builds File CC loop test config from the results of Bandwidth Loop Test:
+    `bandwidth` is the maximum sustained bitrate, `rtt` is the median RTT
+    from SRT statistics (if collected), and flow control and buffers are
+    calculated from them.
+
+    Returns:
+        `generators.FileCCLoopTestConfig` or the config from config file
+        if no bitrate has been sustained.
+    """
+    test_config = generators.FileCCLoopTestConfig.from_config_filepath(config_filepath)
+
+    sustained = get_max_sustained_bitrate(bw_loop_result)
+    if sustained is None:
+        logger.info(
+            'No bitrate has been sustained during bandwidth loop test, '
+            'file cc loop test config is taken from config file'
+        )
+        return test_config
+
+    description, bitrate = sustained
+    rtt = get_measured_rtt(bw_results_dir, description)
+    if rtt is None:
+        logger.info(
+            f'RTT has not been measured, RTT from config file is used: '
+            f'{test_config.rtt} ms'
+        )
+        rtt = test_config.rtt
+
+    test_config = attr.evolve(
+        test_config,
+        bandwidth=bitrate // 8,
+        rtt=int(round(rtt)),
+        size_to_link=True
+    )
+    logger.info(
+        f'File cc loop test is sized to the link: bandwidth '
+        f'{test_config.bandwidth} bytes/s, rtt {test_config.rtt} ms'
+    )
+    return test_config
+
+
+def bw_filecc_loop_test(
+    config_filepath: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool,
+    run_tshark: bool,
+    results_dir: str,
+    download_results: bool=False,
+    use_cache: bool=True,
+    refresh_cache: bool=False,
+    time_budget: typing.Optional[float]=None
+):
+    """ 
+    Combined test which first runs Bandwidth Loop Test, and then after 10 seconds 
+    waiting runs File CC Loop Test. Valid settings for both of tests 
+    should be specified within config file in appropriate tests sections.
+
+    File CC Loop Test config is built from the results of Bandwidth Loop
+    Test: available bandwidth is the maximum sustained bitrate, RTT is taken
+    from SRT statistics (requires `collect_stats`), and the number of
+    messages, buffers and flow control are calculated from them. Bandwidth
+    and RTT from config file are used if they can not be measured.
+
+    If `time_budget` (s) is specified, it is shared by both of the tests:
+    File CC Loop Test gets the time left after Bandwidth Loop Test.
+    """
+    budget = planner.Budget(time_budget)
+    interval = 10
+    rcv_mode = 'remotely'
+    bw_results_dir = results_dir + '/bw_loop_test'
+
+    try:
+        logger.info('Starting bandwidth loop test')
+        bw_loop_result = perform_test.main_function(
+            perform_test.TestName.bw_loop_test.value,
+            config_filepath,
+            rcv_mode,
+            snd_quantity,
+            snd_mode,
+            collect_stats,
+            run_tshark,
+            bw_results_dir,
+            download_results,
+            use_cache=use_cache,
+            refresh_cache=refresh_cache,
+            time_budget=time_budget
+        )
+    except Exception as error:
+        logger.info(
+            f'During bandwidth loop test an exception occured ({error.__class__.__name__}): {error}. '
+            f'File CC loop test can not be done.'
+        )
+        return
+
+    test_config = build_filecc_loop_test_config(
+        pathlib.Path(config_filepath),
+        bw_loop_result,
+        pathlib.Path(bw_results_dir)
+    )
+
+    logger.info(f'Waiting for {interval} s ...')
+    time.sleep(interval)
+
+    if budget.remaining() <= 0:
+        logger.info('Time budget is over, file cc loop test is not done')
+        return
+
+    logger.info('Starting file cc loop test')
+    perform_test.main_function(
+        perform_test.TestName.filecc_loop_test.value,
+        config_filepath,
+        rcv_mode,
+        snd_quantity,
+        snd_mode,
+        collect_stats,
+        run_tshark,
+        results_dir + '/filecc_loop_test',
+        download_results,
+        test_config=test_config,
+        use_cache=use_cache,
+        refresh_cache=refresh_cache,
+        time_budget=None if time_budget is None else budget.remaining()
+    )
+
+    logger.info('Done')
+
+
+def iteration_budget(budget: planner.Budget, interval: int, iterations_left: int):
+    """
+    Returns:
+        Time budget (s) of the next iteration of an iterative test: the time
+        left shared by `iterations_left` iterations, or one period if
+        the number of iterations is unlimited. None if the test has no
+        budget.
+    """
+    if budget.deadline is None:
+        return None
+    if iterations_left > 0:
+        return budget.remaining() / iterations_left
+    return min(interval, budget.remaining())
+
+
+class StopRequested(KeyboardInterrupt):
+    """
+    Raised on SIGINT and SIGTERM during an iterative test. It is
+    a KeyboardInterrupt, so that the running experiment is stopped and
+    cleaned up the same way as on Ctrl-C.
+    """
+    pass
+
+
+def iterative_test(
+    combined_test_name,
+    config_filepath: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool,
+    run_tshark: bool,
+    iterations: int,
+    interval: int,
+    results_dir: str,
+    download_results: bool=False,
+    use_cache: bool=True,
+    refresh_cache: bool=False,
+    missed_slot_policy: str='skip',
+    align: bool=False,
+    time_budget: typing.Optional[float]=None
+):
+    """ 
+    Function which performs either iterative bandwidth loop test, or
+    iterative file CC loop test. Experiments are cached per iteration,
+    so that cached results of one iteration are never reused by another.
+
+    Iterations are started on a fixed wall-clock grid every `interval`
+    seconds, so that the period does not depend on the duration of
+    the test. If an iteration takes longer than `interval`, the slots
+    missed are handled according to `missed_slot_policy`, see
+    `scheduler.MISSED_SLOT_POLICIES`. If `iterations` is 0, the test runs
+    until SIGINT or SIGTERM is received.
+
+    If `time_budget` (s) is specified, the test stops once it is over, and
+    the time left is shared evenly by the iterations left, see
+    `iteration_budget`.
+    """
+    budget = planner.Budget(time_budget)
+    logger.info(
+            f'Starting {combined_test_name}. Iterations: {iterations or "unlimited"}, '
+            f'period: {interval} s, missed slots: {missed_slot_policy}.'
+    )
+
+    if combined_test_name == CombinedTestName.iterative_bw_loop_test.value:
+        test_name = perform_test.TestName.bw_loop_test.value
+    if combined_test_name == CombinedTestName.iterative_filecc_loop_test.value:
+        test_name = perform_test.TestName.filecc_loop_test.value
+
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(
+        interval,
+        missed_slot_policy,
+        align=align
+    )
+    # `perform_test.main_function` stops on KeyboardInterrupt and returns,
+    # the signal is remembered to stop the iterations as well
+    stop_signals = []
+
+    def request_stop(signum, frame):
+        stop_signals.append(signum)
+        raise StopRequested(f'Signal {signum} received')
+
+    previous_handlers = {
+        signum: signal.signal(signum, request_stop)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        i = 0
+        while iterations == 0 or i < iterations:
+            _, next_slot_time = fixed_rate_scheduler.next_slot()
+            if budget.remaining() <= next_slot_time - time.time():
+                logger.info('Time budget is over, no more iterations')
+                break
+            slot = fixed_rate_scheduler.wait()
+            slot_time = time.localtime(fixed_rate_scheduler.slot_time(slot))
+            logger.info(
+                f'Iteration: {i}, slot: {slot} '
+                f'({time.strftime("%Y-%m-%d %H:%M:%S", slot_time)})'
+            )
+
+            try:
+                perform_test.main_function(
+                    test_name,
+                    config_filepath,
+                    'remotely',
+                    snd_quantity,
+                    snd_mode,
+                    collect_stats,
+                    run_tshark,
+                    results_dir + f'/iteration_{i}',
+                    download_results,
+                    use_cache=use_cache,
+                    refresh_cache=refresh_cache,
+                    cache_tag=f'iteration-{i}',
+                    time_budget=iteration_budget(budget, interval, iterations - i)
+                )
+            except Exception as error:
+                logger.info(
+                    f'Exception occured ({error.__class__.__name__}): {error}. '
+                    f'Next iteration can not be done.'
+                )
+                # Links and remote machines may be down for a while,
+                # so unlimited test goes on with the next slot
+                if iterations != 0:
+                    break
+            if stop_signals:
+                logger.info(f'Stopped by signal {stop_signals[0]}')
+                break
+            i += 1
+    except KeyboardInterrupt as error:
+        logger.info(f'Stopped ({error.__class__.__name__}): {error}')
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+    logger.info('Done')
+
+
+@click.command()
+@click.argument(
+    'combined_test_name',
+    type=click.Choice(COMBINED_TEST_NAMES)
+)
+@click.argument(
+    'config_filepath', 
+    type=click.Path(exists=True)
+)
+@click.option(
+    '--snd-quantity', 
+    default=1,
+    help=   'Number of senders to start.',
+    show_default=True
+)
+@click.option(
+    '--snd-mode',
+    type=click.Choice(['serial', 'parallel', 'barrier', 'batch']), 
+    default='parallel',
+    help=   'Start senders concurrently or in parallel. In barrier mode, '
+            'senders are started in parallel and released at one moment. '
+            'Batch mode is for hundreds to thousands of senders.',
+    show_default=True
+)
+@click.option(
+    '--collect-stats', 
+    is_flag=True, 
+    help='Collect SRT statistics.'
+)
+@click.option(
+    '--run-tshark',
+    is_flag=True,
+    help='Run tshark.'
+)
+@click.option(
+    '--results-dir',
+    default='_results',
+    help='Directory to store results.',
+    show_default=True
+)
+@click.option(
+    '--download-results',
+    is_flag=True,
+    help=   'Download results (SRT statistics, etc.) from a receiver side '
+            'in background while the next experiment is running.'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help=   'Do not use the experiment cache: neither restore results '
+            'of identical experiments, nor store new ones.'
+)
+@click.option(
+    '--refresh',
+    is_flag=True,
+    help=   'Run all the experiments even if cached, and replace '
+            'the cached results.'
+)
+@click.option(
+    '--iterations',
+    default=3,
+    help=   'Number of iterations, 0 for unlimited. Applicable for iterative '
+            'tests only.',
+    show_default=True
+)
+@click.option(
+    '--interval',
+    default=30,
+    help=   'Period of iterations in seconds, iterations are started on '
+            'a fixed wall-clock grid. Applicable for iterative tests only.',
+    show_default=True
+)
+@click.option(
+    '--missed-slots',
+    type=click.Choice(scheduler.MISSED_SLOT_POLICIES),
+    default='skip',
+    help=   'What to do if an iteration takes longer than the period: '
+            'start the next one at the next slot of the grid, or start one '
+            'iteration per missed slot right away. Applicable for iterative '
+            'tests only.',
+    show_default=True
+)
+@click.option(
+    '--align',
+    is_flag=True,
+    help=   'Align the grid to multiples of the period, e.g. to :00, :10, '
+            ':20 minutes for 600 s period. Applicable for iterative tests only.'
+)
+@click.option(
+    '--daemon',
+    is_flag=True,
+    help=   'Run iterations until SIGINT or SIGTERM is received with log '
+            'written into a rotated log file. Applicable for iterative '
+            'tests only.'
+)
+@click.option(
+    '--log-file',
+    default='srt-test-runner.log',
+    help=   'Log file in daemon mode, rotated every 10 MB, 5 files are kept.',
+    show_default=True
+)
+@click.option(
+    '--time-budget',
+    type=float,
+    help=   'Wall-clock time in seconds the whole test should fit in. '
+            'Experiments which do not fit are skipped, the test stops once '
+            'the budget is over.'
+)
+def main(
+    combined_test_name: str,
+    config_filepath: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool,
+    run_tshark: bool,
+    iterations: int,
+    interval: int,
+    results_dir: str,
+    download_results: bool,
+    no_cache: bool,
+    refresh: bool,
+    missed_slots: str,
+    align: bool,
+    daemon: bool,
+    log_file: str,
+    time_budget: typing.Optional[float]
+):
+    if daemon:
+        scheduler.setup_log_rotation(log_file)
+        iterations = 0
+
+    if combined_test_name == CombinedTestName.bw_filecc_loop_test.value:
+        bw_filecc_loop_test(
+            config_filepath,
+            snd_quantity,
+            snd_mode,
+            collect_stats,
+            run_tshark,
+            results_dir,
+            download_results,
+            not no_cache,
+            refresh,
+            time_budget
+        )
+
+    if combined_test_name in (
+        CombinedTestName.iterative_bw_loop_test.value,
+        CombinedTestName.iterative_filecc_loop_test.value
+    ):
+        iterative_test(
+            combined_test_name,
+            config_filepath,
+            snd_quantity,
+            snd_mode,
+            collect_stats,
+            run_tshark,
+            iterations,
+            interval,
+            results_dir,
+            download_results,
+            not no_cache,
+            refresh,
+            missed_slots,
+            align,
+            time_budget
+        )
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,2277 @@
+import concurrent.futures
+import configparser
+import enum
+import json
+import logging
+import pathlib
+import signal
+import shutil
+import subprocess
+import sys
+import time
+import typing
+
+import attr
+import click
+
+from srt_test_runner import cache
+from srt_test_runner import generators
+from srt_test_runner import launcher
+from srt_test_runner import placement
+from srt_test_runner import planner
+from srt_test_runner import postprocessing
+from srt_test_runner import preflight
+from srt_test_runner import profiles
+from srt_test_runner import remote
+from srt_test_runner import repetition
+from srt_test_runner import retrieval
+from srt_test_runner import shared
+from srt_test_runner import stats
+
+# Modules used only by some test types or options (abtest, bidirectional,
+# connrate, dissector, fairness, latency, pcapng, sampler, soak, timeline)
+# are imported where they are used, so that `--help` and the other tests
+# do not pay for importing them
+
+
+# TODO:     Adjust time and the process of running N senders concurrently,
+#           Test the script on Windows with regard to ssh-agent,
+#           Disbale password promt (fabric),
+#           Find a way to insert carriage symbol "\r" at the end of log message,
+#           Add running tshark remotely on a receiver side via SSH,
+#           Add running sender side application remotely via SSH (?),
+#           Merge start_sender, start_receiver functions in one,
+#           Improve config parsing part,
+#           Setup.py and better code structure,
+#           Improve documentation,
+#           Disable warnings from paramiko
+
+# NOTE: The carriage "\r" is inserted in the end of log messages as
+# a workaround for the problem with intended logs. This problem 
+# appears as soon as receiver is started via SSH with a pseudo-terminal
+# (ssh -t). It seems to be that something deletes "\r" symbol.
+# https://serverfault.com/questions/593399/what-is-the-benefit-of-not-allocating-a-terminal-in-ssh
+# FIXME: In order to avoid manually inserting "\r" symbol in each log message,
+# there should be a way of formatiing logging messaging. However, quick 
+# change of basicConfig to something like
+# logging.basicConfig(
+#     level=logging.INFO,
+#     format='%(asctime)-15s [%(levelname)s] %(message)s\n\r'
+# )
+# does not work.
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+@enum.unique
+class TestName(shared.AutoName):
+    bw_loop_test = enum.auto()
+    filecc_loop_test = enum.auto()
+    bw_estimation_test = enum.auto()
+    fairness_test = enum.auto()
+    bidirectional_test = enum.auto()
+    ab_test = enum.auto()
+    soak_test = enum.auto()
+    conn_rate_test = enum.auto()
+
+TEST_NAMES = [name for name, member in TestName.__members__.items()]
+# Tests whose experiments are restored from and stored into
+# the experiment cache, the others do not hash srt-test-messaging
+# builds and do not evict the cache
+CACHED_TEST_NAMES = [
+    TestName.bw_loop_test.value,
+    TestName.filecc_loop_test.value,
+    TestName.bidirectional_test.value,
+    TestName.soak_test.value,
+]
+
+# Tests whose results are taken from SRT statistics, so statistics are
+# collected whatever the options are
+STATS_TEST_NAMES = [
+    TestName.bidirectional_test.value,
+    TestName.ab_test.value,
+    TestName.soak_test.value,
+]
+
+# Extra time (s) spent on streaming starting from which the bitrate
+# is considered to be above the available bandwidth
+EXTRA_TIME_THRESHOLD = 5
+
+
+@attr.s
+class ExperimentResult:
+    """
+    Result of one experiment. It is saved into `{description}-summary.json`
+    file in the results directory.
+    """
+    description: str = attr.ib()
+    # in bps
+    bitrate: int = attr.ib()
+    # Extra time (s) spent on SRT streaming
+    extra_time: int = attr.ib()
+    # Host resources summaries by side ('snd', 'rcv') if sampled
+    hosts: typing.Dict[str, 'sampler.HostSummary'] = attr.ib(factory=dict)
+    # 'host-bound' if any of the hosts has run out of CPU, socket buffers,
+    # etc. during the experiment, 'link-bound' otherwise, None if hosts
+    # have not been sampled
+    bound: typing.Optional[str] = attr.ib(default=None)
+    # CPU cores and scheduling settings by role, see
+    # `placement.PlacementConfig.describe`
+    placement: typing.Optional[dict] = attr.ib(default=None)
+    # Difference (s) between the latest and the earliest actual start
+    # of senders and offsets (s) of their starts from the release
+    # deadline if senders have been started at a barrier
+    start_skew: typing.Optional[float] = attr.ib(default=None)
+    start_offsets: typing.Optional[typing.List[float]] = attr.ib(default=None)
+    # Link capacity (bps) estimated by SRT if it is a bandwidth
+    # estimation experiment
+    estimated_bandwidth: typing.Optional[int] = attr.ib(default=None)
+    # True if the result has been restored from the experiment cache
+    cached: bool = attr.ib(default=False)
+    # Latency percentiles by metric ('rtt', 'snd_buffer') if collected
+    latencies: typing.Dict[str, 'latency.LatencySummary'] = attr.ib(factory=dict)
+    # Median sending rate (Mbps) and packets reported lost / packets
+    # sent by the first sender if statistics have been collected
+    send_rate: typing.Optional[float] = attr.ib(default=None)
+    snd_loss: typing.Optional[float] = attr.ib(default=None)
+    # Bitrate (bps) and median receiving rate (Mbps) of the reverse flow
+    # if it is a bidirectional experiment
+    reverse_bitrate: typing.Optional[int] = attr.ib(default=None)
+    reverse_recv_rate: typing.Optional[float] = attr.ib(default=None)
+    # SRT protocol overhead decoded from the sender capture if tshark
+    # has been run
+    protocol: typing.Optional['dissector.ProtocolSummary'] = attr.ib(default=None)
+    # Trends of process resources and sending rate if it is a soak
+    # experiment
+    soak: typing.Optional['soak.SoakReport'] = attr.ib(default=None)
+
+    def save(self, results_dir: pathlib.Path):
+        filepath = results_dir / f'{self.description}-summary.json'
+        with filepath.open('w', encoding='utf-8') as fp:
+            json.dump(attr.asdict(self), fp, indent=4)
+
+    @classmethod
+    def load(cls, results_dir: pathlib.Path, description: str):
+        from srt_test_runner import dissector, latency, sampler, soak
+        filepath = results_dir / f'{description}-summary.json'
+        with filepath.open('r', encoding='utf-8') as fp:
+            data = json.load(fp)
+        data['hosts'] = {
+            side: sampler.HostSummary(**summary)
+            for side, summary in data.get('hosts', {}).items()
+        }
+        data['latencies'] = {
+            metric: latency.LatencySummary(**summary)
+            for metric, summary in data.get('latencies', {}).items()
+        }
+        if data.get('protocol') is not None:
+            data['protocol'] = dissector.ProtocolSummary(**data['protocol'])
+        if data.get('soak') is not None:
+            data['soak'] = soak.SoakReport.from_dict(data['soak'])
+        return cls(**data)
+
+
+def read_test_config(test_name: str, config_filepath: pathlib.Path):
+    """
+    Returns:
+        Config of the test `test_name` read from its section of config
+        file, None for bandwidth estimation test whose section is read
+        as needed.
+    """
+    if test_name == TestName.bw_loop_test.value:
+        return generators.BandwidthLoopTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.filecc_loop_test.value:
+        return generators.FileCCLoopTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.fairness_test.value:
+        return generators.FairnessTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.bidirectional_test.value:
+        return generators.BidirectionalTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.ab_test.value:
+        from srt_test_runner import abtest
+        return abtest.ABTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.soak_test.value:
+        from srt_test_runner import soak
+        return soak.SoakTestConfig.from_config_filepath(config_filepath)
+    if test_name == TestName.conn_rate_test.value:
+        from srt_test_runner import connrate
+        return connrate.ConnRateTestConfig.from_config_filepath(config_filepath)
+    return None
+
+
+def get_query(attrs_values):
+    query_elements = []
+    for attr, value in attrs_values:
+        query_elements.append(f'{attr}={value}')
+    return f'{"&".join(query_elements)}'
+
+
+def get_sender_args(
+    number,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None
+):
+    """
+    Returns:
+        A list of args to start srt-test-messaging application as sender
+        `number` on a local machine.
+    """
+    args = []
+    args += [f'{path_to_srt}/srt-test-messaging']
+
+    if attrs_values is not None:
+        # FIXME: But here there is a problem with "" because sender has been
+        # started locally, not via SSH
+        args += [f'srt://{host}:{port}?{get_query(attrs_values)}']
+    else:
+        args += [f'srt://{host}:{port}']
+
+    args += ['']
+
+    if options_values is not None:
+        for option, value in options_values:
+            args += [option, value]
+
+    if collect_stats:
+        stats_file = results_dir / f'{description}-stats-snd-{number}.csv'
+        args += [
+            '-statsfreq', '1',
+            '-statsfile', stats_file,
+        ]
+
+    # Senders of traffic profiles other than constant bitrate stream
+    # the segments of the profile one after another
+    return profiles.sender_args(args)
+
+
+def start_sender(
+    number,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    process_placement: typing.Optional[placement.ProcessPlacement]=None
+):
+    name = f'srt sender {number}'
+    logger.info(f'Starting on a local machine: {name}\r')
+
+    args = get_sender_args(
+        number,
+        path_to_srt,
+        host,
+        port,
+        attrs_values,
+        options_values,
+        description,
+        collect_stats,
+        results_dir
+    )
+    snd_srt_process = shared.create_process(
+        name,
+        args,
+        placement=process_placement
+    )
+    logger.info(f'Started successfully: {name}\r')
+    return (name, snd_srt_process)
+
+
+def get_receiver_args(
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None
+):
+    """
+    Returns:
+        A list of args to start srt-test-messaging application as receiver
+        via SSH.
+    """
+    args = [f'{path_to_srt}/srt-test-messaging']
+
+    if attrs_values is not None:
+        # FIXME: There is a problem with "" here, if to run an app via SSH,
+        # it does not work without ""
+        args += [f'"srt://{host}:{port}?{get_query(attrs_values)}"']
+    else:
+        args += [f'srt://{host}:{port}']
+
+    if options_values is not None:
+        for option, value in options_values:
+            args += [option, value]
+
+    if collect_stats:
+        args += ['-statsfreq', '1']
+        stats_file = results_dir / f'{description}-stats-rcv.csv'
+        args += ['-statsfile', stats_file]
+    return args
+
+
+def start_receiver(
+    ssh_host: str, 
+    ssh_username: str, 
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    process_placement: typing.Optional[placement.ProcessPlacement]=None
+):
+    """
+    Starts srt-test-messaging application on a receiver side via SSH.
+
+    Attributes:
+        attrs_values:
+            A list of SRT options (SRT URI attributes) in a format
+            [('rcvbuf', '12058624'), ('smoother', 'live'), ('maxcon', '50')].
+        options_values:
+            A list of srt-test-messaging application options in a format
+            [('-msgsize', '1456'), ('-reply', '0'), ('-printmsg', '0')].
+        process_placement:
+            CPU cores and scheduling settings applied on a remote machine
+            via taskset, nice and chrt.
+    """
+    name = 'srt receiver'
+    logger.info(f'Starting {name} on a remote machine: {ssh_host}')
+    args = []
+    if process_placement is not None:
+        args += process_placement.command_prefix()
+    args += get_receiver_args(
+        path_to_srt,
+        host,
+        port,
+        attrs_values,
+        options_values,
+        description,
+        collect_stats,
+        results_dir
+    )
+    process_tuple = remote.start_process(name, ssh_username, ssh_host, args)
+    logger.info('Started successfully\r')
+    return process_tuple
+
+
+def start_reverse_flow(
+    global_config,
+    reverse_params: generators.ExperimentParams,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    snd_placement: typing.Optional[placement.ProcessPlacement]=None,
+    rcv_placement: typing.Optional[placement.ProcessPlacement]=None
+):
+    """
+    Starts the reverse flow of a bidirectional experiment: a sender on
+    a receiver side via SSH listening on `dst_port + REVERSE_PORT_OFFSET`,
+    and a receiver on a sender side calling it.
+
+    Returns:
+        A list of (name, process) tuples.
+    """
+    port = int(global_config.dst_port) + generators.REVERSE_PORT_OFFSET
+    description = reverse_params.description
+
+    snd_name = 'srt reverse sender'
+    logger.info(f'Starting {snd_name} on a remote machine: {global_config.rcv_ssh_host}')
+    args = []
+    if snd_placement is not None:
+        args += snd_placement.command_prefix()
+    args += [f'{global_config.rcv_path_to_srt}/srt-test-messaging']
+    args += [f'"srt://:{port}?{get_query(reverse_params.snd_attrs_values)}"']
+    args += ['""']
+    for option, value in reverse_params.snd_options_values:
+        args += [option, value]
+    if collect_stats:
+        args += [
+            '-statsfreq', '1',
+            '-statsfile', stats.sender_stats_filepath(results_dir, description),
+        ]
+    _, snd_process = remote.start_process(
+        snd_name,
+        global_config.rcv_ssh_username,
+        global_config.rcv_ssh_host,
+        args
+    )
+    logger.info('Started successfully\r')
+
+    rcv_name = 'srt reverse receiver'
+    logger.info(f'Starting on a local machine: {rcv_name}\r')
+    args = [f'{global_config.snd_path_to_srt}/srt-test-messaging']
+    args += [f'srt://{global_config.dst_host}:{port}?{get_query(reverse_params.rcv_attrs_values)}']
+    for option, value in reverse_params.rcv_options_values:
+        args += [option, value]
+    if collect_stats:
+        args += [
+            '-statsfreq', '1',
+            '-statsfile', stats.receiver_stats_filepath(results_dir, description),
+        ]
+    rcv_process = shared.create_process(rcv_name, args, placement=rcv_placement)
+    logger.info(f'Started successfully: {rcv_name}\r')
+    return [(snd_name, snd_process), (rcv_name, rcv_process)]
+
+
+def start_several_senders(
+    quantity: int,
+    mode: str,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Starts `quantity` SRT senders on a local machine either one after
+    another (`mode`='serial'), or in parallel (`mode`='parallel').
+    If `placement_config` is specified, sender i is pinned to its own
+    CPU cores, see `placement.PlacementConfig.sender`.
+    """
+    
+    # FIXME: Transfer bitrate and repeat
+    # logger.info(
+    #     f'Starting streaming with bitrate {bitrate}, repeat {repeat}, '
+    #     f'senders {snd_number}'
+    # )
+    logger.info(
+        f'Starting streaming: {description}, '
+        f'senders {quantity}\r'
+    )
+
+    sender_processes = []
+
+    if quantity == 1 or mode == 'serial':
+        for i in range(0, quantity):
+            snd_srt_process = start_sender(
+                i,
+                path_to_srt,
+                host,
+                port,
+                attrs_values,
+                options_values,
+                description,
+                collect_stats,
+                results_dir,
+                placement_config.sender(i) if placement_config else None
+            )
+            sender_processes.append(snd_srt_process)
+
+    if quantity != 1 and mode == 'parallel':
+        if sys.platform != 'win32':
+            # Each sender holds stdout and stderr pipes in the script
+            launcher.ensure_limit(
+                'RLIMIT_NOFILE',
+                launcher.RESERVED_FDS + 2 * quantity
+            )
+        with concurrent.futures.ThreadPoolExecutor(max_workers=quantity) as executor:
+            # TODO: Change to list (?)
+            future_senders = {
+                executor.submit(
+                    start_sender, 
+                    i,
+                    path_to_srt,
+                    host,
+                    port,
+                    attrs_values,
+                    options_values,
+                    description,
+                    collect_stats,
+                    results_dir,
+                    placement_config.sender(i) if placement_config else None
+                ): i for i in range(0, quantity)
+            }
+
+            errors = 0
+            for future in concurrent.futures.as_completed(future_senders):
+                try:
+                    process = future.result()
+                except Exception as exc:
+                    logger.info(
+                        f'{future_senders[future]} sender generated an '
+                        f'exception: {exc}'
+                    )
+                    errors += 1
+                else:
+                    sender_processes.append(process)
+
+            if errors > 0:
+                raise shared.ParallelSendersExecutionFailed()
+
+    return sender_processes
+
+
+def start_senders_in_batches(
+    quantity: int,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Starts `quantity` SRT senders on a local machine in batches of
+    `launcher.SPAWN_BATCH_SIZE` senders. Unlike `start_several_senders`,
+    no thread and no pipes are used per sender: stdout and stderr of sender
+    i are written into `{description}-snd-{i}.log` file, and senders are
+    tracked in `launcher.ProcessTable`. This allows to start hundreds to
+    thousands of senders.
+
+    Returns:
+        `launcher.ProcessTable` of senders.
+
+    Raises:
+        launcher.ResourceLimitTooLow,
+        shared.ProcessHasNotBeenCreated,
+        shared.ParallelSendersExecutionFailed
+    """
+    logger.info(
+        f'Starting streaming in batches: {description}, '
+        f'senders {quantity}\r'
+    )
+
+    launcher.ensure_limit('RLIMIT_NOFILE', launcher.RESERVED_FDS)
+    launcher.ensure_limit(
+        'RLIMIT_NPROC',
+        launcher.RESERVED_PROCESSES + quantity
+    )
+
+    def on_spawned(i, pid):
+        if placement_config is not None:
+            placement_config.sender(i).apply(pid)
+
+    table = launcher.ProcessTable('srt senders')
+    try:
+        launcher.spawn_in_batches(
+            table,
+            (
+                (
+                    get_sender_args(
+                        i,
+                        path_to_srt,
+                        host,
+                        port,
+                        attrs_values,
+                        options_values,
+                        description,
+                        collect_stats,
+                        results_dir
+                    ),
+                    results_dir / f'{description}-snd-{i}.log'
+                )
+                for i in range(0, quantity)
+            ),
+            on_spawned=on_spawned
+        )
+
+        # Check that the senders have started successfully and have not
+        # terminated because of an error
+        time.sleep(1)
+        table.poll()
+        failed = table.failed()
+        if failed:
+            raise shared.ParallelSendersExecutionFailed(
+                f'{len(failed)} senders have not been started successfully, '
+                f'e.g. sender {failed[0]}, returncode '
+                f'{table.returncodes[failed[0]]}, see '
+                f'{description}-snd-{failed[0]}.log'
+            )
+    except BaseException:
+        table.cleanup()
+        raise
+
+    logger.info(f'Started successfully: {len(table)} senders\r')
+    return table
+
+
+def start_senders_churning(
+    quantity: int,
+    concurrency: int,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    results_dir: pathlib.Path=None,
+    timeout: typing.Optional[float]=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Starts `quantity` short-lived SRT senders on a local machine the same
+    way as `start_senders_in_batches`, but keeping `concurrency` of them
+    running at a time: the next sender is started as soon as one has
+    finished. Senders running for longer than `timeout` seconds are
+    killed. Returns once all the senders have finished. Logs of the
+    senders finished successfully are removed, the others are kept
+    as `{description}-snd-{i}.log` files.
+
+    Returns:
+        `launcher.ProcessTable` of senders.
+
+    Raises:
+        launcher.ResourceLimitTooLow,
+        shared.ProcessHasNotBeenCreated
+    """
+    logger.info(
+        f'Starting connections: {description}, {quantity} connections, '
+        f'concurrency {concurrency}\r'
+    )
+
+    launcher.ensure_limit('RLIMIT_NOFILE', launcher.RESERVED_FDS)
+    launcher.ensure_limit(
+        'RLIMIT_NPROC',
+        launcher.RESERVED_PROCESSES + concurrency
+    )
+
+    def on_spawned(i, pid):
+        if placement_config is not None:
+            placement_config.sender(i % concurrency).apply(pid)
+
+    table = launcher.ProcessTable('srt senders')
+    try:
+        launcher.spawn_with_concurrency(
+            table,
+            (
+                (
+                    get_sender_args(
+                        i,
+                        path_to_srt,
+                        host,
+                        port,
+                        attrs_values,
+                        options_values,
+                        description,
+                        False,
+                        results_dir
+                    ),
+                    results_dir / f'{description}-snd-{i}.log'
+                )
+                for i in range(0, quantity)
+            ),
+            concurrency,
+            timeout,
+            on_spawned
+        )
+    except BaseException:
+        table.cleanup()
+        raise
+
+    for i, returncode in enumerate(table.returncodes):
+        if returncode == 0:
+            (results_dir / f'{description}-snd-{i}.log').unlink()
+    logger.info(
+        f'Finished: {len(table)} connections, {len(table.failed())} '
+        f'failed\r'
+    )
+    return table
+
+
+@attr.s
+class BarrierStartReport:
+    """
+    Actual start times of senders started at a barrier.
+    """
+    # Release deadline (time.monotonic())
+    deadline: float = attr.ib()
+    # Offsets (s) of actual start times of senders from the deadline
+    start_offsets: typing.List[float] = attr.ib()
+
+    @property
+    def skew(self):
+        """ Difference (s) between the latest and the earliest start. """
+        return max(self.start_offsets) - min(self.start_offsets)
+
+
+def start_senders_at_barrier(
+    quantity: int,
+    path_to_srt: str,
+    host: str,
+    port: str,
+    attrs_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    options_values: typing.Optional[typing.List[typing.Tuple[str, str]]]=None,
+    description: str=None,
+    collect_stats: bool=False,
+    results_dir: pathlib.Path=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Pre-spawns `quantity` SRT senders on a local machine, holds them
+    at a barrier and releases all of them at one monotonic deadline,
+    so that the senders stream over a common time window.
+
+    Returns:
+        A tuple of (sender_processes, `BarrierStartReport`).
+
+    Raises:
+        shared.ProcessHasNotBeenCreated,
+        shared.ProcessHasNotBeenStartedSuccessfully,
+        shared.ParallelSendersExecutionFailed
+    """
+    logger.info(
+        f'Starting streaming at a barrier: {description}, '
+        f'senders {quantity}\r'
+    )
+
+    barrier = shared.ProcessBarrier()
+    try:
+        for i in range(0, quantity):
+            args = get_sender_args(
+                i,
+                path_to_srt,
+                host,
+                port,
+                attrs_values,
+                options_values,
+                description,
+                collect_stats,
+                results_dir
+            )
+            barrier.spawn(
+                f'srt sender {i}',
+                args,
+                placement_config.sender(i) if placement_config else None
+            )
+
+        try:
+            start_times = barrier.release()
+        except shared.ProcessesHaveNotReachedBarrier as error:
+            raise shared.ParallelSendersExecutionFailed(
+                f'Sender has not reached a barrier: {error}'
+            )
+        report = BarrierStartReport(
+            barrier.deadline,
+            [start_time - barrier.deadline for start_time in start_times]
+        )
+        logger.info(
+            f'Senders released, start skew {report.skew * 1000:.3f} ms, '
+            f'max delay from deadline {max(report.start_offsets) * 1000:.3f} ms\r'
+        )
+
+        # Check that the senders have started successfully and have not
+        # terminated because of an error
+        time.sleep(1)
+        for name, process in barrier.processes:
+            is_running, returncode = shared.process_is_running(process)
+            if not is_running:
+                raise shared.ProcessHasNotBeenStartedSuccessfully(
+                    f'{name}, returncode {returncode}, '
+                    f'stderr: {process.stderr.readlines()}'
+                )
+    except BaseException:
+        # Senders held at the barrier would wait forever otherwise
+        for process_tuple in barrier.processes:
+            shared.cleanup_process(process_tuple)
+        raise
+
+    return (barrier.processes, report)
+
+
+def reap_remote_processes(orphans: bool=False):
+    """
+    Kills srt-test-messaging applications left running on remote machines
+    after SSH sessions have been terminated: started by this script or,
+    if `orphans`, by the scripts which are not running anymore.
+    """
+    processes = remote.REGISTRY.orphans() if orphans else remote.REGISTRY.owned()
+    if not processes:
+        return
+    try:
+        remote.reap(processes)
+    except OSError as error:
+        logger.info(
+            f'Remote processes have not been reaped. Exception occured '
+            f'({error.__class__.__name__}): {error}'
+        )
+
+
+def perform_experiment(
+    global_config,
+    exper_params: generators.ExperimentParams,
+    rcv: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool=False,
+    run_tshark: bool=False,
+    results_dir: pathlib.Path=None,
+    sample_interval: typing.Optional[float]=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None,
+    collect_latency: bool=False,
+    probe_clock: bool=False,
+    soak_config: typing.Optional['soak.SoakTestConfig']=None
+):
+    """
+    Performs one experiment.
+
+    Attributes:
+        sample_interval:
+            Interval (s) of sampling host resources on a sender side and,
+            if the receiver is started remotely, on a receiver side.
+            Host resources are not sampled if None.
+        placement_config:
+            CPU cores and scheduling settings for senders, tshark and
+            a receiver. Default scheduling is used if None.
+        collect_latency:
+            Follow SRT statistics of the senders while streaming and
+            collect RTT and sender buffer delay histograms into
+            `{description}-latency.hist`. Implies `collect_stats`.
+        probe_clock:
+            Measure the clock offset of a receiver side at the start and
+            the end of the experiment into `{description}-clock.json`,
+            see `timeline.merge`. Applicable for remotely started
+            receiver only.
+        soak_config:
+            If specified, RSS, file descriptors and CPU of the senders and
+            the receiver and SRT statistics of the senders are sampled
+            while streaming into `{description}-soak.bin` and their
+            trends are reported, see `soak.SoakMonitor`. Implies
+            `collect_stats`.
+
+    Returns:
+        `ExperimentResult` including extra time in seconds spent on
+        SRT streaming.
+
+    Raises:
+        KeyboardInterrupt,
+        shared.ProcessHasNotBeenStartedSuccessfully, 
+        shared.ProcessHasNotBeenCreated,
+        shared.ProcessHasNotBeenKilled
+    """
+    processes = []
+    sender_table = None
+    host_samplers = {}
+    latency_collector = None
+    soak_monitor = None
+    if collect_latency or soak_config is not None:
+        collect_stats = True
+    if placement_config is not None:
+        # Placement recorded into the result is the one applied during
+        # this experiment
+        placement_config = placement_config.for_experiment()
+    clock_sync = None
+    if probe_clock and rcv == 'remotely':
+        from srt_test_runner import timeline
+        clock_sync = timeline.ClockSync(
+            timeline.probe_clock_offset(
+                global_config.rcv_ssh_username,
+                global_config.rcv_ssh_host
+            ),
+            None
+        )
+    try:
+        # Start SRT on a receiver side
+        if rcv == 'remotely':
+            rcv_srt_process = start_receiver(
+                global_config.rcv_ssh_host, 
+                global_config.rcv_ssh_username, 
+                global_config.rcv_path_to_srt, 
+                '',
+                global_config.dst_port,
+                exper_params.rcv_attrs_values,
+                exper_params.rcv_options_values,
+                exper_params.description,
+                collect_stats,
+                results_dir,
+                placement_config.receiver() if placement_config else None
+            )
+            processes.append(rcv_srt_process)
+
+        # Start tshark on a sender side
+        if run_tshark:
+            filename = f'{exper_params.description}-snd.pcapng'
+            snd_tshark_process = shared.start_tshark(
+                global_config.snd_tshark_iface, 
+                global_config.dst_port,
+                results_dir,
+                filename,
+                placement=placement_config.tshark() if placement_config else None
+            )
+            processes.append(snd_tshark_process)
+            time.sleep(3)
+
+        # Start the reverse flow of a bidirectional experiment, so that
+        # it is already streaming when forward senders start
+        if exper_params.reverse is not None and rcv == 'remotely':
+            processes += start_reverse_flow(
+                global_config,
+                exper_params.reverse,
+                collect_stats,
+                results_dir,
+                placement_config.receiver() if placement_config else None,
+                placement_config.sender(snd_quantity) if placement_config else None
+            )
+            time.sleep(1)
+
+        # Start sampling host resources while streaming
+        if sample_interval is not None:
+            from srt_test_runner import sampler
+            host_samplers['snd'] = sampler.HostSampler(
+                results_dir / f'{exper_params.description}-host-snd.bin',
+                sample_interval
+            )
+            if rcv == 'remotely':
+                host_samplers['rcv'] = sampler.HostSampler(
+                    results_dir / f'{exper_params.description}-host-rcv.bin',
+                    sample_interval,
+                    global_config.rcv_ssh_username,
+                    global_config.rcv_ssh_host
+                )
+            for host_sampler in host_samplers.values():
+                host_sampler.start()
+
+        # Start several SRT senders on a sender side to stream for
+        # config.time_to_stream seconds
+        barrier_report = None
+        sender_table = None
+        if snd_mode == 'batch':
+            sender_table = start_senders_in_batches(
+                snd_quantity,
+                global_config.snd_path_to_srt,
+                global_config.dst_host,
+                global_config.dst_port,
+                exper_params.snd_attrs_values,
+                exper_params.snd_options_values,
+                exper_params.description,
+                collect_stats,
+                results_dir,
+                placement_config
+            )
+            sender_processes = []
+        elif snd_mode == 'barrier':
+            sender_processes, barrier_report = start_senders_at_barrier(
+                snd_quantity,
+                global_config.snd_path_to_srt,
+                global_config.dst_host,
+                global_config.dst_port,
+                exper_params.snd_attrs_values,
+                exper_params.snd_options_values,
+                exper_params.description,
+                collect_stats,
+                results_dir,
+                placement_config
+            )
+        else:
+            sender_processes = start_several_senders(
+                snd_quantity,
+                snd_mode,
+                global_config.snd_path_to_srt,
+                global_config.dst_host,
+                global_config.dst_port,
+                exper_params.snd_attrs_values,
+                exper_params.snd_options_values,
+                exper_params.description,
+                collect_stats,
+                results_dir,
+                placement_config
+            )
+        for p in sender_processes:
+            processes.append(p)
+
+        if collect_latency:
+            from srt_test_runner import latency
+            latency_collector = latency.LatencyCollector([
+                stats.sender_stats_filepath(results_dir, exper_params.description, i)
+                for i in range(snd_quantity)
+            ])
+            latency_collector.start()
+
+        if soak_config is not None:
+            from srt_test_runner import soak
+            if sender_table is not None:
+                sender_pids = list(sender_table.pids)
+            else:
+                sender_pids = [process.pid for _, process in sender_processes]
+            sources = [
+                soak.ProcessSource(f'snd{i}', pid, soak_config.sample_interval)
+                for i, pid in enumerate(sender_pids)
+            ]
+            receivers = [
+                process for process in remote.REGISTRY.owned()
+                if process.name == 'srt receiver'
+            ]
+            if rcv == 'remotely' and receivers:
+                receiver = max(receivers, key=lambda process: process.started)
+                sources.append(soak.ProcessSource(
+                    'rcv',
+                    receiver.pid,
+                    soak_config.sample_interval,
+                    receiver.ssh_username,
+                    receiver.ssh_host
+                ))
+            soak_monitor = soak.SoakMonitor(
+                soak_config,
+                results_dir / f'{exper_params.description}-soak.bin',
+                sources,
+                [
+                    stats.sender_stats_filepath(results_dir, exper_params.description, i)
+                    for i in range(snd_quantity)
+                ]
+            )
+            soak_monitor.start()
+
+        # Sleep for config.time_to_stream seconds to wait while senders 
+        # will finish the streaming and then check how many senders are 
+        # still running.
+        # FIXME: Time adjustment is needed for snd_mode='serial'
+        if barrier_report is not None:
+            # Senders have started streaming at the release deadline
+            time.sleep(max(
+                0,
+                barrier_report.deadline + exper_params.time_to_stream - time.monotonic()
+            ))
+        else:
+            time.sleep(exper_params.time_to_stream)
+        if sender_table is not None:
+            extra_time = sender_table.calculate_extra_time(
+                exper_params.max_extra_time
+            )
+        else:
+            extra_time = shared.calculate_extra_time(
+                sender_processes,
+                exper_params.max_extra_time
+            )
+
+        if clock_sync is not None:
+            clock_sync.end = timeline.probe_clock_offset(
+                global_config.rcv_ssh_username,
+                global_config.rcv_ssh_host
+            )
+            clock_sync.save(timeline.clock_filepath(results_dir, exper_params.description))
+
+        result = ExperimentResult(
+            exper_params.description,
+            exper_params.bitrate,
+            extra_time
+        )
+        if collect_stats:
+            filepath = stats.sender_stats_filepath(results_dir, exper_params.description)
+            if filepath.exists():
+                result.send_rate = stats.median(
+                    stats.read_stats(filepath).get(stats.SEND_RATE, []),
+                    skip_zeros=True
+                )
+                result.snd_loss = profiles.loss_ratio(filepath)
+        if exper_params.reverse is not None and rcv == 'remotely':
+            result.reverse_bitrate = exper_params.reverse.bitrate
+            filepath = stats.receiver_stats_filepath(
+                results_dir,
+                exper_params.reverse.description
+            )
+            if filepath.exists():
+                result.reverse_recv_rate = stats.median(
+                    stats.read_stats(filepath).get(stats.RECV_RATE, []),
+                    skip_zeros=True
+                )
+        if latency_collector is not None:
+            result.latencies = latency_collector.stop(
+                results_dir / f'{exper_params.description}-latency.hist'
+            )
+            for metric, summary in result.latencies.items():
+                low_count = ''
+                if summary.low_count:
+                    low_count = (
+                        ', too few values for '
+                        + ', '.join(f'p{p:g}' for p in summary.low_count)
+                    )
+                logger.info(
+                    f'Latency {metric} (ms): p50 {summary.p50}, p99 '
+                    f'{summary.p99}, p99.9 {summary.p99_9}, max '
+                    f'{summary.max}, {summary.count} values{low_count}\r'
+                )
+        if soak_monitor is not None:
+            result.soak = soak_monitor.stop()
+            for name in result.soak.flags:
+                trend = result.soak.trends[name]
+                logger.info(
+                    f'Soak: {name} changes by {trend.change:+.2f}% per hour '
+                    f'({trend.start:.1f} -> {trend.end:.1f})\r'
+                )
+            if not result.soak.flags:
+                logger.info(
+                    f'Soak: no growth or decay beyond the thresholds, '
+                    f'{result.soak.samples} samples\r'
+                )
+        if barrier_report is not None:
+            result.start_skew = barrier_report.skew
+            result.start_offsets = barrier_report.start_offsets
+        if placement_config is not None:
+            result.placement = placement_config.describe(snd_quantity)
+        if host_samplers:
+            for side, host_sampler in host_samplers.items():
+                result.hosts[side] = host_sampler.stop()
+            host_bound = any(
+                summary.is_host_bound() for summary in result.hosts.values()
+            )
+            result.bound = 'host-bound' if host_bound else 'link-bound'
+            logger.info(f'Experiment is {result.bound}: {result.hosts}\r')
+        
+        logger.info('Done\r')
+        # time.sleep(3)
+        return result
+
+        # if run_tshark:
+        #     shared.cleanup_process(snd_tshark_process)
+        #     time.sleep(3)
+        # if rcv == 'remotely':
+        #     shared.cleanup_process(rcv_srt_process)
+        #     time.sleep(3)
+    except KeyboardInterrupt:
+        logger.info('KeyboardInterrupt has been caught')
+        raise
+    except (
+        shared.ProcessHasNotBeenStartedSuccessfully, 
+        shared.ProcessHasNotBeenCreated
+    ) as error:
+        logger.info(
+            f'Exception occured ({error.__class__.__name__}): {error}'
+        )
+        raise
+    finally:
+        logger.info('Cleaning up\r')
+        for host_sampler in host_samplers.values():
+            host_sampler.stop()
+        if soak_monitor is not None:
+            soak_monitor.stop()
+        if latency_collector is not None:
+            latency_collector.stop()
+        if sender_table is not None:
+            try:
+                sender_table.cleanup()
+            except shared.ProcessHasNotBeenKilled as error:
+                logger.info(
+                    f'During cleaning up an exception occured '
+                    f'({error.__class__.__name__}): {error}. The next '
+                    f'experiment can not be done further!'
+                )
+                raise
+        for process_tuple in reversed(processes):
+            try:
+                shared.cleanup_process(process_tuple)
+            except shared.ProcessHasNotBeenKilled as error:
+                # TODO: Collect the information regarding non killed processes
+                # and perfom additional clean-up actions
+                logger.info(
+                    f'During cleaning up an exception occured '
+                    f'({error.__class__.__name__}): {error}. The next '
+                    f'experiment can not be done further!'
+                )
+                raise
+        reap_remote_processes()
+        logger.info('Done')
+
+
+def get_estimated_bandwidth(results_dir: pathlib.Path, description: str):
+    """
+    Returns:
+        Link capacity (bps) estimated by SRT during the experiment
+        `description` as the median of non-zero `mbpsBandwidth` values
+        from sender statistics, or None if there are no such values.
+    """
+    filepath = stats.sender_stats_filepath(results_dir, description)
+    if not filepath.exists():
+        return None
+    capacity = stats.median(
+        stats.read_stats(filepath).get(stats.BANDWIDTH, []),
+        skip_zeros=True
+    )
+    if capacity is None:
+        return None
+    return int(capacity * shared.DELIMETER)
+
+
+def estimate_bandwidth(
+    global_config,
+    estimation_config: generators.BandwidthEstimationConfig,
+    rcv: str,
+    results_dir: pathlib.Path=None,
+    placement_config: typing.Optional[placement.PlacementConfig]=None
+):
+    """
+    Performs one bandwidth estimation experiment, see
+    `generators.bw_estimation_generator`, with one sender and SRT
+    statistics collected.
+
+    Returns:
+        `ExperimentResult` with `estimated_bandwidth` set (None if
+        the capacity has not been estimated).
+
+    Raises:
+        The same as `perform_experiment`.
+    """
+    exper_params = next(
+        generators.bw_estimation_generator(global_config, estimation_config)
+    )
+    exper_result = perform_experiment(
+        global_config,
+        exper_params,
+        rcv,
+        1,
+        'serial',
+        collect_stats=True,
+        results_dir=results_dir,
+        placement_config=placement_config
+    )
+    exper_result.estimated_bandwidth = get_estimated_bandwidth(
+        results_dir,
+        exper_params.description
+    )
+    logger.info(
+        f'Estimated bandwidth: {exper_result.estimated_bandwidth} bps\r'
+    )
+    return exper_result
+
+
+def dissect_capture(results_dir: pathlib.Path, description: str, port: int):
+    """
+    Decodes SRT headers of the sender capture of an experiment, see
+    `dissector.dissect`.
+
+    Returns:
+        `dissector.ProtocolSummary` or None if it has not been decoded.
+    """
+    from srt_test_runner import dissector, pcapng
+    try:
+        summary = dissector.dissect(results_dir, description, port)
+    except (OSError, pcapng.InvalidPcapng) as error:
+        logger.info(
+            f'Capture has not been decoded. Exception occured '
+            f'({error.__class__.__name__}): {error}'
+        )
+        return None
+    if summary is not None:
+        logger.info(
+            f'Retransmission ratio {summary.retransmission_ratio}, ACK '
+            f'{summary.ack_rate:.1f}/s, ACKACK {summary.ackack_rate:.1f}/s, '
+            f'NAK {summary.nak_rate:.1f}/s, control overhead '
+            f'{summary.control_overhead}, loss bursts {summary.loss_bursts} '
+            f'(mean {summary.mean_loss_burst}, max {summary.max_loss_burst})\r'
+        )
+    return summary
+
+
+def save_protocol(
+    exper_result: ExperimentResult,
+    summary: typing.Optional['dissector.ProtocolSummary'],
+    results_dir: pathlib.Path
+):
+    """ Records the decoded capture into the experiment summary. """
+    exper_result.protocol = summary
+    exper_result.save(results_dir)
+
+
+def merge_timeline(results_dir: pathlib.Path, description: str):
+    """ Merges the timeline of an experiment, see `timeline.merge`. """
+    from srt_test_runner import timeline
+    return timeline.merge(results_dir, description)
+
+
+def log_timeline(filepath: typing.Optional[pathlib.Path]):
+    if filepath is not None:
+        logger.info(f'Timeline merged: {filepath.name}')
+
+
+def create_remote_results_dir(global_config, results_dir: pathlib.Path):
+    """
+    Creates an empty folder for storing results on a receiver side via
+    SSH. fabric and paramiko take hundreds of milliseconds to import,
+    so they are imported here rather than at startup, and not at all if
+    a receiver is started manually.
+
+    Returns:
+        True if created.
+
+    Raises:
+        paramiko.ssh_exception.SSHException,
+        TimeoutError
+    """
+    import fabric
+    import paramiko
+
+    logger.info('Creating a folder for storing results on a receiver side')
+    try:
+        # FIXME: By default Paramiko will attempt to connect to a running 
+        # SSH agent (Unix style, e.g. a live SSH_AUTH_SOCK, or Pageant if 
+        # one is on Windows). That's why promt for login-password is not 
+        # disabled under condition that password is not configured via 
+        # connect_kwargs.password
+        with fabric.Connection(host=global_config.rcv_ssh_host, user=global_config.rcv_ssh_username) as c:
+            result = c.run(f'rm -rf {results_dir}')
+            if result.exited != 0:
+                logger.info(f'Not created: {result}')
+                return False
+            result = c.run(f'mkdir -p {results_dir}')
+            if result.exited != 0:
+                logger.info(f'Not created: {result}')
+                return False
+    except paramiko.ssh_exception.SSHException as error:
+        logger.info(
+            f'Exception occured ({error.__class__.__name__}): {error}. '
+            'Check that the ssh-agent has been started.'
+        )
+        raise
+    except TimeoutError as error:
+        logger.info(
+            f'Exception occured ({error.__class__.__name__}): {error}. '
+            'Check that IP address of the remote machine is correct and the '
+            'machine is not down.'
+        )
+        raise
+    logger.info('Created successfully')
+    return True
+
+
+def get_srt_binaries_hashes(global_config, rcv: str):
+    """
+    Returns:
+        A dictionary {side: sha256 hash} of srt-test-messaging applications
+        on a sender side and, if the receiver is started remotely,
+        on a receiver side. A hash is None if it has not been calculated.
+    """
+    hashes = {
+        'snd': cache.file_hash(
+            pathlib.Path(global_config.snd_path_to_srt).expanduser() / 'srt-test-messaging'
+        ),
+        'rcv': None,
+    }
+    if rcv == 'remotely':
+        hashes['rcv'] = cache.remote_file_hash(
+            global_config.rcv_ssh_username,
+            global_config.rcv_ssh_host,
+            f'{global_config.rcv_path_to_srt}/srt-test-messaging'
+        )
+    return hashes
+
+
+def get_cache_material(
+    global_config,
+    exper_params: generators.ExperimentParams,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool,
+    run_tshark: bool,
+    binaries_hashes: typing.Dict[str, typing.Optional[str]],
+    cache_tag: typing.Optional[str]=None,
+    collect_latency: bool=False,
+    build_timeline: bool=False
+):
+    """
+    Returns:
+        A dictionary which identifies an experiment in the experiment
+        cache: sender and receiver args, srt-test-messaging hashes,
+        scenario, etc. Results directory is not taken into account.
+    """
+    results_dir = pathlib.Path('.')
+    snd_args = get_sender_args(
+        0,
+        '.',
+        global_config.dst_host,
+        global_config.dst_port,
+        exper_params.snd_attrs_values,
+        exper_params.snd_options_values,
+        exper_params.description,
+        collect_stats,
+        results_dir
+    )
+    rcv_args = get_receiver_args(
+        '.',
+        '',
+        global_config.dst_port,
+        exper_params.rcv_attrs_values,
+        exper_params.rcv_options_values,
+        exper_params.description,
+        collect_stats,
+        results_dir
+    )
+    return {
+        'description': exper_params.description,
+        'scenario': global_config.scenario,
+        'algdescr': global_config.algdescr,
+        'snd_args': [str(arg) for arg in snd_args],
+        'rcv_args': [str(arg) for arg in rcv_args],
+        'binaries': binaries_hashes,
+        'snd_quantity': snd_quantity,
+        'snd_mode': snd_mode,
+        'run_tshark': run_tshark,
+        'time_to_stream': exper_params.time_to_stream,
+        'max_extra_time': exper_params.max_extra_time,
+        'reverse': attr.asdict(exper_params.reverse) if exper_params.reverse else None,
+        'tag': cache_tag,
+        'latency': collect_latency,
+        'timeline': build_timeline,
+    }
+
+
+@attr.s
+class TestContext:
+    """
+    Settings and background services shared by the experiments of one
+    test, see `main_function`.
+    """
+    global_config = attr.ib()
+    config_filepath: pathlib.Path = attr.ib()
+    rcv: str = attr.ib()
+    snd_quantity: int = attr.ib()
+    snd_mode: str = attr.ib()
+    collect_stats: bool = attr.ib()
+    run_tshark: bool = attr.ib()
+    results_dir: pathlib.Path = attr.ib()
+    sample_interval: typing.Optional[float] = attr.ib()
+    placement_config: typing.Optional[placement.PlacementConfig] = attr.ib()
+    collect_latency: bool = attr.ib()
+    build_timeline: bool = attr.ib()
+    budget: planner.Budget = attr.ib()
+    postprocessor: postprocessing.PostProcessor = attr.ib()
+    # None if results are not downloaded from a receiver side
+    retriever: typing.Optional[retrieval.ArtefactsRetriever] = attr.ib(default=None)
+    # Receivers listen on `ports_quantity` consecutive ports, the block
+    # is moved from one experiment to another if ports are rotated
+    port_rotation: typing.Optional[remote.PortRotation] = attr.ib(default=None)
+    ports_quantity: int = attr.ib(default=1)
+    # None if the experiment cache is not used, see `CACHED_TEST_NAMES`
+    experiment_cache: typing.Optional[cache.ExperimentCache] = attr.ib(default=None)
+    binaries_hashes: typing.Optional[typing.Dict[str, typing.Optional[str]]] = attr.ib(default=None)
+    refresh_cache: bool = attr.ib(default=False)
+    cache_tag: typing.Optional[str] = attr.ib(default=None)
+    # (key, cache material, description) of the experiments to be stored
+    # into the cache once their artefacts have been downloaded
+    to_cache: typing.List[tuple] = attr.ib(factory=list)
+    # Experiments performed to be merged into timelines once their
+    # artefacts have been downloaded
+    timeline_descriptions: typing.List[str] = attr.ib(factory=list)
+
+    def rotate_port(self, global_config=None):
+        """
+        Returns:
+            Global config (the one of the test if None) with `dst_port` set
+            to the next block of ports of the rotation, as is if ports are
+            not rotated.
+        """
+        if global_config is None:
+            global_config = self.global_config
+        if self.port_rotation is None:
+            return global_config
+        return attr.evolve(
+            global_config,
+            dst_port=str(self.port_rotation.next(self.ports_quantity))
+        )
+
+    def retrieve(self, description: str):
+        """
+        Downloads the results of the experiment `description` from
+        a receiver side in background if results are downloaded.
+        """
+        if self.retriever is not None:
+            self.retriever.submit(description)
+
+    def perform_experiment(
+        self,
+        global_config,
+        exper_params: generators.ExperimentParams,
+        soak_config: typing.Optional['soak.SoakTestConfig']=None
+    ):
+        """
+        Performs one experiment with the settings of the test, see
+        `perform_experiment`.
+        """
+        return perform_experiment(
+            global_config,
+            exper_params,
+            self.rcv,
+            self.snd_quantity,
+            self.snd_mode,
+            self.collect_stats,
+            self.run_tshark,
+            self.results_dir,
+            self.sample_interval,
+            self.placement_config,
+            self.collect_latency,
+            self.build_timeline,
+            soak_config
+        )
+
+    def finish(self):
+        """
+        Waits for the results to be downloaded, merges timelines, waits
+        for the background post-processing and stores the experiments
+        performed into the experiment cache.
+        """
+        if self.retriever is not None:
+            self.retriever.join()
+
+        # Receiver statistics have been downloaded by now
+        for description in self.timeline_descriptions:
+            self.postprocessor.submit(
+                f'merging timeline {description}',
+                log_timeline,
+                merge_timeline,
+                self.results_dir,
+                description
+            )
+        self.postprocessor.join()
+
+        stored = sum(
+            self.experiment_cache.store(
+                key,
+                description,
+                cache.experiment_artefacts(self.results_dir, description),
+                material
+            )
+            for key, material, description in self.to_cache
+        )
+        if self.to_cache:
+            logger.info(f'Cache: {stored} of {len(self.to_cache)} experiments stored')
+            self.experiment_cache.evict()
+
+
+def perform_experiments(
+    context: TestContext,
+    exper_params_list: typing.List[generators.ExperimentParams],
+    sweep: bool=True,
+    stop_above: bool=False,
+    soak_config: typing.Optional['soak.SoakTestConfig']=None
+):
+    """
+    Performs the experiments of a test one after another. Each experiment
+    is restored from the experiment cache if cached, otherwise it is
+    repeated until its extra time is known precisely enough, see
+    `repetition`. The experiments which do not fit the time budget are
+    skipped, see `planner.plan`.
+
+    Attributes:
+        sweep:
+            True if the experiments are a range (e.g. of bitrates) which
+            is covered at lower resolution when the budget is short, False
+            if they are listed in the order of importance.
+        stop_above:
+            Skip the experiments of the same traffic profile once
+            the bitrate has exceeded the available bandwidth.
+        soak_config:
+            Trends of process resources are tracked while streaming if
+            specified, see `perform_experiment`.
+
+    Returns:
+        A list of tuples (`generators.ExperimentParams`, `ExperimentResult`)
+        of the experiments performed, the result carries the median extra
+        time of the runs.
+    """
+    global_config = context.global_config
+    results_dir = context.results_dir
+    budget = context.budget
+    points = []
+    # Traffic profiles (None for constant bitrate without a profile)
+    # whose bitrate has exceeded the available bandwidth
+    saturated = set()
+    repetition_config = repetition.RepetitionConfig.from_config_filepath(context.config_filepath)
+    planner_config = planner.PlannerConfig.from_config_filepath(context.config_filepath)
+    history = planner.History.load(planner_config)
+    estimator = planner.DurationEstimator(history, context.snd_quantity, context.snd_mode)
+    exper_plan = planner.plan(
+        exper_params_list,
+        estimator,
+        budget,
+        repetition_config.min_runs,
+        sweep=sweep
+    )
+    if exper_plan.points or exper_plan.skipped:
+        exper_plan.log(budget)
+    for exper_params in exper_plan.points:
+        if exper_params.profile in saturated:
+            continue
+        controller = repetition.RepetitionController(
+            repetition_config,
+            exper_params.time_to_stream,
+            EXTRA_TIME_THRESHOLD
+        )
+        interrupted = False
+        run = 0
+        while True:
+            # The first run keeps the description, so that the files of
+            # a single run experiment are named the same as before
+            run_params = exper_params
+            if run > 0:
+                run_params = generators.with_description(
+                    exper_params,
+                    f'{exper_params.description}-run-{run}'
+                )
+            context.postprocessor.poll()
+            exper_result = None
+            if context.experiment_cache is not None:
+                material = get_cache_material(
+                    global_config,
+                    run_params,
+                    context.snd_quantity,
+                    context.snd_mode,
+                    context.collect_stats,
+                    context.run_tshark,
+                    context.binaries_hashes,
+                    context.cache_tag,
+                    context.collect_latency,
+                    context.build_timeline
+                )
+                key = cache.fingerprint(material)
+                if not context.refresh_cache and context.experiment_cache.restore(key, results_dir):
+                    exper_result = ExperimentResult.load(
+                        results_dir,
+                        run_params.description
+                    )
+                    exper_result.cached = True
+                    exper_result.save(results_dir)
+                    logger.info(
+                        f'Restored from cache {key[:12]}: '
+                        f'{run_params.description}. Extra time spent on '
+                        f'streaming: {exper_result.extra_time}'
+                    )
+
+            if exper_result is None:
+                if not budget.fits(estimator.estimate(run_params)):
+                    logger.info(
+                        f'Time budget: {planner.format_duration(budget.remaining())} '
+                        f'left, not performed: {run_params.description}'
+                    )
+                    break
+                capped_params = budget.cap(run_params, estimator.overhead())
+                exper_global_config = context.rotate_port()
+                started = time.monotonic()
+                try:
+                    exper_result = context.perform_experiment(
+                        exper_global_config,
+                        capped_params,
+                        soak_config
+                    )
+                    exper_result.save(results_dir)
+                    try:
+                        history.add(planner.ExperimentRecord(
+                            run_params.description,
+                            run_params.time_to_stream,
+                            exper_result.extra_time,
+                            context.snd_quantity,
+                            context.snd_mode,
+                            time.monotonic() - started
+                        ))
+                    except OSError as error:
+                        logger.info(
+                            f'Planner history has not been written. Exception '
+                            f'occured ({error.__class__.__name__}): {error}'
+                        )
+                    if context.run_tshark:
+                        context.postprocessor.submit(
+                            f'decoding {run_params.description}',
+                            lambda summary, exper_result=exper_result: save_protocol(
+                                exper_result,
+                                summary,
+                                results_dir
+                            ),
+                            dissect_capture,
+                            results_dir,
+                            run_params.description,
+                            int(exper_global_config.dst_port)
+                        )
+                    logger.info(f'Extra time spent on streaming: {exper_result.extra_time}')
+                    if context.build_timeline:
+                        context.timeline_descriptions.append(run_params.description)
+                except (KeyboardInterrupt, shared.ProcessHasNotBeenKilled):
+                    interrupted = True
+                    break
+                except (
+                    shared.ProcessHasNotBeenStartedSuccessfully, 
+                    shared.ProcessHasNotBeenCreated
+                ) as error:
+                    break
+                finally:
+                    context.retrieve(run_params.description)
+
+                # Results of the experiments stopped at the budget deadline
+                # differ from the ones streamed until finished
+                stopped_early = (
+                    capped_params.max_extra_time is not None
+                    and exper_result.extra_time >= capped_params.max_extra_time
+                    and capped_params.max_extra_time != run_params.max_extra_time
+                )
+                if context.experiment_cache is not None and not stopped_early:
+                    context.to_cache.append((key, material, run_params.description))
+
+            controller.add(exper_result.extra_time)
+            if controller.should_stop():
+                break
+            run += 1
+
+        if controller.values:
+            summary = controller.summary(exper_params.description)
+            if repetition_config.max_runs > 1:
+                summary.save(results_dir)
+                logger.info(
+                    f'Runs: {len(summary.values)} ({summary.stop_reason}), '
+                    f'median {summary.metric}: {summary.median}, '
+                    f'{repetition_config.confidence:.0%} CI: '
+                    f'[{summary.ci_low}, {summary.ci_high}]'
+                )
+        if interrupted:
+            break
+        if not controller.values:
+            continue
+
+        extra_time = summary.median_extra_time
+        points.append((
+            exper_params,
+            attr.evolve(
+                exper_result,
+                description=exper_params.description,
+                extra_time=extra_time
+            )
+        ))
+
+        if summary.verdict == 'above':
+            logger.info(
+                f'Waited {exper_params.time_to_stream + extra_time} seconds '
+                f'instead of {exper_params.time_to_stream}. '
+                # f'{bitrate}bps is considered as maximim available bandwidth.'
+            )
+            # Other traffic profiles may still fit, e.g. CBR when GOP bursts
+            # have not
+            if stop_above:
+                saturated.add(exper_params.profile)
+
+    return points
+
+
+@click.command()
+@click.argument(
+    'test_name',
+    type=click.Choice(TEST_NAMES)
+)
+@click.argument(
+    'config_filepath', 
+    type=click.Path(exists=True)
+)
+@click.option(
+    '--rcv', 
+    type=click.Choice(['manually', 'remotely']), 
+    default='remotely',
+    help=	'Start receiver manually or remotely via SSH. In case of '
+            'manual receiver start, please do not forget to do it '
+            'before running the script.',
+    show_default=True
+)
+@click.option(
+    '--snd-quantity', 
+    default=1,
+    help=   'Number of senders to start.',
+    show_default=True
+)
+@click.option(
+    '--snd-mode',
+    type=click.Choice(['serial', 'parallel', 'barrier', 'batch']), 
+    default='parallel',
+    help=   'Start senders concurrently or in parallel. In barrier mode, '
+            'senders are started in parallel and released at one moment. '
+            'Batch mode is for hundreds to thousands of senders.',
+    show_default=True
+)
+@click.option(
+    '--collect-stats', 
+    is_flag=True, 
+    help='Collect SRT statistics.'
+)
+@click.option(
+    '--run-tshark',
+    is_flag=True,
+    help='Run tshark.'
+)
+@click.option(
+    '--results-dir',
+    default='_results',
+    help=   'Directory to store results.',
+    show_default=True
+)
+@click.option(
+    '--download-results',
+    is_flag=True,
+    help=   'Download results (SRT statistics, etc.) from a receiver side '
+            'in background while the next experiment is running. '
+            'Applicable for remotely started receiver only.'
+)
+@click.option(
+    '--sample-hosts',
+    is_flag=True,
+    help=   'Sample host resources (CPU, NIC counters, UDP drops, memory) '
+            'on a sender and a receiver side during each experiment.'
+)
+@click.option(
+    '--sample-interval',
+    default=0.5,
+    help=   'Interval of sampling host resources in seconds.',
+    show_default=True
+)
+@click.option(
+    '--pre-probe',
+    is_flag=True,
+    help=   'Estimate bandwidth within seconds before bandwidth loop test '
+            'and narrow the bitrate range of the test around it.'
+)
+@click.option(
+    '--latency',
+    'collect_latency',
+    is_flag=True,
+    help=   'Collect RTT and sender buffer delay histograms from SRT '
+            'statistics while streaming and report p50/p99/p99.9 per '
+            'experiment. Implies --collect-stats.'
+)
+@click.option(
+    '--timeline',
+    'build_timeline',
+    is_flag=True,
+    help=   'Measure the clock offset of a receiver side at the start and '
+            'the end of each experiment and merge sender and receiver '
+            'statistics and tshark capture into one timeline file. '
+            'Implies --collect-stats.'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help=   'Do not use the experiment cache: neither restore results '
+            'of identical experiments, nor store new ones.'
+)
+@click.option(
+    '--refresh',
+    is_flag=True,
+    help=   'Run all the experiments even if cached, and replace '
+            'the cached results.'
+)
+@click.option(
+    '--skip-preflight',
+    is_flag=True,
+    help=   'Do not check hosts, srt-test-messaging, ports, disk space '
+            'and tshark before the test.'
+)
+@click.option(
+    '--time-budget',
+    type=float,
+    help=   'Wall-clock time in seconds the test should fit in. Experiments '
+            'which do not fit are skipped, bitrate ranges are covered at '
+            'lower resolution.'
+)
+def main(
+    test_name: str,
+    config_filepath: str,
+    rcv: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool,
+    run_tshark: bool,
+    results_dir: typing.Optional[pathlib.Path]=None,
+    download_results: bool=False,
+    sample_hosts: bool=False,
+    sample_interval: float=0.5,
+    pre_probe: bool=False,
+    collect_latency: bool=False,
+    build_timeline: bool=False,
+    no_cache: bool=False,
+    refresh: bool=False,
+    skip_preflight: bool=False,
+    time_budget: typing.Optional[float]=None
+):
+    # FIXME: This is a temporary solution for being able to run main() function
+    # outside this code. There is a problem with click:
+    # (TypeError): main() takes from 1 to 5 positional arguments but 9 were 
+    # given. File CC loop test can not be done.
+    # FIXME: Also there is a problem with printing docstring description 
+    # from main() function to terminal when running --help.
+    result = main_function(
+        test_name,
+        config_filepath,
+        rcv,
+        snd_quantity,
+        snd_mode,
+        collect_stats,
+        run_tshark,
+        results_dir,
+        download_results,
+        sample_interval if sample_hosts else None,
+        pre_probe,
+        use_cache=not no_cache,
+        refresh_cache=refresh,
+        collect_latency=collect_latency,
+        preflight_checks=not skip_preflight,
+        build_timeline=build_timeline,
+        time_budget=time_budget
+    )
+    # The test has not been started, e.g. results directory has not been
+    # created on a receiver side
+    if result is None:
+        sys.exit(2)
+    # Non-zero exit code, so that A/B test can gate a new SRT build
+    if test_name == TestName.ab_test.value:
+        if any(verdict == 'regression' for _, _, verdict in result):
+            sys.exit(1)
+
+def main_function(
+    test_name: str,
+    config_filepath: str,
+    rcv: str,
+    snd_quantity: int,
+    snd_mode: str,
+    collect_stats: bool=False,
+    run_tshark: bool=False,
+    results_dir: typing.Optional[pathlib.Path]=None,
+    download_results: bool=False,
+    sample_interval: typing.Optional[float]=None,
+    pre_probe: bool=False,
+    test_config=None,
+    use_cache: bool=True,
+    refresh_cache: bool=False,
+    cache_tag: typing.Optional[str]=None,
+    collect_latency: bool=False,
+    preflight_checks: bool=True,
+    build_timeline: bool=False,
+    time_budget: typing.Optional[float]=None
+):
+    """ 
+    Performs one test from the list of available tests `TEST_NAMES` 
+    depending on the `test_name`. During the test, either one experiment
+    or several experiments with different parameters are performed.
+    Parameters for each experiment are generated by means of an 
+    appropriate generator defined in `generators.py`.
+
+    Global and tests specific settings are defined in config file 
+    of type `config.ini`. 
+
+    Attributes:
+        test_name:
+            Test name from the list of available tests `TEST_NAMES`.
+        config_filepath:
+            A path to a config file.
+        rcv:
+            Start a receiver manually or remotely via SSH.
+        snd_quantity:
+            Number of senders to start.
+        snd_mode:
+            Start senders concurrently or in parallel. In barrier mode,
+            all the senders are pre-spawned and released at one moment.
+            In batch mode, senders are spawned in batches with output
+            written into files, see `start_senders_in_batches`.
+        collect_stats:
+            True/False in case of collect/not collect SRT statistics.
+        run_tsahrk:
+            True/False in case of run/not run tshark on a sender side.
+            Captures are decoded in background by `postprocessing`
+            workers while the next experiment is running.
+        results_dir:
+            A path to a directory where test results should be stored.
+        download_results:
+            True/False in case of download/not download results from
+            a receiver side. Results of each experiment are downloaded
+            in background while the next experiment is running.
+        sample_interval:
+            Interval (s) of sampling host resources (CPU, NIC counters,
+            UDP drops, memory) on a sender and a receiver side during
+            each experiment. Host resources are not sampled if None.
+        pre_probe:
+            True/False in case of estimate/not estimate bandwidth before
+            bandwidth loop test. If estimated, `bitrate_min` and
+            `bitrate_max` of the test are narrowed around the estimate.
+        test_config:
+            Test config built in memory, e.g. from the results of another
+            test. If None, the test config is read from config file.
+        use_cache:
+            True/False in case of using/not using the experiment cache:
+            the results of identical experiments (the same args,
+            srt-test-messaging builds and scenario) are restored instead
+            of being streamed again. Applies to `CACHED_TEST_NAMES` only.
+        refresh_cache:
+            Run the experiments even if cached, and replace the cached
+            results.
+        cache_tag:
+            Additional string the cache key depends on, e.g. the number of
+            iteration of an iterative test.
+        collect_latency:
+            True/False in case of collecting/not collecting RTT and sender
+            buffer delay histograms from SRT statistics. Implies
+            `collect_stats`.
+        preflight_checks:
+            True/False in case of checking/not checking all the hosts
+            involved concurrently before the test: SSH reachability,
+            srt-test-messaging presence, free ports, disk space and tshark
+            capabilities.
+        build_timeline:
+            True/False in case of merging/not merging sender and receiver
+            statistics and tshark capture of each experiment into one
+            timeline file `{description}-timeline.bin` on the sender
+            clock, see `timeline.merge`. Receiver statistics are merged
+            if downloaded (`download_results`). Implies `collect_stats`.
+        time_budget:
+            Wall-clock time (s) the test should fit in. The wall time of
+            each experiment is estimated from config file and the
+            experiments performed before, see `planner`, and the points
+            which do not fit are skipped. Maximum extra time of each
+            experiment is limited to the time left. The projected
+            duration is logged even if the budget is not set.
+
+    Returns a list of tuples of the following format
+    (test description, bitrate, extra time needed to finish with streaming),
+    for fairness test (test description, Jain's fairness index,
+    convergence time), for A/B test (test description, metric, verdict),
+    for connection rate test (test description, accepted connections
+    per second, failure rate)
+
+    Raises 
+        paramiko.ssh_exception.SSHException if ssh-agent with an appropriate 
+        RSA key has not been started in a terminal from which the script has
+        been running.
+        preflight.PreflightCheckFailed if a pre-flight check has failed.
+        placement.PlacementError if the real-time scheduling policy
+        configured for senders can not be set.
+    """
+    budget = planner.Budget(time_budget)
+    config_filepath = pathlib.Path(config_filepath)
+    results_dir = pathlib.Path(results_dir)
+    if collect_latency or build_timeline:
+        collect_stats = True
+    global_config = generators.GlobalConfig.from_config_filepath(config_filepath)
+    placement_config = placement.PlacementConfig.from_config_filepath(config_filepath)
+    if placement_config is not None:
+        placement_config = placement_config.resolve(global_config.snd_tshark_iface)
+        placement_config.pin_orchestrator()
+        placement_config.check_realtime()
+        logger.info(f'CPU placement: {placement_config.describe(snd_quantity)}')
+    if test_config is None:
+        test_config = read_test_config(test_name, config_filepath)
+    if test_name in STATS_TEST_NAMES:
+        collect_stats = True
+    if test_name == TestName.bidirectional_test.value and rcv != 'remotely':
+        logger.info(
+            'Reverse flow is started via SSH only, with manually '
+            'started receiver only forward direction is loaded'
+        )
+
+    # Receivers listen on dst_port, fairness test flows and the reverse
+    # flow of bidirectional test on the next ports
+    ports_quantity = 1
+    if test_name == TestName.fairness_test.value:
+        ports_quantity = len(test_config.flows)
+    if test_name == TestName.bidirectional_test.value:
+        ports_quantity = generators.REVERSE_PORT_OFFSET + 1
+    ports = [int(global_config.dst_port) + i for i in range(ports_quantity)]
+    port_rotation = None
+    port_rotation_config = remote.PortRotationConfig.from_config_filepath(config_filepath)
+    if port_rotation_config is not None:
+        port_rotation = remote.PortRotation(port_rotation_config)
+        ports = port_rotation_config.ports()
+
+    if rcv == 'remotely':
+        reap_remote_processes(orphans=True)
+
+    if preflight_checks:
+        preflight.check_hosts(
+            global_config,
+            rcv,
+            run_tshark,
+            results_dir,
+            ports
+        )
+        if test_name == TestName.ab_test.value:
+            preflight.check_hosts(
+                test_config.build_b(global_config),
+                rcv,
+                False,
+                results_dir,
+                ports
+            )
+
+    if rcv == 'remotely' and not create_remote_results_dir(global_config, results_dir):
+        return
+
+    logger.info('Creating a folder for saving results on a sender side')
+    results_dir = pathlib.Path(results_dir)
+    if results_dir.exists():
+        shutil.rmtree(results_dir)
+    results_dir.mkdir(parents=True)
+    logger.info('Created successfully')
+
+    result = []
+    if test_name == TestName.bw_estimation_test.value or (
+        pre_probe and test_name == TestName.bw_loop_test.value
+    ):
+        estimation_config = generators.BandwidthEstimationConfig.from_config_filepath(config_filepath)
+        try:
+            exper_result = estimate_bandwidth(
+                global_config,
+                estimation_config,
+                rcv,
+                results_dir,
+                placement_config
+            )
+        except (KeyboardInterrupt, shared.ProcessHasNotBeenKilled):
+            return result
+        except (
+            shared.ProcessHasNotBeenStartedSuccessfully,
+            shared.ProcessHasNotBeenCreated
+        ) as error:
+            exper_result = None
+
+        if exper_result is not None:
+            exper_result.save(results_dir)
+        if exper_result is not None and test_name == TestName.bw_estimation_test.value:
+            result.append((
+                exper_result.description,
+                exper_result.estimated_bandwidth,
+                exper_result.extra_time
+            ))
+
+        capacity = exper_result.estimated_bandwidth if exper_result else None
+        if test_name == TestName.bw_loop_test.value:
+            if capacity is None:
+                logger.info(
+                    'Bandwidth has not been estimated, bitrate range from '
+                    'config file is used'
+                )
+            else:
+                test_config = generators.seed_bw_loop_test_config(
+                    test_config,
+                    estimation_config,
+                    capacity
+                )
+                logger.info(
+                    f'Bitrate range seeded by the estimate: '
+                    f'{test_config.bitrate_min}-{test_config.bitrate_max} bps'
+                )
+
+    # Captures are decoded and timelines merged in the background while
+    # the next experiment is streaming
+    postprocessing_config = postprocessing.PostProcessingConfig.from_config_filepath(config_filepath)
+    postprocessor = postprocessing.PostProcessor(
+        postprocessing_config,
+        placement_config.postprocessing(postprocessing_config.nice)
+        if placement_config else
+        placement.ProcessPlacement(nice=postprocessing_config.nice, policy='idle')
+    )
+
+    retriever = None
+    if download_results and rcv == 'remotely':
+        retriever = retrieval.ArtefactsRetriever(
+            global_config.rcv_ssh_username,
+            global_config.rcv_ssh_host,
+            str(results_dir),
+            results_dir
+        )
+        retriever.start()
+
+    context = TestContext(
+        global_config,
+        config_filepath,
+        rcv,
+        snd_quantity,
+        snd_mode,
+        collect_stats,
+        run_tshark,
+        results_dir,
+        sample_interval,
+        placement_config,
+        collect_latency,
+        build_timeline,
+        budget,
+        postprocessor,
+        retriever,
+        port_rotation,
+        ports_quantity,
+        refresh_cache=refresh_cache,
+        cache_tag=cache_tag
+    )
+
+    if use_cache and test_name in CACHED_TEST_NAMES:
+        context.experiment_cache = cache.ExperimentCache(
+            cache.CacheConfig.from_config_filepath(config_filepath)
+        )
+        context.experiment_cache.evict()
+        context.binaries_hashes = get_srt_binaries_hashes(global_config, rcv)
+        if context.binaries_hashes['snd'] is None:
+            logger.info(
+                'srt-test-messaging on a sender side has not been hashed, '
+                'experiment cache is not used'
+            )
+            context.experiment_cache = None
+
+    if test_name == TestName.fairness_test.value:
+        from srt_test_runner import fairness
+        result += fairness.run(context, test_config)
+
+    if test_name == TestName.conn_rate_test.value:
+        from srt_test_runner import connrate
+        result += connrate.run(context, test_config)
+
+    if test_name == TestName.ab_test.value:
+        from srt_test_runner import abtest
+        result += abtest.run(context, test_config)
+
+    if test_name == TestName.soak_test.value:
+        from srt_test_runner import soak
+        result += soak.run(context, test_config)
+
+    if test_name == TestName.bidirectional_test.value:
+        from srt_test_runner import bidirectional
+        result += bidirectional.run(context, test_config)
+
+    if test_name == TestName.filecc_loop_test.value:
+        points = perform_experiments(
+            context,
+            list(generators.filecc_loop_test_generator(global_config, test_config)),
+            # CC algorithms are listed in the order of importance
+            sweep=False
+        )
+        result += [
+            (exper_result.description, exper_params.bitrate, exper_result.extra_time)
+            for exper_params, exper_result in points
+        ]
+
+    if test_name == TestName.bw_loop_test.value:
+        points = perform_experiments(
+            context,
+            list(generators.bw_loop_test_generator(global_config, test_config)),
+            # There is no need to stream with the higher bitrate, because
+            # there is no available bandwidth
+            stop_above=True
+        )
+        result += [
+            (exper_result.description, exper_params.bitrate, exper_result.extra_time)
+            for exper_params, exper_result in points
+        ]
+
+        # Experiments with traffic profiles are reported per profile
+        profiles.report(
+            results_dir / f'{global_config.scenario}-alg-{global_config.algdescr}-profiles.json',
+            [
+                (exper_params.profile, exper_result)
+                for exper_params, exper_result in points
+                if exper_params.profile is not None
+            ]
+        )
+
+    context.finish()
+    return result
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,409 @@
+import configparser
+import logging
+import os
+import pathlib
+import subprocess
+import sys
+import typing
+
+import attr
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+SCHED_POLICIES = ['other', 'batch', 'idle', 'fifo', 'rr']
+# Real-time policies take a static priority from 1 to 99, the others 0
+REALTIME_POLICIES = ['fifo', 'rr']
+REALTIME_PRIORITIES = range(1, 100)
+# Options of chrt utility used to set scheduling policy on a remote machine
+CHRT_OPTIONS = {
+    'other': '-o',
+    'batch': '-b',
+    'idle': '-i',
+    'fifo': '-f',
+    'rr': '-r',
+}
+
+
+class PlacementError(Exception):
+    pass
+
+
+def parse_cores(cores: str):
+    """
+    Parses a list of CPU cores in a format "0", "2-5", "0,2,4-6"
+    (the same as taskset -c and /proc/irq/N/smp_affinity_list).
+    """
+    result = []
+    for element in cores.split(','):
+        element = element.strip()
+        if not element:
+            continue
+        if '-' in element:
+            first, last = element.split('-')
+            result += list(range(int(first), int(last) + 1))
+        else:
+            result.append(int(element))
+    return result
+
+
+def format_cores(cores: typing.List[int]):
+    return ','.join(str(core) for core in cores)
+
+
+def get_irq_cores(iface: str):
+    """
+    Returns:
+        A sorted list of CPU cores serving interrupts of the network
+        interface `iface` according to /proc/interrupts.
+    """
+    cores = set()
+    with open('/proc/interrupts', 'r') as fp:
+        for line in fp:
+            irq, _, rest = line.partition(':')
+            irq = irq.strip()
+            if not irq.isdigit():
+                continue
+            # The last column contains the device name, e.g. "eth0",
+            # "eth0-TxRx-0" or "iwlwifi: eth0"
+            if iface not in rest.split()[-1:] and f'{iface}-' not in rest:
+                continue
+            filepath = f'/proc/irq/{irq}/smp_affinity_list'
+            with open(filepath, 'r') as affinity_fp:
+                cores.update(parse_cores(affinity_fp.read()))
+    return sorted(cores)
+
+
+def get_sched_policy(policy: str):
+    return getattr(os, f'SCHED_{policy.upper()}')
+
+
+@attr.s
+class ProcessPlacement:
+    """
+    CPU cores and scheduling settings of one process.
+    """
+    cores: typing.Optional[typing.List[int]] = attr.ib(default=None)
+    nice: typing.Optional[int] = attr.ib(default=None)
+    # One of SCHED_POLICIES
+    policy: typing.Optional[str] = attr.ib(default=None)
+    # Static priority for 'fifo' and 'rr' policies
+    priority: int = attr.ib(default=0)
+    # Result of `apply`: None if it has not been applied to a local
+    # process (it is applied on a remote machine by `command_prefix`,
+    # and the process fails to start there if it can not be), False if
+    # it has failed for any of the processes
+    applied: typing.Optional[bool] = attr.ib(default=None, eq=False)
+
+    def apply(self, pid: int):
+        """
+        Applies the placement to an already started local process and
+        records the result into `applied`.
+
+        Returns:
+            True if all the settings have been applied successfully,
+            False otherwise.
+        """
+        try:
+            if self.cores:
+                os.sched_setaffinity(pid, self.cores)
+            if self.nice is not None:
+                os.setpriority(os.PRIO_PROCESS, pid, self.nice)
+            if self.policy is not None:
+                os.sched_setscheduler(
+                    pid,
+                    get_sched_policy(self.policy),
+                    os.sched_param(self.priority)
+                )
+        except (AttributeError, OSError) as error:
+            # AttributeError: the functions above are not available on macOS
+            # and Windows, OSError: no permissions to raise priority, etc.
+            logger.info(
+                f'Placement {self} has not been applied to process {pid}. '
+                f'Exception occured ({error.__class__.__name__}): {error}\r'
+            )
+            self.applied = False
+            return False
+        if self.applied is None:
+            self.applied = True
+        return True
+
+    def command_prefix(self):
+        """
+        Returns:
+            A list of args to prepend a command started on a remote machine
+            in order to apply the placement via taskset, nice and chrt.
+        """
+        args = []
+        if self.cores:
+            args += ['taskset', '-c', format_cores(self.cores)]
+        if self.nice is not None:
+            args += ['nice', '-n', str(self.nice)]
+        if self.policy is not None:
+            args += ['chrt', CHRT_OPTIONS[self.policy], str(self.priority)]
+        return args
+
+
+@attr.s
+class PlacementConfig:
+    """
+    CPU affinity and scheduling settings for senders, tshark, the script
+    itself (orchestrator), and a receiver.
+    """
+    snd_cores: typing.List[int] = attr.ib(factory=list)
+    snd_cores_per_sender: int = attr.ib(default=1)
+    snd_nice: typing.Optional[int] = attr.ib(default=None)
+    snd_policy: typing.Optional[str] = attr.ib(default=None)
+    snd_priority: int = attr.ib(default=0)
+    tshark_cores: typing.List[int] = attr.ib(factory=list)
+    orchestrator_cores: typing.List[int] = attr.ib(factory=list)
+    rcv_cores: typing.List[int] = attr.ib(factory=list)
+    rcv_nice: typing.Optional[int] = attr.ib(default=None)
+    rcv_policy: typing.Optional[str] = attr.ib(default=None)
+    rcv_priority: int = attr.ib(default=0)
+    # Exclude the cores serving the network interface interrupts
+    # from sender cores
+    irq_aware: bool = attr.ib(default=False)
+    # Cores available to the script at start, filled in by `resolve`
+    available_cores: typing.List[int] = attr.ib(factory=list)
+    # Placements handed out by role, so that `describe` records whether
+    # they have been applied, see `for_experiment`
+    _placements: typing.Dict[str, ProcessPlacement] = attr.ib(
+        factory=dict,
+        init=False,
+        repr=False,
+        eq=False
+    )
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        """
+        Returns:
+            `PlacementConfig` or None if there is no `placement` section
+            in config file.
+        """
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('placement'):
+            return None
+
+        section = parsed_config['placement']
+
+        def optional_int(key):
+            value = section.get(key, '').strip()
+            return int(value) if value else None
+
+        def optional_policy(key):
+            value = section.get(key, '').strip()
+            if not value:
+                return None
+            if value not in SCHED_POLICIES:
+                raise ValueError(
+                    f'{key}: {value}, expected one of {SCHED_POLICIES}'
+                )
+            return value
+
+        def priority(key, policy):
+            value = section.getint(key, 0)
+            if policy in REALTIME_POLICIES and value not in REALTIME_PRIORITIES:
+                raise ValueError(
+                    f'{key}: {value}, expected from {REALTIME_PRIORITIES[0]} '
+                    f'to {REALTIME_PRIORITIES[-1]} for {policy} policy'
+                )
+            if policy not in REALTIME_POLICIES and value != 0:
+                raise ValueError(
+                    f'{key}: {value}, expected 0 for {policy or "default"} policy'
+                )
+            return value
+
+        snd_policy = optional_policy('snd_policy')
+        rcv_policy = optional_policy('rcv_policy')
+        return cls(
+            parse_cores(section.get('snd_cores', '')),
+            section.getint('snd_cores_per_sender', 1),
+            optional_int('snd_nice'),
+            snd_policy,
+            priority('snd_priority', snd_policy),
+            parse_cores(section.get('tshark_cores', '')),
+            parse_cores(section.get('orchestrator_cores', '')),
+            parse_cores(section.get('rcv_cores', '')),
+            optional_int('rcv_nice'),
+            rcv_policy,
+            priority('rcv_priority', rcv_policy),
+            section.getboolean('irq_aware', False)
+        )
+
+    def resolve(self, iface: str):
+        """
+        Returns:
+            A copy of the config with the cores available to the script
+            determined and, if `irq_aware` is set, the cores serving
+            `iface` interrupts excluded from sender cores.
+        """
+        try:
+            available_cores = sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            available_cores = []
+
+        snd_cores = self.snd_cores
+        if self.irq_aware:
+            try:
+                irq_cores = get_irq_cores(iface)
+            except OSError as error:
+                logger.info(
+                    f'Cores serving {iface} interrupts have not been '
+                    f'determined. Exception occured '
+                    f'({error.__class__.__name__}): {error}'
+                )
+                irq_cores = []
+            if not snd_cores:
+                snd_cores = [
+                    core for core in available_cores
+                    if core not in self.orchestrator_cores
+                    and core not in self.tshark_cores
+                ]
+            filtered = [core for core in snd_cores if core not in irq_cores]
+            if filtered:
+                snd_cores = filtered
+            else:
+                logger.info(
+                    f'All sender cores {snd_cores} serve {iface} interrupts '
+                    f'{irq_cores}, they are used anyway'
+                )
+        return attr.evolve(
+            self,
+            snd_cores=snd_cores,
+            available_cores=available_cores
+        )
+
+    def _placement(self, role: str, factory):
+        if role not in self._placements:
+            self._placements[role] = factory()
+        return self._placements[role]
+
+    def for_experiment(self):
+        """
+        Returns:
+            A copy of the config whose placements record the results of
+            applying them during one experiment only. The placement of
+            the script itself is kept.
+        """
+        config = attr.evolve(self)
+        if 'orchestrator' in self._placements:
+            config._placements['orchestrator'] = self._placements['orchestrator']
+        return config
+
+    def pin_orchestrator(self):
+        """ Pins the script itself to `orchestrator_cores`. """
+        if not self.orchestrator_cores:
+            return
+        self._placement(
+            'orchestrator',
+            lambda: ProcessPlacement(self.orchestrator_cores)
+        ).apply(0)
+
+    def check_realtime(self):
+        """
+        Checks that the real-time policy configured for senders can be
+        set, by applying it to a short-lived process, so that the test
+        is not started if it can not be (no CAP_SYS_NICE, macOS, etc.).
+        A receiver side policy is set by chrt, which fails the receiver
+        start instead.
+
+        Raises:
+            PlacementError
+        """
+        if self.snd_policy not in REALTIME_POLICIES:
+            return
+        probe = ProcessPlacement(policy=self.snd_policy, priority=self.snd_priority)
+        process = subprocess.Popen(
+            [sys.executable, '-c', 'import sys; sys.stdin.read()'],
+            stdin=subprocess.PIPE
+        )
+        try:
+            applied = probe.apply(process.pid)
+        finally:
+            process.kill()
+            process.wait()
+        if not applied:
+            raise PlacementError(
+                f'snd_policy: {self.snd_policy}, snd_priority: '
+                f'{self.snd_priority} can not be set, see the log above'
+            )
+
+    def _free_cores(self):
+        # Child processes inherit CPU affinity, so if the script is pinned,
+        # the processes without configured cores should be explicitly
+        # moved away from orchestrator cores
+        if not self.orchestrator_cores:
+            return None
+        return [
+            core for core in self.available_cores
+            if core not in self.orchestrator_cores
+        ] or None
+
+    def sender(self, number: int):
+        cores = self._free_cores()
+        if self.snd_cores:
+            cores = [
+                self.snd_cores[(number * self.snd_cores_per_sender + i) % len(self.snd_cores)]
+                for i in range(min(self.snd_cores_per_sender, len(self.snd_cores)))
+            ]
+        return self._placement(
+            f'snd-{number}',
+            lambda: ProcessPlacement(
+                cores,
+                self.snd_nice,
+                self.snd_policy,
+                self.snd_priority
+            )
+        )
+
+    def tshark(self):
+        return self._placement(
+            'tshark',
+            lambda: ProcessPlacement(self.tshark_cores or self._free_cores())
+        )
+
+    def receiver(self):
+        return self._placement(
+            'rcv',
+            lambda: ProcessPlacement(
+                self.rcv_cores or None,
+                self.rcv_nice,
+                self.rcv_policy,
+                self.rcv_priority
+            )
+        )
+
+    def postprocessing(self, nice: typing.Optional[int]=None):
+        """
+        Post-processing workers run on the cores not used by senders and
+        tshark with idle scheduling policy.
+        """
+        busy = set(self.snd_cores) | set(self.tshark_cores)
+        cores = [core for core in self.available_cores if core not in busy]
+        return ProcessPlacement(cores or None, nice, 'idle')
+
+    def describe(self, snd_quantity: int):
+        """
+        Returns:
+            A dictionary {role: placement} to be recorded in results.
+            `applied` of a placement tells whether it has actually been
+            applied, see `ProcessPlacement.applied`.
+        """
+        orchestrator = self._placements.get('orchestrator')
+        placement = {
+            'orchestrator': attr.asdict(orchestrator) if orchestrator else None,
+            'tshark': attr.asdict(self.tshark()),
+            'rcv': attr.asdict(self.receiver()),
+        }
+        for i in range(snd_quantity):
+            placement[f'snd-{i}'] = attr.asdict(self.sender(i))
+        return placement
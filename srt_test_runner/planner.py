@@ -0,0 +1,338 @@
+import configparser
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import statistics
+import tempfile
+import time
+import typing
+
+import attr
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class PlannerConfig:
+    """
+    Test planner config. The section is optional, default values are used
+    if it is not specified within config file.
+    """
+    # File with the wall time of the experiments performed, shared by
+    # all the tests run from the same directory
+    history_filepath: str = attr.ib(default='_planner_history.json')
+    # Number of the latest experiments kept in the history
+    history_size: int = attr.ib(default=500)
+    # Time (s) spent on an experiment besides streaming (starting and
+    # stopping the receiver, senders and tshark, downloading results)
+    # until it has been measured
+    default_overhead: float = attr.ib(default=10)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('planner'):
+            return cls()
+        section = parsed_config['planner']
+        default = cls()
+        return cls(
+            section.get('history_filepath', default.history_filepath),
+            section.getint('history_size', default.history_size),
+            section.getfloat('default_overhead', default.default_overhead)
+        )
+
+
+@attr.s
+class ExperimentRecord:
+    description: str = attr.ib()
+    time_to_stream: int = attr.ib()
+    extra_time: float = attr.ib()
+    snd_quantity: int = attr.ib()
+    snd_mode: str = attr.ib()
+    # Time (s) from the start of the experiment till its result
+    wall_time: float = attr.ib()
+    # Unix time the experiment has finished at
+    finished: float = attr.ib(factory=time.time)
+
+    @property
+    def overhead(self):
+        return self.wall_time - self.time_to_stream - self.extra_time
+
+
+class History:
+    """
+    Wall time of the experiments performed, the oldest ones are dropped
+    above `history_size`. The file may be shared by the tests run from
+    the same directory at the same time, e.g. matrix scenarios.
+    """
+
+    def __init__(self, config: PlannerConfig):
+        self.config = config
+        self.filepath = pathlib.Path(config.history_filepath)
+        self.records = []
+
+    def _read(self):
+        try:
+            with self.filepath.open('r', encoding='utf-8') as fp:
+                return [ExperimentRecord(**record) for record in json.load(fp)]
+        except FileNotFoundError:
+            return []
+        except (ValueError, TypeError) as error:
+            logger.info(
+                f'Planner history {self.filepath} has not been read, '
+                f'it is started anew. Exception occured '
+                f'({error.__class__.__name__}): {error}'
+            )
+            return []
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """ Exclusive lock of the history between processes. """
+        try:
+            # Not available on Windows
+            import fcntl
+        except ImportError:
+            yield
+            return
+        lock_filepath = self.filepath.with_name(self.filepath.name + '.lock')
+        with lock_filepath.open('a') as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp, fcntl.LOCK_UN)
+
+    @classmethod
+    def load(cls, config: PlannerConfig):
+        history = cls(config)
+        history.records = history._read()
+        return history
+
+    def add(self, record: ExperimentRecord):
+        """
+        Adds `record` to the records written by now, including the ones
+        of other processes, and writes the history.
+
+        Raises:
+            OSError
+        """
+        with self._lock():
+            self.records = (self._read() + [record])[-self.config.history_size:]
+            # Written via a temporary file of its own, so that the history
+            # is not lost if the script is killed while writing
+            fd, tmp_filepath = tempfile.mkstemp(
+                prefix=f'{self.filepath.name}.',
+                suffix='.tmp',
+                dir=str(self.filepath.resolve().parent)
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                    json.dump([attr.asdict(record) for record in self.records], fp, indent=4)
+                os.replace(tmp_filepath, self.filepath)
+            except BaseException:
+                os.unlink(tmp_filepath)
+                raise
+
+
+class DurationEstimator:
+    """
+    Estimates the wall time of an experiment as time to stream plus
+    the overhead and the extra time measured before: the median
+    overhead of the experiments with the same number of senders and
+    mode of starting them (of all the experiments if there are none),
+    and the median extra time of the experiment with the same
+    description (0 if it has not been performed).
+    """
+
+    def __init__(self, history: History, snd_quantity: int, snd_mode: str):
+        self.history = history
+        self.snd_quantity = snd_quantity
+        self.snd_mode = snd_mode
+
+    def overhead(self):
+        records = self.history.records
+        similar = [
+            record for record in records
+            if record.snd_quantity == self.snd_quantity
+            and record.snd_mode == self.snd_mode
+        ]
+        if similar or records:
+            return max(0, statistics.median(
+                record.overhead for record in (similar or records)
+            ))
+        return self.history.config.default_overhead
+
+    def extra_time(self, description: str):
+        extra_times = [
+            record.extra_time for record in self.history.records
+            if record.description == description
+        ]
+        return statistics.median(extra_times) if extra_times else 0
+
+    def estimate(self, exper_params):
+        """
+        Returns:
+            Estimated wall time (s) of one run of an experiment with
+            `generators.ExperimentParams`.
+        """
+        return (
+            exper_params.time_to_stream
+            + self.overhead()
+            + self.extra_time(exper_params.description)
+        )
+
+
+class Budget:
+    """
+    Wall-clock time budget of a test counted from its creation, infinite
+    if `seconds` is None.
+    """
+
+    def __init__(self, seconds: typing.Optional[float]=None):
+        self.seconds = seconds
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline - time.monotonic()
+
+    def fits(self, estimate: float):
+        return estimate <= self.remaining()
+
+    def cap(self, exper_params, overhead: float):
+        """
+        Returns:
+            Experiment params with maximum extra time limited, so that
+            the experiment finishes before the deadline: senders are
+            stopped after that instead of streaming until finished.
+        """
+        if self.deadline is None:
+            return exper_params
+        slack = max(0, int(self.remaining() - exper_params.time_to_stream - overhead))
+        if exper_params.max_extra_time is not None and exper_params.max_extra_time <= slack:
+            return exper_params
+        return attr.evolve(exper_params, max_extra_time=slack)
+
+
+def coarse_to_fine(quantity: int):
+    """
+    Returns:
+        Indices of a sweep of `quantity` points ordered so that any prefix
+        covers the range as evenly as possible: both ends first, then
+        the middle, then the middles of the halves, etc.
+    """
+    if quantity <= 2:
+        return list(range(quantity))
+    order = [0, quantity - 1]
+    intervals = [(0, quantity - 1)]
+    while intervals:
+        refined = []
+        for low, high in intervals:
+            if high - low < 2:
+                continue
+            middle = (low + high) // 2
+            order.append(middle)
+            refined += [(low, middle), (middle, high)]
+        intervals = refined
+    return order
+
+
+@attr.s
+class Plan:
+    # `generators.ExperimentParams` of the points to perform in the order
+    # of performing
+    points: list = attr.ib()
+    # Estimated wall time (s) of one run by description
+    estimates: typing.Dict[str, float] = attr.ib()
+    # Descriptions of the points dropped to fit the budget
+    skipped: typing.List[str] = attr.ib()
+    # Estimated wall time (s) of the points planned
+    projected: float = attr.ib()
+    # Estimated wall time (s) of all the points
+    projected_all: float = attr.ib()
+
+    def log(self, budget: Budget):
+        logger.info(
+            f'Plan: {len(self.points)} experiments, projected '
+            f'{format_duration(self.projected)}'
+            + (
+                f', budget {format_duration(budget.remaining())}'
+                if budget.deadline is not None else ''
+            )
+        )
+        for exper_params in self.points:
+            logger.info(
+                f'  {exper_params.description}: '
+                f'{format_duration(self.estimates[exper_params.description])}'
+            )
+        if self.skipped:
+            logger.info(
+                f'Plan: {len(self.skipped)} experiments do not fit the budget '
+                f'(all the experiments would take '
+                f'{format_duration(self.projected_all)}): {", ".join(self.skipped)}'
+            )
+
+
+def plan(
+    points: list,
+    estimator: DurationEstimator,
+    budget: Budget,
+    runs: int=1,
+    sweep: bool=False
+):
+    """
+    Selects the points of a test fitting the budget. The points of
+    a sweep (e.g. a bitrate range) are selected coarse to fine, so that
+    the range is covered evenly at lower resolution, and performed in
+    the original order. Otherwise, the points are selected in the order
+    they are listed within config file.
+
+    Attributes:
+        points:
+            `generators.ExperimentParams` of the test.
+        runs:
+            Number of runs of each experiment, see
+            `repetition.RepetitionConfig.min_runs`.
+
+    Returns:
+        `Plan`.
+    """
+    estimates = {
+        exper_params.description: estimator.estimate(exper_params)
+        for exper_params in points
+    }
+    priority = coarse_to_fine(len(points)) if sweep else list(range(len(points)))
+    selected = []
+    projected = 0
+    for index in priority:
+        cost = runs * estimates[points[index].description]
+        if budget.fits(projected + cost):
+            selected.append(index)
+            projected += cost
+    return Plan(
+        [points[index] for index in sorted(selected)],
+        estimates,
+        [
+            points[index].description
+            for index in range(len(points)) if index not in selected
+        ],
+        projected,
+        sum(runs * estimate for estimate in estimates.values())
+    )
+
+
+def format_duration(seconds: float):
+    if seconds == float('inf'):
+        return 'unlimited'
+    seconds = int(round(seconds))
+    return f'{seconds // 3600}:{seconds % 3600 // 60:02}:{seconds % 60:02}'
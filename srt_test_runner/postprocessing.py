@@ -0,0 +1,134 @@
+import concurrent.futures
+import configparser
+import logging
+import pathlib
+import signal
+import typing
+
+import attr
+
+from srt_test_runner import placement
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class PostProcessingConfig:
+    """
+    Post-processing pool config. The section is optional, default values
+    are used if it is not specified within config file.
+    """
+    # Number of worker processes
+    workers: int = attr.ib(default=1)
+    # Maximum number of jobs queued or running, the next experiment is
+    # not started until the backlog is below it
+    max_pending: int = attr.ib(default=4)
+    # Nice level of workers
+    nice: int = attr.ib(default=19)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('postprocessing'):
+            return cls()
+        section = parsed_config['postprocessing']
+        default = cls()
+        return cls(
+            section.getint('workers', default.workers),
+            section.getint('max_pending', default.max_pending),
+            section.getint('nice', default.nice)
+        )
+
+
+def init_worker(process_placement: placement.ProcessPlacement):
+    # Ctrl-C is handled by the script, jobs already queued are finished
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    process_placement.apply(0)
+
+
+class PostProcessor:
+    """
+    Runs analysis of experiment artefacts (decoding captures, merging
+    timelines, etc.) in a pool of low priority processes while the next
+    experiment is streaming.
+
+    Jobs are functions picklable by `concurrent.futures`, e.g. module
+    level ones. Callbacks with job results are called in the calling
+    thread from `submit`, `poll` and `join`, so they may update
+    the results of the script without locking.
+    """
+
+    def __init__(
+        self,
+        config: PostProcessingConfig,
+        process_placement: placement.ProcessPlacement
+    ):
+        self.config = config
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=config.workers,
+            initializer=init_worker,
+            initargs=(process_placement,)
+        )
+        # (name, future, callback)
+        self.pending = []
+
+    def _collect(self, timeout: typing.Optional[float]=0, backlog: int=0):
+        """
+        Waits until at most `backlog` jobs are pending or `timeout`
+        expires, and calls the callbacks of the jobs finished.
+        """
+        while len(self.pending) > backlog:
+            done, _ = concurrent.futures.wait(
+                [future for _, future, _ in self.pending],
+                timeout=timeout,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            if not done:
+                return
+            for name, future, callback in [job for job in self.pending if job[1] in done]:
+                self.pending.remove((name, future, callback))
+                try:
+                    result = future.result()
+                except Exception as error:
+                    logger.info(
+                        f'Post-processing {name} failed. Exception occured '
+                        f'({error.__class__.__name__}): {error}'
+                    )
+                    continue
+                if callback is not None:
+                    callback(result)
+
+    def submit(
+        self,
+        name: str,
+        callback: typing.Optional[typing.Callable[[typing.Any], None]],
+        fn: typing.Callable,
+        *args
+    ):
+        """
+        Queues `fn(*args)`, `callback` is called with its result. Blocks
+        while `max_pending` jobs are pending.
+        """
+        if len(self.pending) >= self.config.max_pending:
+            logger.info(f'Waiting for post-processing, {len(self.pending)} jobs pending')
+        self._collect(timeout=None, backlog=self.config.max_pending - 1)
+        future = self.executor.submit(fn, *args)
+        self.pending.append((name, future, callback))
+
+    def poll(self):
+        """ Calls the callbacks of the jobs finished without waiting. """
+        self._collect(timeout=0)
+
+    def join(self):
+        """ Waits for all the jobs and shuts down the pool. """
+        if self.pending:
+            logger.info(f'Waiting for post-processing, {len(self.pending)} jobs pending')
+        self._collect(timeout=None)
+        self.executor.shutdown()
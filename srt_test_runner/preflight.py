@@ -0,0 +1,244 @@
+import concurrent.futures
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import typing
+
+import attr
+
+from srt_test_runner import cache
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Timeout (s) of one check, checks are run concurrently, so the whole
+# pre-flight stage takes about the same time
+CHECK_TIMEOUT = shared.SSH_CONNECTION_TIMEOUT + 5
+# Minimum free disk space (MB) in a results directory
+MIN_FREE_SPACE = 500
+SRT_APPLICATION = 'srt-test-messaging'
+
+
+class PreflightCheckFailed(Exception):
+    pass
+
+
+@attr.s
+class CheckResult:
+    # 'snd' for a sender side (local machine), 'rcv' for a receiver side
+    side: str = attr.ib()
+    name: str = attr.ib()
+    passed: bool = attr.ib()
+    details: str = attr.ib(default='')
+
+
+def existing_parent(path: pathlib.Path):
+    path = path.expanduser().resolve()
+    while not path.exists():
+        path = path.parent
+    return path
+
+
+def check_local_binary(path_to_srt: str):
+    filepath = pathlib.Path(path_to_srt).expanduser() / SRT_APPLICATION
+    if not filepath.is_file() or not os.access(filepath, os.X_OK):
+        return CheckResult('snd', 'binary', False, f'{filepath} not found or not executable')
+    return CheckResult('snd', 'binary', True, f'sha256 {cache.file_hash(filepath)[:12]}')
+
+
+def check_local_disk_space(results_dir: pathlib.Path):
+    free = shutil.disk_usage(existing_parent(results_dir)).free // 2**20
+    return CheckResult(
+        'snd',
+        'disk space',
+        free >= MIN_FREE_SPACE,
+        f'{free} MB free in {results_dir}'
+    )
+
+
+def check_tshark(interface: str):
+    """
+    Checks that tshark is installed and can capture on `interface`:
+    `tshark -D` lists only the interfaces available to the user.
+    """
+    try:
+        result = subprocess.run(
+            ['tshark', '-D'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            timeout=CHECK_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired) as error:
+        return CheckResult('snd', 'tshark', False, f'{error.__class__.__name__}: {error}')
+    # Lines are of format "1. en0 (Wi-Fi)"
+    interfaces = [
+        line.split('.', 1)[1].split()[0]
+        for line in result.stdout.splitlines()
+        if '.' in line and line.split('.', 1)[1].split()
+    ]
+    if interface not in interfaces:
+        return CheckResult(
+            'snd',
+            'tshark',
+            False,
+            f'Can not capture on {interface}, available: {interfaces}, '
+            f'stderr: {result.stderr.strip()}'
+        )
+    return CheckResult('snd', 'tshark', True, f'Capturing on {interface}')
+
+
+def run_remote_check(
+    global_config,
+    name: str,
+    command: str,
+    describe: typing.Callable[[subprocess.CompletedProcess], CheckResult]
+):
+    try:
+        result = shared.run_via_ssh(
+            global_config.rcv_ssh_username,
+            global_config.rcv_ssh_host,
+            command,
+            CHECK_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired) as error:
+        return CheckResult('rcv', name, False, f'{error.__class__.__name__}: {error}')
+    return describe(result)
+
+
+def check_ssh(global_config):
+    def describe(result):
+        if result.returncode != 0:
+            return CheckResult(
+                'rcv',
+                'ssh',
+                False,
+                f'{global_config.rcv_ssh_username}@{global_config.rcv_ssh_host} '
+                f'is not reachable, stderr: {result.stderr.strip()}'
+            )
+        return CheckResult('rcv', 'ssh', True, result.stdout.strip())
+    return run_remote_check(global_config, 'ssh', 'uname -n', describe)
+
+
+def check_remote_binary(global_config):
+    # The path is not quoted, so that ~ is expanded by the remote shell
+    filepath = f'{global_config.rcv_path_to_srt}/{SRT_APPLICATION}'
+    def describe(result):
+        if result.returncode != 0 or not result.stdout.strip():
+            return CheckResult('rcv', 'binary', False, f'{filepath} not found or not executable')
+        return CheckResult('rcv', 'binary', True, f'sha256 {result.stdout.split()[0][:12]}')
+    return run_remote_check(
+        global_config,
+        'binary',
+        f'test -x {filepath} && sha256sum {filepath}',
+        describe
+    )
+
+
+def check_remote_ports(global_config, ports: typing.List[int]):
+    """
+    Checks that no UDP socket is bound to `ports` on a receiver side,
+    e.g. by a receiver left from the previous test.
+    """
+    filters = ' or '.join(f'sport = :{port}' for port in ports)
+    def describe(result):
+        if result.returncode != 0:
+            return CheckResult('rcv', 'ports', False, f'ss failed, stderr: {result.stderr.strip()}')
+        busy = result.stdout.strip()
+        if busy:
+            return CheckResult('rcv', 'ports', False, f'Busy: {busy}')
+        return CheckResult('rcv', 'ports', True, f'Free: {ports}')
+    return run_remote_check(global_config, 'ports', f'ss -Huan "( {filters} )"', describe)
+
+
+def check_remote_disk_space(global_config, results_dir: pathlib.Path):
+    # The results directory may not exist yet, the nearest existing
+    # parent is taken by df
+    command = (
+        f'd={results_dir}; while [ ! -e "$d" ]; do d=$(dirname "$d"); done; '
+        f'df -Pk "$d" | tail -n 1'
+    )
+    def describe(result):
+        try:
+            free = int(result.stdout.split()[3]) // 1024
+        except (IndexError, ValueError):
+            return CheckResult('rcv', 'disk space', False, f'df failed, stderr: {result.stderr.strip()}')
+        return CheckResult(
+            'rcv',
+            'disk space',
+            free >= MIN_FREE_SPACE,
+            f'{free} MB free in {results_dir}'
+        )
+    return run_remote_check(global_config, 'disk space', command, describe)
+
+
+def run_checks(
+    global_config,
+    rcv: str,
+    run_tshark: bool,
+    results_dir: pathlib.Path,
+    ports: typing.List[int]
+):
+    """
+    Checks all the hosts involved in a test concurrently: SSH reachability
+    of a receiver side, presence of srt-test-messaging on both sides, free
+    ports on a receiver side, free disk space for results and, if tshark
+    is run, that it can capture on the sender interface.
+
+    Returns:
+        A list of `CheckResult`.
+    """
+    checks = [
+        (check_local_binary, global_config.snd_path_to_srt),
+        (check_local_disk_space, results_dir),
+    ]
+    if run_tshark:
+        checks.append((check_tshark, global_config.snd_tshark_iface))
+    if rcv == 'remotely':
+        checks += [
+            (check_ssh, global_config),
+            (check_remote_binary, global_config),
+            (check_remote_ports, global_config, ports),
+            (check_remote_disk_space, global_config, results_dir),
+        ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(*check) for check in checks]
+        return [future.result() for future in futures]
+
+
+def check_hosts(
+    global_config,
+    rcv: str,
+    run_tshark: bool,
+    results_dir: pathlib.Path,
+    ports: typing.List[int]
+):
+    """
+    Runs the pre-flight checks and logs a combined report.
+
+    Raises:
+        PreflightCheckFailed
+    """
+    logger.info('Running pre-flight checks')
+    results = run_checks(global_config, rcv, run_tshark, results_dir, ports)
+    for result in results:
+        logger.info(
+            f'{"OK  " if result.passed else "FAIL"} {result.side} '
+            f'{result.name}: {result.details}'
+        )
+    failed = [result for result in results if not result.passed]
+    if failed:
+        raise PreflightCheckFailed(
+            '; '.join(f'{result.side} {result.name}: {result.details}' for result in failed)
+        )
+    logger.info('Pre-flight checks passed')
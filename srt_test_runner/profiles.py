@@ -0,0 +1,442 @@
+import configparser
+import csv
+import json
+import logging
+import pathlib
+import signal
+import subprocess
+import sys
+import time
+import typing
+
+import attr
+import click
+
+from srt_test_runner import stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Sections of traffic profiles are named [profile:NAME]
+PROFILE_SECTION_PREFIX = 'profile:'
+PROFILE_TYPES = ['cbr', 'gop', 'onoff', 'trace']
+# Constant bitrate profile available without a section
+CBR = 'cbr'
+# Sender option with the segments of a profile. It is consumed by
+# the script and never passed to srt-test-messaging, see `sender_args`
+SEGMENTS_OPTION = '-segments'
+# Each segment is streamed by its own srt-test-messaging run over its
+# own SRT connection (the application has no way to change the bitrate
+# of a connection), so shorter segments would be dominated by
+# the connection setup
+MIN_SEGMENT = 1.0
+# Maximum factor the bitrate of a segment is raised by to make up for
+# the connection overhead, see `stream_segments`
+MAX_RATE_RAISE = 1.25
+DEFAULT_MSG_SIZE = 1456
+
+
+@attr.s
+class TrafficProfile:
+    """
+    Traffic profile of a live mode sender: how the bitrate varies over
+    time around the average bitrate of an experiment.
+    """
+    name: str = attr.ib()
+    # One of PROFILE_TYPES
+    type: str = attr.ib(default=CBR)
+    # 'gop': GOP duration (s), duration (s) of the I-frame burst and
+    # the share of the GOP bytes sent within the burst
+    gop: float = attr.ib(default=4)
+    i_duration: float = attr.ib(default=1)
+    i_frame_ratio: float = attr.ib(default=0.4)
+    # 'onoff': durations (s) of streaming and silence
+    on: float = attr.ib(default=2)
+    off: float = attr.ib(default=2)
+    # 'trace': .csv file with rows "time (s), bitrate (bps)", the bitrate
+    # applies from that time till the next row. The trace is scaled to
+    # the average bitrate and looped
+    trace_filepath: typing.Optional[str] = attr.ib(default=None)
+
+    def validate(self):
+        if self.type not in PROFILE_TYPES:
+            raise ValueError(f'profile {self.name}: type {self.type}, expected one of {PROFILE_TYPES}')
+        if self.type == 'gop':
+            if not MIN_SEGMENT <= self.i_duration <= self.gop - MIN_SEGMENT:
+                raise ValueError(
+                    f'profile {self.name}: i_duration {self.i_duration}, expected '
+                    f'from {MIN_SEGMENT} to gop - {MIN_SEGMENT} ({self.gop - MIN_SEGMENT})'
+                )
+            if not 0 < self.i_frame_ratio < 1:
+                raise ValueError(f'profile {self.name}: i_frame_ratio {self.i_frame_ratio}, expected (0, 1)')
+        if self.type == 'onoff' and (self.on < MIN_SEGMENT or self.off < MIN_SEGMENT):
+            raise ValueError(f'profile {self.name}: on and off are expected to be at least {MIN_SEGMENT} s')
+        if self.type == 'trace' and not self.trace_filepath:
+            raise ValueError(f'profile {self.name}: trace_filepath is not specified')
+
+    def pattern(self, average_bitrate: int):
+        """
+        Returns:
+            One period of the profile as a list of segments (duration (s),
+            bitrate (bps)) with `average_bitrate` on average.
+        """
+        if self.type == 'gop':
+            gop_bits = average_bitrate * self.gop
+            return [
+                (self.i_duration, self.i_frame_ratio * gop_bits / self.i_duration),
+                (self.gop - self.i_duration, (1 - self.i_frame_ratio) * gop_bits / (self.gop - self.i_duration)),
+            ]
+        if self.type == 'onoff':
+            return [
+                (self.on, average_bitrate * (self.on + self.off) / self.on),
+                (self.off, 0),
+            ]
+        if self.type == 'trace':
+            trace = read_trace(pathlib.Path(self.trace_filepath))
+            trace_average = sum(d * b for d, b in trace) / sum(d for d, _ in trace)
+            return [(d, b * average_bitrate / trace_average) for d, b in trace]
+        return [(1, average_bitrate)]
+
+    def segments(self, average_bitrate: int, time_to_stream: float):
+        """
+        Returns:
+            A list of segments (duration (s), bitrate (bps)) covering
+            `time_to_stream` seconds: the pattern repeated and cut at
+            the end, adjacent segments with the same bitrate and segments
+            shorter than `MIN_SEGMENT` merged. If the pattern has been cut,
+            bitrates are rescaled, so that the average over
+            `time_to_stream` is still `average_bitrate`.
+        """
+        if self.type == CBR:
+            return [(float(time_to_stream), int(average_bitrate))]
+        pattern = self.pattern(average_bitrate)
+        segments = []
+        elapsed = 0
+        while elapsed < time_to_stream:
+            for duration, bitrate in pattern:
+                duration = min(duration, time_to_stream - elapsed)
+                if duration <= 0:
+                    break
+                segments.append((duration, bitrate))
+                elapsed += duration
+        bits = sum(duration * bitrate for duration, bitrate in segments)
+        scale = average_bitrate * time_to_stream / bits if bits > 0 else 1
+        return merge_segments([
+            (duration, int(round(bitrate * scale)))
+            for duration, bitrate in segments
+        ])
+
+
+def merge_segments(segments: typing.List[typing.Tuple[float, int]]):
+    merged = []
+    for duration, bitrate in segments:
+        if merged and merged[-1][1] == bitrate:
+            merged[-1] = (merged[-1][0] + duration, bitrate)
+        elif merged and duration < MIN_SEGMENT:
+            # E.g., the pattern cut at the end of streaming, the average
+            # bitrate of the previous segment is kept
+            previous_duration, previous_bitrate = merged[-1]
+            merged[-1] = (
+                previous_duration + duration,
+                int((previous_duration * previous_bitrate + duration * bitrate) / (previous_duration + duration))
+            )
+        else:
+            merged.append((duration, bitrate))
+    return merged
+
+
+def read_trace(filepath: pathlib.Path):
+    """
+    Returns:
+        Segments (duration (s), bitrate (bps)) of a trace .csv file with
+        rows "time (s), bitrate (bps)" sorted by time. The last row ends
+        the trace.
+    """
+    points = []
+    with filepath.open('r', newline='') as fp:
+        for row in csv.reader(fp):
+            try:
+                points.append((float(row[0]), float(row[1])))
+            except (IndexError, ValueError):
+                # Header or empty line
+                continue
+    points.sort()
+    trace = [
+        (next_time - point_time, bitrate)
+        for (point_time, bitrate), (next_time, _) in zip(points, points[1:])
+        if next_time > point_time
+    ]
+    if not trace or sum(d * b for d, b in trace) <= 0:
+        raise ValueError(f'{filepath}: at least two rows with positive bitrate are expected')
+    return trace
+
+
+def read_profiles(parsed_config: configparser.ConfigParser, names: typing.List[str]):
+    """
+    Reads the profiles `names` from [profile:NAME] sections. 'cbr' is
+    available without a section.
+
+    Returns:
+        A list of `TrafficProfile`.
+    """
+    profiles = []
+    for name in names:
+        section_name = f'{PROFILE_SECTION_PREFIX}{name}'
+        if not parsed_config.has_section(section_name):
+            if name != CBR:
+                raise ValueError(f'profile {name}: section [{section_name}] is not found')
+            profiles.append(TrafficProfile(CBR))
+            continue
+        section = parsed_config[section_name]
+        default = TrafficProfile(name)
+        profile = TrafficProfile(
+            name,
+            section.get('type', default.type).strip(),
+            section.getfloat('gop', default.gop),
+            section.getfloat('i_duration', default.i_duration),
+            section.getfloat('i_frame_ratio', default.i_frame_ratio),
+            section.getfloat('on', default.on),
+            section.getfloat('off', default.off),
+            section.get('trace_filepath', default.trace_filepath)
+        )
+        profile.validate()
+        profiles.append(profile)
+    return profiles
+
+
+def format_segments(segments: typing.List[typing.Tuple[float, int]]):
+    return ','.join(f'{duration:g}:{bitrate}' for duration, bitrate in segments)
+
+
+def parse_segments(value: str):
+    segments = []
+    for segment in value.split(','):
+        duration, bitrate = segment.split(':')
+        segments.append((float(duration), int(bitrate)))
+    return segments
+
+
+def sender_args(args: typing.List[str]):
+    """
+    Returns:
+        Args of srt-test-messaging sender as is, or if `SEGMENTS_OPTION`
+        is among them, args to stream the segments one after another by
+        this script (see `stream_segments`).
+    """
+    args = [str(arg) for arg in args]
+    if SEGMENTS_OPTION not in args:
+        return args
+    i = args.index(SEGMENTS_OPTION)
+    segments = args[i + 1]
+    return [
+        sys.executable,
+        '-m', __name__,
+        segments,
+        *args[:i],
+        *args[i + 2:]
+    ]
+
+
+def replace_option(args: typing.List[str], option: str, value: str):
+    args = list(args)
+    if option in args:
+        args[args.index(option) + 1] = value
+    else:
+        args += [option, value]
+    return args
+
+
+def option_value(args: typing.List[str], option: str):
+    if option in args:
+        return args[args.index(option) + 1]
+    return None
+
+
+def append_stats(segment_filepath: pathlib.Path, filepath: pathlib.Path):
+    """
+    Appends SRT statistics of a segment to the statistics of the sender,
+    the header is written once. Rows are placed in time by `Timepoint`
+    column, `Time` starts anew with each segment.
+    """
+    if not segment_filepath.exists():
+        return
+    with segment_filepath.open('r', encoding='utf-8', newline='') as fp:
+        lines = fp.readlines()
+    segment_filepath.unlink()
+    if filepath.exists() and filepath.stat().st_size > 0:
+        lines = lines[1:]
+    with filepath.open('a', encoding='utf-8', newline='') as fp:
+        fp.writelines(lines)
+
+
+def stream_segments(segments: typing.List[typing.Tuple[float, int]], args: typing.List[str]):
+    """
+    Streams segments (duration (s), bitrate (bps)) one after another by
+    srt-test-messaging `args` with `-bitrate` and `-repeat` set for each
+    of them. Segments with zero bitrate are silence.
+
+    Each segment is a new srt-test-messaging run and SRT connection, so it
+    takes longer than sending its messages: starting the application,
+    the handshake and closing. This overhead is estimated as the minimum
+    over the segments streamed so far of the run time beyond the time of
+    sending, and the messages of the next segment are sent at a bitrate
+    raised to fit in the segment duration minus the overhead. The amount
+    of data of each segment is kept, so that the average bitrate is.
+    A segment is started at its scheduled time, or right after
+    the previous one if that has taken longer, so that only the lag
+    beyond the overhead (e.g., the link has not carried a burst) shows up
+    as the extra time of the sender.
+
+    Returns:
+        Return code: 0 if all the segments have been streamed.
+    """
+    msg_size = int(option_value(args, '-msgsize') or DEFAULT_MSG_SIZE)
+    statsfile = option_value(args, '-statsfile')
+    process = None
+    stopped = []
+
+    def stop(signum, frame):
+        stopped.append(signum)
+        if process is not None and process.poll() is None:
+            process.send_signal(signum)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    overhead = None
+    total_overhead = 0
+    connections = 0
+    scheduled = time.monotonic()
+    for duration, bitrate in segments:
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        scheduled += duration
+        if stopped:
+            return 1
+        if bitrate == 0:
+            continue
+        repeat = max(1, int(duration * bitrate // (msg_size * 8)))
+        sending_time = max(duration - (overhead or 0), duration / MAX_RATE_RAISE)
+        segment_bitrate = int(repeat * msg_size * 8 / sending_time)
+        segment_args = replace_option(args, '-bitrate', str(segment_bitrate))
+        segment_args = replace_option(segment_args, '-repeat', str(repeat))
+        if statsfile is not None:
+            segment_args = replace_option(segment_args, '-statsfile', f'{statsfile}.segment')
+        started = time.monotonic()
+        process = subprocess.Popen(segment_args)
+        returncode = process.wait()
+        segment_overhead = max(0, time.monotonic() - started - repeat * msg_size * 8 / segment_bitrate)
+        overhead = segment_overhead if overhead is None else min(overhead, segment_overhead)
+        total_overhead += segment_overhead
+        connections += 1
+        if statsfile is not None:
+            append_stats(pathlib.Path(f'{statsfile}.segment'), pathlib.Path(statsfile))
+        if returncode != 0 or stopped:
+            return returncode or 1
+    logger.info(
+        f'Segments streamed: {connections} connections, overhead '
+        f'{total_overhead:.2f} s in total, {overhead or 0:.2f} s per connection'
+    )
+    return 0
+
+
+@attr.s
+class ProfilePoint:
+    description: str = attr.ib()
+    profile: str = attr.ib()
+    # Average bitrate (bps)
+    bitrate: int = attr.ib()
+    # Extra time (s) spent on streaming
+    extra_time: float = attr.ib()
+    # Median sending rate (Mbps) of the first sender
+    send_rate: typing.Optional[float] = attr.ib()
+    # Packets reported lost to the first sender / packets sent
+    loss: typing.Optional[float] = attr.ib()
+    # p99 RTT and sender buffer delay (ms) if latency has been collected
+    rtt_p99: typing.Optional[float] = attr.ib()
+    snd_buffer_p99: typing.Optional[float] = attr.ib()
+
+
+def loss_ratio(filepath: pathlib.Path):
+    """
+    Returns:
+        Packets reported lost / packets sent from SRT statistics of
+        a sender (interval values), None if nothing has been sent.
+    """
+    if not filepath.exists():
+        return None
+    columns = stats.read_stats(filepath)
+    sent = sum(columns.get(stats.PKT_SENT, []))
+    if sent == 0:
+        return None
+    return sum(columns.get(stats.PKT_SND_LOSS, [])) / sent
+
+
+def build_report(exper_results: typing.List[typing.Tuple[str, typing.Any]]):
+    """
+    Builds the report of loss and latency per traffic profile at each
+    average bitrate from tuples (profile name, `perform_test.ExperimentResult`).
+
+    Returns:
+        A list of `ProfilePoint` sorted by profile and bitrate.
+    """
+    points = []
+    for profile, result in exper_results:
+        rtt = result.latencies.get('rtt')
+        snd_buffer = result.latencies.get('snd_buffer')
+        points.append(ProfilePoint(
+            result.description,
+            profile,
+            result.bitrate,
+            result.extra_time,
+            result.send_rate,
+            result.snd_loss,
+            rtt.p99 if rtt is not None else None,
+            snd_buffer.p99 if snd_buffer is not None else None
+        ))
+    return sorted(points, key=lambda point: (point.profile, point.bitrate))
+
+
+def save_report(filepath: pathlib.Path, points: typing.List[ProfilePoint]):
+    with filepath.open('w', encoding='utf-8') as fp:
+        json.dump([attr.asdict(point) for point in points], fp, indent=4)
+
+
+def report(filepath: pathlib.Path, exper_results: typing.List[typing.Tuple[str, typing.Any]]):
+    """
+    Builds the report from tuples (profile name,
+    `perform_test.ExperimentResult`), see `build_report`, saves it into
+    `filepath` and logs it. Nothing is saved if there are no results.
+    """
+    if not exper_results:
+        return
+    points = build_report(exper_results)
+    save_report(filepath, points)
+    for point in points:
+        logger.info(
+            f'Profile {point.profile}, average {point.bitrate} bps: extra '
+            f'time {point.extra_time} s, send rate {point.send_rate} Mbps, '
+            f'loss {point.loss}, RTT p99 '
+            f'{point.rtt_p99} ms, sender buffer p99 {point.snd_buffer_p99} ms'
+        )
+
+
+@click.command(context_settings={'ignore_unknown_options': True})
+@click.argument('segments')
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def main(segments: str, args: typing.Tuple[str]):
+    """
+    Streams SEGMENTS ("duration:bitrate,...") by srt-test-messaging
+    sender ARGS, see `stream_segments`.
+    """
+    sys.exit(stream_segments(parse_segments(segments), list(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+import configparser
+import json
+import logging
+import os
+import pathlib
+import select
+import subprocess
+import threading
+import time
+import typing
+
+import attr
+
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# A remote command is prefixed with "echo PID_MARKER $$; exec", so that
+# the shell started by SSH reports its pid and then replaces itself with
+# the application. With "-t" option the shell is a session leader of
+# the pseudo-terminal, so its pid is the process group of the application
+PID_MARKER = 'srt-test-runner-pid'
+# Time (s) after the pid has been reported to check that the application
+# has not terminated because of an error (wrong args, busy port, etc.)
+START_CHECK_DELAY = 1
+# Remote processes started and not yet reaped, one file per process, so
+# that several tests can be run from one directory at the same time
+REGISTRY_DIR = pathlib.Path('_remote_processes')
+REAP_TIMEOUT = shared.SSH_CONNECTION_TIMEOUT + 10
+
+
+@attr.s
+class RemoteProcess:
+    name: str = attr.ib()
+    ssh_username: str = attr.ib()
+    ssh_host: str = attr.ib()
+    # Pid of the application on a remote machine, also its process group
+    pid: int = attr.ib()
+    # Pid of the local script which has started the process
+    owner_pid: int = attr.ib()
+    # Unix time of the start
+    started: float = attr.ib()
+
+
+class RemoteProcessRegistry:
+    """
+    Registry of the processes started on remote machines. Entries are
+    kept on disk until the processes are reaped, so that the processes
+    left by a script which has crashed or been killed can be found and
+    killed by the next run.
+    """
+
+    def __init__(self, registry_dir: pathlib.Path=REGISTRY_DIR):
+        self.registry_dir = registry_dir
+        self.lock = threading.Lock()
+
+    def _filepath(self, process: RemoteProcess):
+        return self.registry_dir / f'{process.ssh_host}-{process.pid}.json'
+
+    def register(self, process: RemoteProcess):
+        with self.lock:
+            self.registry_dir.mkdir(parents=True, exist_ok=True)
+            with self._filepath(process).open('w', encoding='utf-8') as fp:
+                json.dump(attr.asdict(process), fp, indent=4)
+
+    def unregister(self, process: RemoteProcess):
+        with self.lock:
+            try:
+                self._filepath(process).unlink()
+            except FileNotFoundError:
+                pass
+
+    def entries(self):
+        if not self.registry_dir.is_dir():
+            return []
+        processes = []
+        for filepath in sorted(self.registry_dir.glob('*.json')):
+            try:
+                with filepath.open('r', encoding='utf-8') as fp:
+                    processes.append(RemoteProcess(**json.load(fp)))
+            except (OSError, ValueError, TypeError):
+                # Being written or removed by another script
+                continue
+        return processes
+
+    def owned(self):
+        """
+        Returns:
+            A list of `RemoteProcess` started by this script.
+        """
+        return [
+            process for process in self.entries()
+            if process.owner_pid == os.getpid()
+        ]
+
+    def orphans(self):
+        """
+        Returns:
+            A list of `RemoteProcess` started by scripts which are not
+            running anymore.
+        """
+        orphans = []
+        for process in self.entries():
+            try:
+                os.kill(process.owner_pid, 0)
+            except ProcessLookupError:
+                orphans.append(process)
+            except PermissionError:
+                # Pid has been reused by a process of another user
+                orphans.append(process)
+        return orphans
+
+
+REGISTRY = RemoteProcessRegistry()
+
+
+def read_pid(process: subprocess.Popen, timeout: float):
+    """
+    Reads the output of an SSH process until the line with `PID_MARKER`.
+
+    Returns:
+        The pid reported or None if the process has terminated or
+        the timeout has expired before.
+    """
+    fd = process.stdout.fileno()
+    deadline = time.monotonic() + timeout
+    output = b''
+    while True:
+        for line in output.splitlines():
+            words = line.decode('utf-8', 'replace').split()
+            if len(words) == 2 and words[0] == PID_MARKER and words[1].isdigit():
+                return int(words[1])
+        ready, _, _ = select.select([fd], [], [], max(0, deadline - time.monotonic()))
+        if not ready:
+            return None
+        chunk = os.read(fd, 1024)
+        if not chunk:
+            return None
+        output += chunk
+
+
+def start_process(
+    name: str,
+    ssh_username: str,
+    ssh_host: str,
+    command_args: typing.List[str],
+    registry: RemoteProcessRegistry=REGISTRY
+):
+    """
+    Starts an application on a remote machine via SSH and registers its
+    pid. The start is confirmed as soon as the pid has been reported and
+    the application is still running `START_CHECK_DELAY` seconds later,
+    instead of waiting for the SSH connection timeout.
+
+    Returns:
+        A tuple of (name, process) where process is the local SSH process.
+
+    Raises:
+        shared.ProcessHasNotBeenCreated
+        shared.ProcessHasNotBeenStartedSuccessfully
+    """
+    args = []
+    args += shared.SSH_COMMON_ARGS
+    args += [f'{ssh_username}@{ssh_host}']
+    args += ['echo', PID_MARKER, '$$', ';', 'exec']
+    args += command_args
+    logger.debug(f'Starting process: {name}')
+    try:
+        process = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except OSError as e:
+        raise shared.ProcessHasNotBeenCreated(f'{name}. Error: {e}')
+
+    pid = read_pid(process, shared.SSH_CONNECTION_TIMEOUT + 1)
+    if pid is not None:
+        registry.register(RemoteProcess(
+            name,
+            ssh_username,
+            ssh_host,
+            pid,
+            os.getpid(),
+            time.time()
+        ))
+        time.sleep(START_CHECK_DELAY)
+    else:
+        # SSH has exited or the connection has timed out
+        try:
+            process.wait(START_CHECK_DELAY)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    is_running, returncode = shared.process_is_running(process)
+    if not is_running:
+        raise shared.ProcessHasNotBeenStartedSuccessfully(
+            f'{name}, remote pid {pid}, returncode {returncode}, '
+            f'stderr: {process.stderr.readlines()}'
+        )
+    logger.debug(f'Started successfully: {name}, remote pid {pid}')
+    return (name, process)
+
+
+def reap(
+    processes: typing.List[RemoteProcess],
+    registry: RemoteProcessRegistry=REGISTRY
+):
+    """
+    Verifies that the remote processes have terminated and kills those
+    which are still running (e.g., when the SSH session has exited while
+    the application has not, see `shared.cleanup_process`). A pid is
+    killed only if it is still srt-test-messaging, so that a reused pid
+    is not. Reaped processes are removed from the registry.
+
+    Returns:
+        A list of `RemoteProcess` which have been found running and killed.
+    """
+    hosts = {}
+    for process in processes:
+        hosts.setdefault((process.ssh_username, process.ssh_host), []).append(process)
+
+    reaped = []
+    for (ssh_username, ssh_host), host_processes in hosts.items():
+        pids = ' '.join(str(process.pid) for process in host_processes)
+        # The whole process group is signalled, then killed if still alive
+        command = (
+            f'for p in {pids}; do '
+            f'ps -o args= -p $p | grep -q srt-test-messaging || continue; '
+            f'echo $p; kill -s INT -- -$p $p 2>/dev/null; done; '
+            f'sleep 1; '
+            f'for p in {pids}; do '
+            f'ps -o args= -p $p | grep -q srt-test-messaging || continue; '
+            f'kill -s KILL -- -$p $p 2>/dev/null; done; true'
+        )
+        try:
+            result = shared.run_via_ssh(ssh_username, ssh_host, command, REAP_TIMEOUT)
+        except subprocess.TimeoutExpired as error:
+            logger.info(f'Remote processes on {ssh_host} have not been reaped: {error}')
+            continue
+        if result.returncode != 0:
+            # The host may be down, entries are kept for the next run
+            logger.info(
+                f'Remote processes on {ssh_host} have not been reaped, '
+                f'returncode {result.returncode}, stderr: {result.stderr}'
+            )
+            continue
+
+        killed = {int(word) for word in result.stdout.split() if word.isdigit()}
+        for process in host_processes:
+            if process.pid in killed:
+                logger.info(
+                    f'Reaped {process.name} left running on {ssh_host}, '
+                    f'pid {process.pid}\r'
+                )
+                reaped.append(process)
+            registry.unregister(process)
+    return reaped
+
+
+@attr.s
+class PortRotationConfig:
+    """
+    Range of ports to rotate receivers over, so that an experiment never
+    listens on the port of the previous one. The section is optional,
+    `dst_port` is used for all the experiments if it is not specified.
+    """
+    port_min: int = attr.ib()
+    port_max: int = attr.ib()
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        """
+        Returns:
+            `PortRotationConfig` or None if there is no `port-rotation`
+            section in config file.
+        """
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('port-rotation'):
+            return None
+        section = parsed_config['port-rotation']
+        config = cls(
+            section.getint('port_min'),
+            section.getint('port_max')
+        )
+        if config.port_min > config.port_max:
+            raise ValueError(
+                f'port-rotation: port_min {config.port_min} is greater '
+                f'than port_max {config.port_max}'
+            )
+        return config
+
+    def ports(self):
+        return list(range(self.port_min, self.port_max + 1))
+
+
+class PortRotation:
+    """
+    Hands out consecutive blocks of ports from the range, wrapping
+    around at the end.
+    """
+
+    def __init__(self, config: PortRotationConfig):
+        self.config = config
+        self.next_port = config.port_min
+
+    def next(self, width: int=1):
+        """
+        Returns:
+            The first port of a block of `width` ports.
+        """
+        if self.next_port + width - 1 > self.config.port_max:
+            self.next_port = self.config.port_min
+        port = self.next_port
+        self.next_port += width
+        return port
@@ -0,0 +1,218 @@
+import configparser
+import json
+import math
+import pathlib
+import statistics
+import typing
+
+import attr
+
+
+# Two-sided critical values of Student's t-distribution for degrees of
+# freedom 1..30 by confidence level. The normal distribution is used
+# for more degrees of freedom
+T_CRITICAL = {
+    0.90: [
+        6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+        1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+        1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697,
+    ],
+    0.95: [
+        12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+    ],
+    0.99: [
+        63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+        3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+        2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750,
+    ],
+}
+Z_CRITICAL = {
+    0.90: 1.645,
+    0.95: 1.960,
+    0.99: 2.576,
+}
+METRICS = ['extra_time', 'goodput']
+
+
+def t_critical(df: int, confidence: float):
+    if confidence not in T_CRITICAL:
+        raise ValueError(
+            f'confidence: {confidence}, expected one of {list(T_CRITICAL)}'
+        )
+    if df <= len(T_CRITICAL[confidence]):
+        return T_CRITICAL[confidence][df - 1]
+    return Z_CRITICAL[confidence]
+
+
+def confidence_interval(values: typing.List[float], confidence: float):
+    """
+    Returns:
+        A tuple (low, high) of the confidence interval of the mean
+        of `values`, or None if there are less than 2 values.
+    """
+    if len(values) < 2:
+        return None
+    mean = statistics.mean(values)
+    half_width = (
+        t_critical(len(values) - 1, confidence)
+        * statistics.stdev(values) / math.sqrt(len(values))
+    )
+    return (mean - half_width, mean + half_width)
+
+
+def goodput(time_to_stream: int, extra_time: float):
+    """
+    Returns:
+        Goodput in percent of the experiment bitrate: the data generated
+        for `time_to_stream` seconds has been delivered in
+        `time_to_stream` + `extra_time` seconds.
+    """
+    return 100 * time_to_stream / (time_to_stream + extra_time)
+
+
+@attr.s
+class RepetitionConfig:
+    """
+    Repetition config. The section is optional, each experiment is run
+    once if it is not specified within config file.
+    """
+    # Metric the stopping rule is applied to, one of METRICS
+    metric: str = attr.ib(default='extra_time')
+    min_runs: int = attr.ib(default=1)
+    max_runs: int = attr.ib(default=1)
+    confidence: float = attr.ib(default=0.95)
+    # Target width of the confidence interval: in seconds for
+    # 'extra_time', in percent of the bitrate for 'goodput'
+    ci_width: float = attr.ib(default=2)
+    # An experiment stops after one run if the metric is at least
+    # that far from the saturation threshold (the same units)
+    clear_distance: float = attr.ib(default=4)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        if not parsed_config.has_section('repetition'):
+            return cls()
+        section = parsed_config['repetition']
+        default = cls()
+        metric = section.get('metric', default.metric).strip()
+        if metric not in METRICS:
+            raise ValueError(f'metric: {metric}, expected one of {METRICS}')
+        config = cls(
+            metric,
+            section.getint('min_runs', default.min_runs),
+            section.getint('max_runs', default.max_runs),
+            section.getfloat('confidence', default.confidence),
+            section.getfloat('ci_width', default.ci_width),
+            section.getfloat('clear_distance', default.clear_distance)
+        )
+        # Validate confidence level
+        t_critical(1, config.confidence)
+        return config
+
+
+@attr.s
+class RepetitionSummary:
+    """
+    Summary of the runs of one experiment. It is saved into
+    `{description}-repetition.json` file in the results directory.
+    """
+    description: str = attr.ib()
+    metric: str = attr.ib()
+    # Metric values and extra times (s) by run
+    values: typing.List[float] = attr.ib()
+    extra_times: typing.List[int] = attr.ib()
+    median: float = attr.ib()
+    median_extra_time: float = attr.ib()
+    ci_low: typing.Optional[float] = attr.ib()
+    ci_high: typing.Optional[float] = attr.ib()
+    # Saturation threshold of the metric
+    threshold: float = attr.ib()
+    # 'below' or 'above' saturation threshold, according to the median
+    verdict: str = attr.ib()
+    # Why the runs have been stopped: 'clear', 'converged', 'max_runs'
+    stop_reason: typing.Optional[str] = attr.ib()
+
+    def save(self, results_dir: pathlib.Path):
+        filepath = results_dir / f'{self.description}-repetition.json'
+        with filepath.open('w', encoding='utf-8') as fp:
+            json.dump(attr.asdict(self), fp, indent=4)
+
+
+class RepetitionController:
+    """
+    Decides whether an experiment should be run once again: the runs
+    continue until the confidence interval of the metric is narrower than
+    `ci_width` or does not contain the saturation threshold, or
+    `max_runs` is reached. The experiments clearly below or above
+    saturation stop after one run.
+    """
+
+    def __init__(
+        self,
+        config: RepetitionConfig,
+        time_to_stream: int,
+        extra_time_threshold: int
+    ):
+        self.config = config
+        self.time_to_stream = time_to_stream
+        if config.metric == 'goodput':
+            self.threshold = goodput(time_to_stream, extra_time_threshold)
+        else:
+            self.threshold = extra_time_threshold
+        self.values = []
+        self.extra_times = []
+        self.stop_reason = None
+
+    def add(self, extra_time: int):
+        self.extra_times.append(extra_time)
+        if self.config.metric == 'goodput':
+            self.values.append(goodput(self.time_to_stream, extra_time))
+        else:
+            self.values.append(extra_time)
+
+    def should_stop(self):
+        runs = len(self.values)
+        if runs >= self.config.max_runs:
+            self.stop_reason = 'max_runs'
+            return True
+        if runs < self.config.min_runs:
+            return False
+        if runs == 1:
+            if abs(self.values[0] - self.threshold) >= self.config.clear_distance:
+                self.stop_reason = 'clear'
+                return True
+            return False
+        low, high = confidence_interval(self.values, self.config.confidence)
+        if high < self.threshold or low >= self.threshold:
+            self.stop_reason = 'clear'
+            return True
+        if high - low <= self.config.ci_width:
+            self.stop_reason = 'converged'
+            return True
+        return False
+
+    def summary(self, description: str):
+        median = statistics.median(self.values)
+        ci = confidence_interval(self.values, self.config.confidence)
+        if self.config.metric == 'goodput':
+            above = median <= self.threshold
+        else:
+            above = median >= self.threshold
+        return RepetitionSummary(
+            description,
+            self.config.metric,
+            list(self.values),
+            list(self.extra_times),
+            median,
+            statistics.median(self.extra_times),
+            ci[0] if ci else None,
+            ci[1] if ci else None,
+            self.threshold,
+            'above' if above else 'below',
+            self.stop_reason
+        )
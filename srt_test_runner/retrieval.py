@@ -0,0 +1,319 @@
+import concurrent.futures
+import hashlib
+import logging
+import pathlib
+import queue
+import shlex
+import subprocess
+import threading
+import typing
+
+import attr
+
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Number of files transferred from a remote machine simultaneously
+PARALLEL_TRANSFERS = 4
+# Timeout (s) for commands listing and hashing files on a remote machine
+REMOTE_QUERY_TIMEOUT = 60
+
+
+class ArtefactsRetrievalFailed(Exception):
+    pass
+
+
+@attr.s
+class RemoteFile:
+    name: str = attr.ib()
+    size: int = attr.ib()
+
+
+def md5sum(filepath: pathlib.Path):
+    md5 = hashlib.md5()
+    with filepath.open('rb') as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def list_remote_files(
+    ssh_username: str,
+    ssh_host: str,
+    remote_dir: str,
+    prefix: str
+):
+    """
+    Lists files from `remote_dir` on a remote machine which names start
+    with `prefix`.
+
+    Returns:
+        A list of `RemoteFile`.
+
+    Raises:
+        ArtefactsRetrievalFailed
+    """
+    command = (
+        f'cd {shlex.quote(remote_dir)} && '
+        f'for f in {shlex.quote(prefix)}*; do '
+        '[ -f "$f" ] && echo "$(stat -c %s "$f") $f"; '
+        'done; true'
+    )
+    result = shared.run_via_ssh(
+        ssh_username,
+        ssh_host,
+        command,
+        REMOTE_QUERY_TIMEOUT
+    )
+    if result.returncode != 0:
+        raise ArtefactsRetrievalFailed(
+            f'Files have not been listed, returncode {result.returncode}, '
+            f'stderr: {result.stderr}'
+        )
+
+    files = []
+    for line in result.stdout.splitlines():
+        size, name = line.split(' ', 1)
+        files.append(RemoteFile(name, int(size)))
+    return files
+
+
+def hash_remote_files(
+    ssh_username: str,
+    ssh_host: str,
+    remote_dir: str,
+    names: typing.List[str]
+):
+    """
+    Returns:
+        A dictionary {filename: md5 hash} for files `names` from `remote_dir`
+        on a remote machine.
+
+    Raises:
+        ArtefactsRetrievalFailed
+    """
+    if not names:
+        return {}
+
+    command = (
+        f'cd {shlex.quote(remote_dir)} && '
+        f'md5sum {" ".join(shlex.quote(name) for name in names)}'
+    )
+    result = shared.run_via_ssh(
+        ssh_username,
+        ssh_host,
+        command,
+        REMOTE_QUERY_TIMEOUT
+    )
+    if result.returncode != 0:
+        raise ArtefactsRetrievalFailed(
+            f'Files have not been hashed, returncode {result.returncode}, '
+            f'stderr: {result.stderr}'
+        )
+
+    hashes = {}
+    for line in result.stdout.splitlines():
+        md5, name = line.split(maxsplit=1)
+        hashes[name] = md5
+    return hashes
+
+
+def download_file(
+    ssh_username: str,
+    ssh_host: str,
+    remote_filepath: str,
+    local_filepath: pathlib.Path
+):
+    """
+    Downloads one file from a remote machine via scp with compression
+    enabled. The file is first written under a temporary name, so
+    an interrupted transfer never looks like an already fetched file.
+
+    Raises:
+        ArtefactsRetrievalFailed
+    """
+    tmp_filepath = local_filepath.with_name(local_filepath.name + '.part')
+    args = [
+        'scp',
+        '-C',
+        '-q',
+        '-o', 'BatchMode=yes',
+        '-o', f'ConnectTimeout={shared.SSH_CONNECTION_TIMEOUT}',
+        f'{ssh_username}@{ssh_host}:{remote_filepath}',
+        str(tmp_filepath),
+    ]
+    result = subprocess.run(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    if result.returncode != 0:
+        if tmp_filepath.exists():
+            tmp_filepath.unlink()
+        raise ArtefactsRetrievalFailed(
+            f'{remote_filepath}, returncode {result.returncode}, '
+            f'stderr: {result.stderr}'
+        )
+    tmp_filepath.replace(local_filepath)
+
+
+def retrieve_artefacts(
+    ssh_username: str,
+    ssh_host: str,
+    remote_dir: str,
+    local_dir: pathlib.Path,
+    prefix: str,
+    parallel_transfers: int=PARALLEL_TRANSFERS
+):
+    """
+    Downloads all the files from `remote_dir` on a remote machine which
+    names start with `prefix` (experiment description) to `local_dir`.
+    Files which have already been fetched, i.e. a local file with the same
+    name, size and md5 hash exists, are skipped.
+
+    Returns:
+        A tuple of (downloaded, skipped) lists of filenames.
+
+    Raises:
+        ArtefactsRetrievalFailed
+    """
+    remote_files = list_remote_files(ssh_username, ssh_host, remote_dir, prefix)
+
+    # Only files of the same size are worth comparing hashes of
+    same_size = [
+        f.name for f in remote_files
+        if (local_dir / f.name).exists()
+        and (local_dir / f.name).stat().st_size == f.size
+    ]
+    remote_hashes = hash_remote_files(
+        ssh_username,
+        ssh_host,
+        remote_dir,
+        same_size
+    )
+    skipped = [
+        name for name in same_size
+        if remote_hashes.get(name) == md5sum(local_dir / name)
+    ]
+    to_download = [f.name for f in remote_files if f.name not in skipped]
+
+    errors = []
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=parallel_transfers
+    ) as executor:
+        future_downloads = {
+            executor.submit(
+                download_file,
+                ssh_username,
+                ssh_host,
+                f'{remote_dir}/{name}',
+                local_dir / name
+            ): name for name in to_download
+        }
+        for future in concurrent.futures.as_completed(future_downloads):
+            try:
+                future.result()
+            except ArtefactsRetrievalFailed as error:
+                errors.append(str(error))
+
+    if errors:
+        raise ArtefactsRetrievalFailed('; '.join(errors))
+
+    return (to_download, skipped)
+
+
+class ArtefactsRetriever:
+    """
+    Background worker which downloads experiments artefacts (SRT stats,
+    Wireshark dumps) from a remote machine while the next experiment
+    is running.
+
+    Usage:
+        retriever = ArtefactsRetriever(username, host, remote_dir, local_dir)
+        retriever.start()
+        # After each experiment
+        retriever.submit(exper_params.description)
+        # Before exiting
+        retriever.join()
+    """
+
+    def __init__(
+        self,
+        ssh_username: str,
+        ssh_host: str,
+        remote_dir: str,
+        local_dir: pathlib.Path,
+        parallel_transfers: int=PARALLEL_TRANSFERS
+    ):
+        self.ssh_username = ssh_username
+        self.ssh_host = ssh_host
+        self.remote_dir = remote_dir
+        self.local_dir = local_dir
+        self.parallel_transfers = parallel_transfers
+        self.failed = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._worker,
+            name='artefacts-retriever',
+            daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, description: str):
+        """ Schedules downloading of the artefacts of one experiment. """
+        self._queue.put(description)
+
+    def join(self):
+        """
+        Waits for all the scheduled downloads to finish and stops the worker.
+
+        Returns:
+            A list of descriptions of experiments which artefacts have not
+            been retrieved.
+        """
+        logger.info('Waiting for artefacts retrieval to finish\r')
+        self._queue.put(None)
+        self._thread.join()
+        logger.info('Artefacts retrieval has finished\r')
+        return self.failed
+
+    def _worker(self):
+        while True:
+            description = self._queue.get()
+            if description is None:
+                return
+
+            try:
+                downloaded, skipped = retrieve_artefacts(
+                    self.ssh_username,
+                    self.ssh_host,
+                    self.remote_dir,
+                    self.local_dir,
+                    description,
+                    self.parallel_transfers
+                )
+                logger.info(
+                    f'Artefacts retrieved: {description}, downloaded '
+                    f'{len(downloaded)}, skipped {len(skipped)}\r'
+                )
+            except (
+                ArtefactsRetrievalFailed,
+                subprocess.TimeoutExpired,
+                OSError
+            ) as error:
+                logger.info(
+                    f'Artefacts have not been retrieved: {description}. '
+                    f'Exception occured ({error.__class__.__name__}): {error}\r'
+                )
+                self.failed.append(description)
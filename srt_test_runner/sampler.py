@@ -0,0 +1,337 @@
+import json
+import logging
+import pathlib
+import struct
+import subprocess
+import threading
+import time
+import typing
+
+import attr
+
+from srt_test_runner import shared
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+PROC_FILES = [
+    '/proc/stat',
+    '/proc/net/dev',
+    '/proc/net/snmp',
+    '/proc/meminfo',
+]
+# Marker printed by a remote sampler before each snapshot of PROC_FILES
+SNAPSHOT_MARKER = '@@@'
+
+# Time series file format: MAGIC, header length (uint32), header (JSON with
+# column names), then fixed-size records of a timestamp (double) followed
+# by uint64 counters, one per column
+MAGIC = b'SRTHOST1'
+
+# Per-core CPU utilization (%) above which a host is considered
+# to be a bottleneck
+CPU_BUSY_THRESHOLD = 90
+# Per-core CPU time spent on softirq processing (%) above which a host
+# is considered to be a bottleneck
+SOFTIRQ_THRESHOLD = 50
+
+
+@attr.s
+class HostSummary:
+    """
+    Summary of host resources sampled during one experiment.
+    """
+    samples: int = attr.ib(default=0)
+    # Maximum per-core CPU utilization (%) between two samples
+    max_cpu_busy: float = attr.ib(default=0)
+    # Maximum per-core CPU time spent on softirq processing (%) between
+    # two samples
+    max_softirq: float = attr.ib(default=0)
+    # Increase of counters during the experiment
+    udp_rcvbuf_errors: int = attr.ib(default=0)
+    udp_sndbuf_errors: int = attr.ib(default=0)
+    nic_rx_drops: int = attr.ib(default=0)
+    nic_tx_drops: int = attr.ib(default=0)
+    # Minimum available memory (kB)
+    min_mem_available: typing.Optional[int] = attr.ib(default=None)
+
+    def is_host_bound(self):
+        return (
+            self.max_cpu_busy >= CPU_BUSY_THRESHOLD
+            or self.max_softirq >= SOFTIRQ_THRESHOLD
+            or self.udp_rcvbuf_errors > 0
+            or self.udp_sndbuf_errors > 0
+            or self.nic_rx_drops > 0
+            or self.nic_tx_drops > 0
+        )
+
+
+def parse_proc_snapshot(text: str):
+    """
+    Parses the concatenated content of PROC_FILES.
+
+    Returns:
+        A dictionary {column name: counter value}. CPU columns go first
+        in order of cores.
+    """
+    counters = {}
+    nic = [0] * 6
+    udp_header = None
+    in_net_dev = False
+
+    for line in text.splitlines():
+        if line.startswith('cpu') and line[3:4].isdigit():
+            fields = line.split()
+            values = [int(value) for value in fields[1:9]]
+            # user nice system idle iowait irq softirq steal
+            counters[f'{fields[0]}_total'] = sum(values)
+            counters[f'{fields[0]}_idle'] = values[3] + values[4]
+            counters[f'{fields[0]}_softirq'] = values[6]
+            continue
+
+        if line.startswith('Udp:'):
+            fields = line.split()[1:]
+            if udp_header is None:
+                udp_header = fields
+            else:
+                udp = dict(zip(udp_header, fields))
+                counters['udp_in_errors'] = int(udp.get('InErrors', 0))
+                counters['udp_rcvbuf_errors'] = int(udp.get('RcvbufErrors', 0))
+                counters['udp_sndbuf_errors'] = int(udp.get('SndbufErrors', 0))
+            continue
+
+        if line.startswith('MemTotal:'):
+            counters['mem_total'] = int(line.split()[1])
+            continue
+
+        if line.startswith('MemAvailable:'):
+            counters['mem_available'] = int(line.split()[1])
+            continue
+
+        # /proc/net/dev starts with two header lines, the second one
+        # begins with " face |"
+        if line.lstrip().startswith('face |'):
+            in_net_dev = True
+            continue
+
+        if in_net_dev:
+            # Interface lines contain 16 counters after the colon,
+            # the loopback interface is not interesting here
+            name, _, values = line.partition(':')
+            fields = values.split()
+            if len(fields) != 16:
+                in_net_dev = False
+                continue
+            if name.strip() != 'lo':
+                fields = [int(value) for value in fields]
+                # rx bytes, rx packets, rx drop, tx bytes, tx packets, tx drop
+                for i, j in enumerate((0, 1, 3, 8, 9, 11)):
+                    nic[i] += fields[j]
+
+    for i, name in enumerate((
+        'nic_rx_bytes', 'nic_rx_packets', 'nic_rx_drop',
+        'nic_tx_bytes', 'nic_tx_packets', 'nic_tx_drop',
+    )):
+        counters[name] = nic[i]
+
+    return counters
+
+
+def read_time_series(filepath: pathlib.Path):
+    """
+    Reads a time series file written by `HostSampler`.
+
+    Returns:
+        A tuple of (columns, rows) where columns is a list of column names
+        starting with 'timestamp' and rows is a list of tuples.
+    """
+    with filepath.open('rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'Not a host time series file: {filepath}')
+        header_len, = struct.unpack('<I', fp.read(4))
+        header = json.loads(fp.read(header_len).decode('utf-8'))
+        record = struct.Struct('<d' + 'Q' * len(header['columns']))
+        rows = [row for row in record.iter_unpack(fp.read())]
+    return (['timestamp'] + header['columns'], rows)
+
+
+class HostSampler:
+    """
+    Samples CPU per core, softirq, NIC counters, UDP drops and memory
+    of a host from /proc with a given interval, either on a local machine,
+    or on a remote machine via SSH. Samples are written into a compact
+    binary time series file, see `read_time_series`.
+
+    Usage:
+        sampler = HostSampler(filepath, 0.5)
+        sampler.start()
+        ...
+        summary = sampler.stop()
+    """
+
+    def __init__(
+        self,
+        filepath: pathlib.Path,
+        interval: float,
+        ssh_username: typing.Optional[str]=None,
+        ssh_host: typing.Optional[str]=None
+    ):
+        self.filepath = filepath
+        self.interval = interval
+        self.ssh_username = ssh_username
+        self.ssh_host = ssh_host
+        self.summary = HostSummary()
+        self._fp = None
+        self._record = None
+        self._columns = None
+        self._first = None
+        self._previous = None
+        self._process = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def via_ssh(self):
+        return self.ssh_host is not None
+
+    def start(self):
+        self._fp = self.filepath.open('wb')
+        if self.via_ssh:
+            command = (
+                f'while :; do echo {SNAPSHOT_MARKER}; '
+                f'cat {" ".join(PROC_FILES)}; '
+                f'sleep {self.interval}; done'
+            )
+            args = []
+            args += shared.SSH_QUERY_ARGS
+            args += [f'{self.ssh_username}@{self.ssh_host}', command]
+            self._process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                universal_newlines=True
+            )
+            target = self._sample_remotely
+        else:
+            target = self._sample_locally
+
+        self._thread = threading.Thread(
+            target=target,
+            name=f'host-sampler-{self.ssh_host or "local"}',
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling.
+
+        Returns:
+            `HostSummary` of the samples collected.
+        """
+        if self._fp is None or self._fp.closed:
+            return self.summary
+
+        self._stop.set()
+        if self._process is not None:
+            self._process.terminate()
+        self._thread.join()
+        if self._process is not None:
+            self._process.wait()
+        self._fp.close()
+        return self.summary
+
+    def _sample_locally(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            text = ''
+            try:
+                for filename in PROC_FILES:
+                    with open(filename, 'r') as fp:
+                        text += fp.read()
+            except OSError as error:
+                # E.g., there is no /proc on macOS
+                logger.info(
+                    f'Host resources can not be sampled locally. Exception '
+                    f'occured ({error.__class__.__name__}): {error}\r'
+                )
+                return
+            self._add(time.time(), parse_proc_snapshot(text))
+
+            # Sample on a fixed grid so that the interval does not drift
+            # by the time spent on reading and parsing
+            deadline += self.interval
+            self._stop.wait(max(0, deadline - time.monotonic()))
+
+    def _sample_remotely(self):
+        lines = []
+        for line in self._process.stdout:
+            if line.strip() == SNAPSHOT_MARKER:
+                if lines:
+                    self._add(time.time(), parse_proc_snapshot(''.join(lines)))
+                lines = []
+                continue
+            lines.append(line)
+
+    def _add(self, timestamp: float, counters: typing.Dict[str, int]):
+        if self._columns is None:
+            self._columns = list(counters.keys())
+            self._record = struct.Struct('<d' + 'Q' * len(self._columns))
+            header = json.dumps({
+                'host': self.ssh_host or 'localhost',
+                'interval': self.interval,
+                'columns': self._columns,
+            }).encode('utf-8')
+            self._fp.write(MAGIC)
+            self._fp.write(struct.pack('<I', len(header)))
+            self._fp.write(header)
+            self._first = counters
+
+        values = [counters.get(column, 0) for column in self._columns]
+        self._fp.write(self._record.pack(timestamp, *values))
+        self._update_summary(counters)
+        self._previous = counters
+
+    def _update_summary(self, counters: typing.Dict[str, int]):
+        summary = self.summary
+        summary.samples += 1
+
+        mem_available = counters.get('mem_available')
+        if mem_available is not None and (
+            summary.min_mem_available is None
+            or mem_available < summary.min_mem_available
+        ):
+            summary.min_mem_available = mem_available
+
+        first = self._first
+        summary.udp_rcvbuf_errors = counters.get('udp_rcvbuf_errors', 0) - first.get('udp_rcvbuf_errors', 0)
+        summary.udp_sndbuf_errors = counters.get('udp_sndbuf_errors', 0) - first.get('udp_sndbuf_errors', 0)
+        summary.nic_rx_drops = counters['nic_rx_drop'] - first['nic_rx_drop']
+        summary.nic_tx_drops = counters['nic_tx_drop'] - first['nic_tx_drop']
+
+        previous = self._previous
+        if previous is None:
+            return
+        for column in counters:
+            if not column.endswith('_total'):
+                continue
+            cpu = column[:-len('_total')]
+            total = counters[column] - previous.get(column, 0)
+            if total <= 0:
+                continue
+            idle = counters[f'{cpu}_idle'] - previous.get(f'{cpu}_idle', 0)
+            softirq = counters[f'{cpu}_softirq'] - previous.get(f'{cpu}_softirq', 0)
+            summary.max_cpu_busy = max(
+                summary.max_cpu_busy,
+                round(100 * (total - idle) / total, 1)
+            )
+            summary.max_softirq = max(
+                summary.max_softirq,
+                round(100 * softirq / total, 1)
+            )
@@ -0,0 +1,130 @@
+import logging
+import logging.handlers
+import math
+import time
+import typing
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Policies applied to the slots missed while an iteration was running
+# longer than the period: run the next iteration at the next slot of
+# the grid, or run one iteration per missed slot right away
+MISSED_SLOT_POLICIES = ['skip', 'catch-up']
+# Maximum number of missed slots run right away with 'catch-up' policy,
+# the older ones are skipped, e.g. after the machine has been suspended
+MAX_CATCH_UP_SLOTS = 3
+# A slot is considered to be missed if it has passed more than this
+# time (s) ago
+LATE_TOLERANCE = 1
+# Log file rotation settings for daemon mode
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+
+class FixedRateScheduler:
+    """
+    Fires iterations on a fixed wall-clock grid `start + k * period`,
+    so that the real period does not depend on the duration of an
+    iteration and does not drift over weeks of running.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        missed_slot_policy: str='skip',
+        start: typing.Optional[float]=None,
+        align: bool=False
+    ):
+        """
+        Attributes:
+            start:
+                Unix time of the first slot, the current time if None.
+            align:
+                Align the grid to multiples of `period` since the epoch,
+                e.g. to :00, :10, :20 minutes for 10 minutes period.
+        """
+        if period <= 0:
+            raise ValueError(f'period: {period}, expected a positive value')
+        if missed_slot_policy not in MISSED_SLOT_POLICIES:
+            raise ValueError(
+                f'missed_slot_policy: {missed_slot_policy}, expected one of '
+                f'{MISSED_SLOT_POLICIES}'
+            )
+        self.period = period
+        self.missed_slot_policy = missed_slot_policy
+        if start is None:
+            start = time.time()
+        if align:
+            start = math.ceil(start / period) * period
+        self.start = start
+        # Number of the next slot to fire
+        self.slot = 0
+        self.missed = 0
+
+    def slot_time(self, slot: int):
+        return self.start + slot * self.period
+
+    def next_slot(self, now: typing.Optional[float]=None):
+        """
+        Determines the next slot to fire according to the missed slot
+        policy.
+
+        Returns:
+            A tuple (slot number, slot time).
+        """
+        if now is None:
+            now = time.time()
+        # The earliest slot which has not passed yet
+        upcoming = max(
+            0,
+            math.ceil((now - LATE_TOLERANCE - self.start) / self.period)
+        )
+        if self.missed_slot_policy == 'skip':
+            first_to_run = upcoming
+        else:
+            first_to_run = max(self.slot, upcoming - MAX_CATCH_UP_SLOTS)
+        if first_to_run > self.slot:
+            self.missed += first_to_run - self.slot
+            logger.info(
+                f'Scheduler: {first_to_run - self.slot} slots missed, '
+                f'{self.missed} in total'
+            )
+            self.slot = first_to_run
+        return self.slot, self.slot_time(self.slot)
+
+    def wait(self, sleep: typing.Callable[[float], None]=time.sleep):
+        """
+        Sleeps until the next slot.
+
+        Returns:
+            Number of the slot fired.
+        """
+        slot, slot_time = self.next_slot()
+        delay = slot_time - time.time()
+        if delay > 0:
+            sleep(delay)
+        self.slot = slot + 1
+        return slot
+
+
+def setup_log_rotation(log_filepath: str):
+    """
+    Writes log messages of all the modules into `log_filepath` rotated
+    by size, so that a long-lived process does not fill the disk.
+    """
+    handler = logging.handlers.RotatingFileHandler(
+        log_filepath,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    handler.setFormatter(
+        logging.Formatter('%(asctime)-15s [%(levelname)s] %(message)s')
+    )
+    logging.getLogger().addHandler(handler)
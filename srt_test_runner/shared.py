@@ -1,6 +1,8 @@
 import enum
 import logging
+import os
 import pathlib
+import select
 import signal
 import subprocess
 import sys
@@ -32,8 +34,35 @@ SSH_COMMON_ARGS = [
     '-o', 'BatchMode=yes',
     '-o', f'ConnectTimeout={SSH_CONNECTION_TIMEOUT}',
 ]
+# NOTE: Commands which only query or copy something from a remote machine
+# (listing files, calculating checksums, etc.) are run without "-t" option
+# in order to get their output without b'\r\n' line endings
+SSH_QUERY_ARGS = [
+    'ssh',
+    '-o', 'BatchMode=yes',
+    '-o', f'ConnectTimeout={SSH_CONNECTION_TIMEOUT}',
+]
 DELIMETER = 1000000
 
+# Code run by sys.executable in front of each process started at a barrier
+# (see ProcessBarrier). It reports readiness, waits for the release byte,
+# reports the release time and then replaces itself with the actual
+# application, so the application pid is the pid of the wrapper.
+BARRIER_WRAPPER = '''
+import os, sys, time
+release_fd, report_fd = int(sys.argv[1]), int(sys.argv[2])
+os.write(report_fd, b'ready\\n')
+os.read(release_fd, 1)
+os.write(report_fd, b'%.9f\\n' % time.monotonic())
+os.close(release_fd)
+os.close(report_fd)
+os.execv(sys.argv[3], sys.argv[3:])
+'''
+# Timeout (s) to wait for all the processes to get to a barrier
+BARRIER_READY_TIMEOUT = 10
+# Delay (s) between all the processes are ready and the release
+BARRIER_RELEASE_DELAY = 0.1
+
 
 class AutoName(enum.Enum):
     def _generate_next_value_(name, start, count, last_values):
@@ -52,6 +81,9 @@ class ProcessHasNotBeenKilled(Exception):
 class ParallelSendersExecutionFailed(Exception):
     pass
 
+class ProcessesHaveNotReachedBarrier(Exception):
+    pass
+
 
 def process_is_running(process):
     """ 
@@ -68,10 +100,12 @@ def process_is_running(process):
         is_running = False
     return (is_running, returncode)
 
-def create_process(name, args, via_ssh: bool=False):
+def create_process(name, args, via_ssh: bool=False, placement=None):
     """ 
     name: name of the application being started
     args: process args
+    placement: placement.ProcessPlacement (CPU cores, scheduling priority)
+        to apply to the local process right after it has been created
 
     Raises:
         ProcessHasNotBeenCreated
@@ -102,6 +136,9 @@ def create_process(name, args, via_ssh: bool=False):
     except OSError as e:
         raise ProcessHasNotBeenCreated(f'{name}. Error: {e}')
 
+    if placement is not None:
+        placement.apply(process.pid)
+
     # Check that the process has started successfully and has not terminated
     # because of an error
     if via_ssh:
@@ -118,6 +155,117 @@ def create_process(name, args, via_ssh: bool=False):
     logger.debug(f'Started successfully: {name}')
     return process
 
+class ProcessBarrier:
+    """
+    Starts several processes held right before exec until all of them
+    are released at one monotonic deadline, and measures the actual
+    start time of each process. Not supported on Windows.
+
+    Usage:
+        barrier = ProcessBarrier()
+        for name, args in ...:
+            barrier.spawn(name, args)
+        start_times = barrier.release()
+    """
+
+    def __init__(self):
+        self.processes = []
+        self.deadline = None
+        self._release_fds = []
+        self._report_fds = []
+
+    def spawn(self, name, args, placement=None):
+        """
+        Creates a process held at the barrier.
+
+        Returns:
+            A tuple of (name, process).
+
+        Raises:
+            ProcessHasNotBeenCreated
+        """
+        release_read, release_write = os.pipe()
+        report_read, report_write = os.pipe()
+        try:
+            logger.debug(f'Starting process at a barrier: {name}')
+            process = subprocess.Popen(
+                [
+                    sys.executable, '-c', BARRIER_WRAPPER,
+                    str(release_read), str(report_write)
+                ] + [str(arg) for arg in args],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                pass_fds=(release_read, report_write),
+                bufsize=1
+            )
+        except OSError as e:
+            os.close(release_write)
+            os.close(report_read)
+            raise ProcessHasNotBeenCreated(f'{name}. Error: {e}')
+        finally:
+            os.close(release_read)
+            os.close(report_write)
+
+        if placement is not None:
+            placement.apply(process.pid)
+
+        self._release_fds.append(release_write)
+        self._report_fds.append(report_read)
+        self.processes.append((name, process))
+        return (name, process)
+
+    def _read_line(self, fd, timeout):
+        line = b''
+        while not line.endswith(b'\n'):
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                return None
+            chunk = os.read(fd, 64)
+            if not chunk:
+                return None
+            line += chunk
+        return line.decode('ascii').strip()
+
+    def release(self):
+        """
+        Waits for all the processes to get to the barrier and releases them
+        at one deadline.
+
+        Returns:
+            A list of actual start times (time.monotonic()) of processes
+            in order of spawning.
+
+        Raises:
+            ProcessesHaveNotReachedBarrier
+        """
+        try:
+            for (name, _), fd in zip(self.processes, self._report_fds):
+                if self._read_line(fd, BARRIER_READY_TIMEOUT) != 'ready':
+                    raise ProcessesHaveNotReachedBarrier(name)
+
+            self.deadline = time.monotonic() + BARRIER_RELEASE_DELAY
+            # Sleep most of the time and spin for the rest to release
+            # the processes as close to the deadline as possible
+            time.sleep(max(0, self.deadline - time.monotonic() - 0.01))
+            while time.monotonic() < self.deadline:
+                pass
+            for fd in self._release_fds:
+                os.write(fd, b'1')
+
+            start_times = []
+            for (name, _), fd in zip(self.processes, self._report_fds):
+                line = self._read_line(fd, BARRIER_READY_TIMEOUT)
+                if line is None:
+                    raise ProcessesHaveNotReachedBarrier(name)
+                start_times.append(float(line))
+            return start_times
+        finally:
+            for fd in self._release_fds + self._report_fds:
+                os.close(fd)
+            self._release_fds = []
+            self._report_fds = []
+
+
 def cleanup_process(process_tuple):
     """ 
     Clean up actions for the process. 
@@ -178,6 +326,36 @@ def cleanup_process(process_tuple):
     logger.info(f'Killed: {process_tuple}\r')
 
 
+def run_via_ssh(
+    ssh_username: str,
+    ssh_host: str,
+    command: str,
+    timeout: typing.Optional[float]=None
+):
+    """
+    Runs a short non-interactive command on a remote machine via SSH and
+    waits for it to finish.
+
+    Returns:
+        subprocess.CompletedProcess with stdout and stderr decoded as text.
+
+    Raises:
+        subprocess.TimeoutExpired
+    """
+    args = []
+    args += SSH_QUERY_ARGS
+    args += [f'{ssh_username}@{ssh_host}', command]
+    logger.debug(f'Running via SSH: {args}')
+    return subprocess.run(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        timeout=timeout
+    )
+
+
 def start_tshark(
     interface: str,
     port: str,
@@ -185,7 +363,8 @@ def start_tshark(
     filename: str,
     start_via_ssh: bool=False,
     ssh_username: typing.Optional[str]=None,
-    ssh_host: typing.Optional[str]=None
+    ssh_host: typing.Optional[str]=None,
+    placement=None
 ):
     name = 'tshark'
     logger.info(f'Starting on a local machine: {name}')
@@ -194,6 +373,9 @@ def start_tshark(
     if start_via_ssh:
         args += SSH_COMMON_ARGS
         args += [f'{ssh_username}@{ssh_host}']
+        if placement is not None:
+            args += placement.command_prefix()
+            placement = None
 
     filepath = results_dir / filename
     args += [
@@ -203,16 +385,18 @@ def start_tshark(
         '-s', '1500', 
         '-w', filepath
     ]
-    process = create_process(name, args)
+    process = create_process(name, args, placement=placement)
     logger.info(f'Started successfully: {name}')
     return (name, process)
 
-def calculate_extra_time(sender_processes):
+def calculate_extra_time(sender_processes, max_extra_time=None):
     """ 
     Calculate extra time needed for senders to fininsh streaming.
 
     Attributes:
         sender_processes: List of processes tuples. 
+        max_extra_time: Stop waiting after that many seconds even if
+            senders are still running. Wait until finished if None.
     """
     extra_time = 0
     for process_tuple in sender_processes:
@@ -221,6 +405,8 @@ def calculate_extra_time(sender_processes):
         while is_running:
             is_running, _ = process_is_running(process)
             if is_running:
+                if max_extra_time is not None and extra_time >= max_extra_time:
+                    return extra_time
                 time.sleep(1)
                 extra_time += 1
 
@@ -0,0 +1,485 @@
+import configparser
+import json
+import logging
+import math
+import os
+import pathlib
+import struct
+import subprocess
+import threading
+import time
+import typing
+
+import attr
+
+from srt_test_runner import generators
+from srt_test_runner import perform_test
+from srt_test_runner import shared
+from srt_test_runner import stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Marker printed by a remote sampler before each sample of a process
+SAMPLE_MARKER = '@@@'
+# Soak time series file format: MAGIC, header length (uint32), header
+# (JSON with column names), then fixed-size records of float64 values,
+# the first one is the timestamp, NaN for missing values
+MAGIC = b'SRTSOAK1'
+# Process metrics sampled: resident set size (kB), open file
+# descriptors, CPU utilization (% of one core)
+PROCESS_METRICS = ['rss', 'fds', 'cpu']
+# Trends of these metrics are checked for growth, of these ones
+# for decay
+GROWTH_METRICS = ['rss', 'fds']
+DECAY_METRICS = ['send_rate']
+
+
+@attr.s
+class SoakTestConfig:
+    """
+    Soak test config: one live mode experiment streaming for hours while
+    the resources of the processes and SRT statistics are tracked.
+    """
+    bitrate: int = attr.ib()
+    # Duration (s) of streaming
+    time_to_stream: int = attr.ib()
+    # Interval (s) of sampling the processes and statistics
+    sample_interval: float = attr.ib(default=10)
+    # Samples of the first `warmup` seconds (buffers allocated, etc.)
+    # are not used for trends
+    warmup: float = attr.ib(default=300)
+    # Change (percent of the value at the start of the trend per hour)
+    # starting from which growth of RSS and file descriptors, or decay
+    # of the sending rate is flagged
+    growth_threshold: float = attr.ib(default=1)
+    decay_threshold: float = attr.ib(default=1)
+
+    @classmethod
+    def from_config_filepath(cls, config_filepath: pathlib.Path):
+        parsed_config = configparser.ConfigParser()
+        with config_filepath.open('r', encoding='utf-8') as fp:
+            parsed_config.read_file(fp)
+        section = parsed_config['soak-test']
+        default = cls(0, 0)
+        return cls(
+            int(section['bitrate']),
+            int(section['time_to_stream']),
+            section.getfloat('sample_interval', default.sample_interval),
+            section.getfloat('warmup', default.warmup),
+            section.getfloat('growth_threshold', default.growth_threshold),
+            section.getfloat('decay_threshold', default.decay_threshold)
+        )
+
+
+def soak_test_generator(global_config, test_config: SoakTestConfig):
+    """
+    Generates the only experiment of soak test: bandwidth loop test
+    experiment at `bitrate` streaming for `time_to_stream` seconds.
+    """
+    exper_params = next(generators.bw_loop_test_generator(
+        global_config,
+        generators.BandwidthLoopTestConfig(
+            test_config.bitrate,
+            test_config.bitrate + 1,
+            1,
+            test_config.time_to_stream
+        )
+    ))
+    yield attr.evolve(exper_params, description=f'{exper_params.description}-soak')
+
+
+class OnlineTrend:
+    """
+    Least squares line fitted incrementally (Welford's algorithm), so that
+    hours of samples take constant memory.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        # Sums of squared deviations of x and of the products of
+        # deviations of x and y
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.first_x = None
+        self.last_x = None
+
+    def add(self, x: float, y: float):
+        if self.first_x is None:
+            self.first_x = x
+        self.last_x = x
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.mean_y += (y - self.mean_y) / self.count
+        self.sxx += dx * (x - self.mean_x)
+        self.sxy += dx * (y - self.mean_y)
+
+    @property
+    def slope(self):
+        if self.count < 2 or self.sxx == 0:
+            return None
+        return self.sxy / self.sxx
+
+    def value_at(self, x: float):
+        if self.slope is None:
+            return None
+        return self.mean_y + self.slope * (x - self.mean_x)
+
+
+@attr.s
+class TrendSummary:
+    samples: int = attr.ib()
+    # Fitted values at the start and the end of the trend
+    start: typing.Optional[float] = attr.ib()
+    end: typing.Optional[float] = attr.ib()
+    # Slope (units per hour)
+    slope: typing.Optional[float] = attr.ib()
+    # Slope relative to the fitted start value (percent per hour)
+    change: typing.Optional[float] = attr.ib()
+
+    @classmethod
+    def from_trend(cls, trend: OnlineTrend):
+        if trend.slope is None:
+            return cls(trend.count, None, None, None, None)
+        start = trend.value_at(trend.first_x)
+        slope = trend.slope * 3600
+        return cls(
+            trend.count,
+            start,
+            trend.value_at(trend.last_x),
+            slope,
+            100 * slope / abs(start) if start else None
+        )
+
+
+@attr.s
+class SoakReport:
+    samples: int = attr.ib()
+    # Trends by series name, e.g. 'snd0.rss', 'rcv.fds', 'snd0.send_rate'
+    trends: typing.Dict[str, TrendSummary] = attr.ib(factory=dict)
+    # Series with growth or decay beyond the thresholds
+    flags: typing.List[str] = attr.ib(factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            data['samples'],
+            {name: TrendSummary(**trend) for name, trend in data['trends'].items()},
+            data['flags']
+        )
+
+
+def parse_process_sample(stat: str, status: str, fds: int):
+    """
+    Returns:
+        A tuple (RSS (kB), open file descriptors, CPU time (clock ticks))
+        from /proc/{pid}/stat and /proc/{pid}/status contents.
+    """
+    rss = None
+    for line in status.splitlines():
+        if line.startswith('VmRSS:'):
+            rss = float(line.split()[1])
+    # The command name may contain spaces, the fields after it
+    # are counted from the closing parenthesis
+    fields = stat[stat.rfind(')') + 2:].split()
+    # utime and stime are fields 14 and 15 of /proc/{pid}/stat
+    cpu_time = int(fields[11]) + int(fields[12])
+    return (rss, fds, cpu_time)
+
+
+class ProcessSource:
+    """
+    Latest values of the metrics of one process: local ones are read from
+    /proc on demand, remote ones are streamed by a shell loop via SSH.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pid: int,
+        interval: float,
+        ssh_username: typing.Optional[str]=None,
+        ssh_host: typing.Optional[str]=None
+    ):
+        self.name = name
+        self.pid = pid
+        self.interval = interval
+        self.ssh_username = ssh_username
+        self.ssh_host = ssh_host
+        self.ticks_per_second = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.values = {metric: math.nan for metric in PROCESS_METRICS}
+        self._previous_cpu = None
+        self._process = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.ssh_host is None:
+            return
+        proc_dir = f'/proc/{self.pid}'
+        command = (
+            f'getconf CLK_TCK; while [ -d {proc_dir} ]; do echo {SAMPLE_MARKER}; '
+            f'cat {proc_dir}/stat {proc_dir}/status; ls {proc_dir}/fd | wc -l; '
+            f'sleep {self.interval}; done'
+        )
+        args = []
+        args += shared.SSH_QUERY_ARGS
+        args += [f'{self.ssh_username}@{self.ssh_host}', command]
+        self._process = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True
+        )
+        self._thread = threading.Thread(
+            target=self._read_remote,
+            name=f'soak-{self.name}',
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._thread.join()
+
+    def _update(self, timestamp: float, stat: str, status: str, fds: int):
+        rss, fds, cpu_time = parse_process_sample(stat, status, fds)
+        cpu = math.nan
+        if self._previous_cpu is not None and timestamp > self._previous_cpu[0]:
+            cpu = (
+                100 * (cpu_time - self._previous_cpu[1])
+                / self.ticks_per_second / (timestamp - self._previous_cpu[0])
+            )
+        self._previous_cpu = (timestamp, cpu_time)
+        with self._lock:
+            self.values = {
+                'rss': math.nan if rss is None else rss,
+                'fds': float(fds),
+                'cpu': cpu,
+            }
+
+    def _read_remote(self):
+        lines = []
+        first = True
+        for line in self._process.stdout:
+            if first:
+                first = False
+                try:
+                    self.ticks_per_second = int(line)
+                    continue
+                except ValueError:
+                    pass
+            if line.strip() != SAMPLE_MARKER:
+                lines.append(line)
+                continue
+            self._parse_remote(lines)
+            lines = []
+        self._parse_remote(lines)
+
+    def _parse_remote(self, lines: typing.List[str]):
+        # stat is one line, status is many, the number of descriptors
+        # is the last line
+        if len(lines) < 3:
+            return
+        try:
+            self._update(time.time(), lines[0], ''.join(lines[1:-1]), int(lines[-1]))
+        except (IndexError, ValueError):
+            return
+
+    def sample(self):
+        """
+        Returns:
+            A dictionary {metric: value}, NaN if not available (e.g.,
+            the process has exited).
+        """
+        if self.ssh_host is None:
+            proc_dir = pathlib.Path(f'/proc/{self.pid}')
+            try:
+                stat = (proc_dir / 'stat').read_text()
+                status = (proc_dir / 'status').read_text()
+                fds = len(os.listdir(proc_dir / 'fd'))
+                self._update(time.time(), stat, status, fds)
+            except (OSError, IndexError, ValueError):
+                return {metric: math.nan for metric in PROCESS_METRICS}
+        with self._lock:
+            return dict(self.values)
+
+
+class SoakMonitor:
+    """
+    Samples the processes of an experiment and SRT statistics of senders
+    every `sample_interval` seconds into `{description}-soak.bin` time
+    series file and fits the trends incrementally, so that neither the
+    samples nor the statistics are kept in memory.
+
+    Usage:
+        monitor = SoakMonitor(config, filepath, sources, stats_filepaths)
+        monitor.start()
+        ...
+        report = monitor.stop()
+    """
+
+    def __init__(
+        self,
+        config: SoakTestConfig,
+        filepath: pathlib.Path,
+        sources: typing.List[ProcessSource],
+        stats_filepaths: typing.List[pathlib.Path]
+    ):
+        self.config = config
+        self.filepath = filepath
+        self.sources = sources
+        self.tails = [stats.StatsTail(filepath) for filepath in stats_filepaths]
+        self.columns = [
+            f'{source.name}.{metric}'
+            for source in sources
+            for metric in PROCESS_METRICS
+        ] + [
+            f'snd{i}.{metric}'
+            for i in range(len(self.tails))
+            for metric in ('send_rate', 'loss')
+        ]
+        self.trends = {column: OnlineTrend() for column in self.columns}
+        self.samples = 0
+        self._record = struct.Struct('<d' + 'd' * len(self.columns))
+        self._fp = None
+        self._started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._fp = self.filepath.open('wb')
+        header = json.dumps({
+            'interval': self.config.sample_interval,
+            'columns': self.columns,
+        }).encode('utf-8')
+        self._fp.write(MAGIC)
+        self._fp.write(struct.pack('<I', len(header)))
+        self._fp.write(header)
+        for source in self.sources:
+            source.start()
+        self._started = time.time()
+        self._thread = threading.Thread(target=self._run, name='soak-monitor', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._sample()
+            except OSError as error:
+                logger.info(
+                    f'Soak sample has not been taken. Exception occured '
+                    f'({error.__class__.__name__}): {error}\r'
+                )
+            deadline += self.config.sample_interval
+            self._stop.wait(max(0, deadline - time.monotonic()))
+
+    def _sample(self):
+        timestamp = time.time()
+        values = {}
+        for source in self.sources:
+            for metric, value in source.sample().items():
+                values[f'{source.name}.{metric}'] = value
+        for i, tail in enumerate(self.tails):
+            rows = tail.read_new_rows()
+            send_rates = [row[stats.SEND_RATE] for row in rows if stats.SEND_RATE in row]
+            sent = sum(row.get(stats.PKT_SENT, 0) for row in rows)
+            lost = sum(row.get(stats.PKT_SND_LOSS, 0) for row in rows)
+            values[f'snd{i}.send_rate'] = sum(send_rates) / len(send_rates) if send_rates else math.nan
+            values[f'snd{i}.loss'] = lost / sent if sent else math.nan
+
+        row = [values.get(column, math.nan) for column in self.columns]
+        self._fp.write(self._record.pack(timestamp, *row))
+        self._fp.flush()
+        self.samples += 1
+        if timestamp - self._started < self.config.warmup:
+            return
+        for column, value in zip(self.columns, row):
+            if not math.isnan(value):
+                self.trends[column].add(timestamp, value)
+
+    def stop(self):
+        """
+        Stops sampling.
+
+        Returns:
+            `SoakReport` with the trends and the series flagged.
+        """
+        if self._fp is None or self._fp.closed:
+            return self.report()
+        self._stop.set()
+        self._thread.join()
+        for source in self.sources:
+            source.stop()
+        self._fp.close()
+        return self.report()
+
+    def report(self):
+        report = SoakReport(self.samples)
+        for column, trend in self.trends.items():
+            summary = TrendSummary.from_trend(trend)
+            report.trends[column] = summary
+            if summary.change is None:
+                continue
+            metric = column.split('.', 1)[1]
+            if metric in GROWTH_METRICS and summary.change >= self.config.growth_threshold:
+                report.flags.append(column)
+            if metric in DECAY_METRICS and -summary.change >= self.config.decay_threshold:
+                report.flags.append(column)
+        return report
+
+
+def read_time_series(filepath: pathlib.Path):
+    """
+    Reads a time series file written by `SoakMonitor`.
+
+    Returns:
+        A tuple of (columns, rows) where columns is a list of column names
+        starting with 'timestamp' and rows is a list of tuples.
+    """
+    with filepath.open('rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'Not a soak time series file: {filepath}')
+        header_len, = struct.unpack('<I', fp.read(4))
+        header = json.loads(fp.read(header_len).decode('utf-8'))
+        record = struct.Struct('<d' + 'd' * len(header['columns']))
+        data = fp.read()
+        # The last record may be incomplete if the script has been killed
+        data = data[:len(data) - len(data) % record.size]
+        rows = [row for row in record.iter_unpack(data)]
+    return (['timestamp'] + header['columns'], rows)
+
+
+def run(context: perform_test.TestContext, test_config: SoakTestConfig):
+    """
+    Performs soak test: the experiment generated by `soak_test_generator`
+    is streamed while the trends of process resources and the sending
+    rate are tracked, see `SoakMonitor`. The experiment is cached and
+    repeated the same way as the ones of bandwidth loop test, see
+    `perform_test.perform_experiments`.
+
+    Returns:
+        A list of tuples (test description, bitrate, extra time needed to
+        finish with streaming).
+    """
+    points = perform_test.perform_experiments(
+        context,
+        list(soak_test_generator(context.global_config, test_config)),
+        soak_config=test_config
+    )
+    return [
+        (exper_result.description, exper_params.bitrate, exper_result.extra_time)
+        for exper_params, exper_result in points
+    ]
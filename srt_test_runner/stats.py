@@ -0,0 +1,110 @@
+import csv
+import pathlib
+import statistics
+import typing
+
+
+# Columns of SRT statistics .csv files written by srt-test-messaging
+# with -statsfile option (one row every -statsfreq seconds)
+TIME = 'Time'
+RTT = 'msRTT'
+BANDWIDTH = 'mbpsBandwidth'
+SEND_RATE = 'mbpsSendRate'
+RECV_RATE = 'mbpsRecvRate'
+PKT_SENT = 'pktSent'
+PKT_SND_LOSS = 'pktSndLoss'
+PKT_RETRANS = 'pktRetrans'
+PKT_RECV = 'pktRecv'
+PKT_RCV_LOSS = 'pktRcvLoss'
+PKT_RCV_DROP = 'pktRcvDrop'
+# Timespan (ms) of the data in the sender buffer, i.e. how long
+# the data waits to be sent. Not reported by some SRT versions
+SND_BUFFER = 'msSndBuf'
+
+
+def sender_stats_filepath(results_dir: pathlib.Path, description: str, number: int=0):
+    return results_dir / f'{description}-stats-snd-{number}.csv'
+
+
+def receiver_stats_filepath(results_dir: pathlib.Path, description: str):
+    return results_dir / f'{description}-stats-rcv.csv'
+
+
+def read_stats(filepath: pathlib.Path):
+    """
+    Reads SRT statistics .csv file.
+
+    Returns:
+        A dictionary {column name: list of values}. Values which can not be
+        converted to float (empty, etc.) are skipped.
+    """
+    columns = {}
+    with filepath.open('r', newline='') as fp:
+        for row in csv.DictReader(fp):
+            for name, value in row.items():
+                if name is None:
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                columns.setdefault(name.strip(), []).append(value)
+    return columns
+
+
+def median(values: typing.List[float], skip_zeros: bool=False):
+    """
+    Returns:
+        Median of `values` or None if there are no values.
+    """
+    if skip_zeros:
+        values = [value for value in values if value != 0]
+    if not values:
+        return None
+    return statistics.median(values)
+
+
+class StatsTail:
+    """
+    Reads rows appended to SRT statistics .csv file while
+    srt-test-messaging is still writing it, so that statistics can be
+    processed on the fly without reading the whole file again.
+    """
+
+    def __init__(self, filepath: pathlib.Path):
+        self.filepath = filepath
+        self.offset = 0
+        self.columns = None
+
+    def read_new_rows(self):
+        """
+        Returns:
+            A list of dictionaries {column name: value} for complete rows
+            appended since the previous call. Values which can not be
+            converted to float are skipped.
+        """
+        if not self.filepath.exists():
+            return []
+        with self.filepath.open('rb') as fp:
+            fp.seek(self.offset)
+            data = fp.read()
+        # An incomplete last line is read at the next call
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+
+        rows = []
+        for line in data[:end].decode('utf-8', 'replace').splitlines():
+            values = next(csv.reader([line]), [])
+            if not values:
+                continue
+            if self.columns is None:
+                self.columns = [value.strip() for value in values]
+                continue
+            row = {}
+            for name, value in zip(self.columns, values):
+                try:
+                    row[name] = float(value)
+                except ValueError:
+                    continue
+            rows.append(row)
+        return rows
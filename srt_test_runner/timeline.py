@@ -0,0 +1,384 @@
+import array
+import csv
+import datetime
+import json
+import logging
+import math
+import pathlib
+import struct
+import subprocess
+import sys
+import time
+import typing
+
+import attr
+
+from srt_test_runner import pcapng
+from srt_test_runner import shared
+from srt_test_runner import stats
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)-15s [%(levelname)s] %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+
+# Number of round trips to a receiver side per clock offset estimate,
+# the one with the minimum round-trip time is used
+CLOCK_PROBES = 8
+CLOCK_PROBE_TIMEOUT = shared.SSH_CONNECTION_TIMEOUT + 5
+# Column of SRT statistics with the local wall-clock time of a row,
+# e.g. "14:08:14.823876+0200"
+TIMEPOINT = 'Timepoint'
+TIMEPOINT_FORMATS = ['%H:%M:%S.%f%z', '%H:%M:%S.%f']
+# Timeline file format: MAGIC, header length (uint32), header (JSON with
+# column names, the number of rows and the clock offset), then each column
+# as float64 little-endian array, NaN for missing values. A column can be
+# loaded without parsing the others, e.g. numpy.frombuffer(data, '<f8',
+# rows, offset) or `load`
+MAGIC = b'SRTTIME1'
+# Resolution (s) of the time index, statistics are written once a second
+RESOLUTION = 1.0
+
+
+@attr.s
+class ClockOffset:
+    # Local time (s) the offset has been measured at
+    time: float = attr.ib()
+    # Remote clock minus local clock (s)
+    offset: float = attr.ib()
+    # Round-trip time (s) of the probe, the error of the offset
+    # is below rtt / 2
+    rtt: float = attr.ib()
+
+
+@attr.s
+class ClockSync:
+    """
+    Clock offsets of a receiver side measured at the start and the end
+    of an experiment. It is saved into `{description}-clock.json` file.
+    """
+    start: typing.Optional[ClockOffset] = attr.ib()
+    end: typing.Optional[ClockOffset] = attr.ib()
+
+    def offset_at(self, local_time: float):
+        """
+        Returns:
+            Remote clock minus local clock (s) at `local_time`, linearly
+            interpolated between the start and the end to account for
+            the drift, None if the offset has not been measured.
+        """
+        offsets = [offset for offset in (self.start, self.end) if offset is not None]
+        if not offsets:
+            return None
+        if len(offsets) == 1 or self.end.time == self.start.time:
+            return offsets[0].offset
+        drift = (self.end.offset - self.start.offset) / (self.end.time - self.start.time)
+        return self.start.offset + drift * (local_time - self.start.time)
+
+    def save(self, filepath: pathlib.Path):
+        with filepath.open('w', encoding='utf-8') as fp:
+            json.dump(attr.asdict(self), fp, indent=4)
+
+    @classmethod
+    def load(cls, filepath: pathlib.Path):
+        with filepath.open('r', encoding='utf-8') as fp:
+            data = json.load(fp)
+        return cls(*[
+            ClockOffset(**data[key]) if data[key] else None
+            for key in ('start', 'end')
+        ])
+
+
+def clock_filepath(results_dir: pathlib.Path, description: str):
+    return results_dir / f'{description}-clock.json'
+
+
+def timeline_filepath(results_dir: pathlib.Path, description: str):
+    return results_dir / f'{description}-timeline.bin'
+
+
+def probe_clock_offset(ssh_username: str, ssh_host: str, probes: int=CLOCK_PROBES):
+    """
+    Estimates the clock offset of a remote machine NTP-style: within one
+    SSH session, the remote time is requested several times and compared
+    with the middle of the round trip.
+
+    Returns:
+        `ClockOffset` of the probe with the minimum round-trip time or
+        None if the remote time has not been received.
+    """
+    args = []
+    args += shared.SSH_QUERY_ARGS
+    args += [
+        f'{ssh_username}@{ssh_host}',
+        'while read line; do date +%s.%N; done'
+    ]
+    try:
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1
+        )
+    except OSError as error:
+        logger.info(f'Clock offset has not been probed: {error}')
+        return None
+
+    best = None
+    try:
+        for _ in range(probes):
+            sent = time.time()
+            process.stdin.write('\n')
+            process.stdin.flush()
+            line = process.stdout.readline()
+            received = time.time()
+            try:
+                remote_time = float(line)
+            except ValueError:
+                logger.info(
+                    f'Clock offset has not been probed on {ssh_host}, '
+                    f'output: {line!r}'
+                )
+                break
+            probe = ClockOffset(
+                (sent + received) / 2,
+                remote_time - (sent + received) / 2,
+                received - sent
+            )
+            if best is None or probe.rtt < best.rtt:
+                best = probe
+    except OSError as error:
+        logger.info(f'Clock offset has not been probed on {ssh_host}: {error}')
+    finally:
+        try:
+            process.stdin.close()
+            process.wait(CLOCK_PROBE_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+    return best
+
+
+def parse_timepoint(value: str, reference: float):
+    """
+    Converts the time of day of SRT statistics row into Unix time on
+    the date closest to `reference` (Unix time).
+
+    Returns:
+        Unix time (s) or None if `value` has not been parsed.
+    """
+    for fmt in TIMEPOINT_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(value.strip(), fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        return None
+
+    tz = parsed.tzinfo
+    reference_date = datetime.datetime.fromtimestamp(reference, tz).date()
+    candidates = []
+    for days in (-1, 0, 1):
+        day = reference_date + datetime.timedelta(days=days)
+        moment = datetime.datetime.combine(day, parsed.timetz())
+        # Without a time zone the time is local
+        candidates.append(moment.timestamp())
+    return min(candidates, key=lambda candidate: abs(candidate - reference))
+
+
+def read_timed_stats(filepath: pathlib.Path, reference: float):
+    """
+    Reads SRT statistics .csv file with wall-clock time of the rows.
+
+    Returns:
+        A list of tuples (Unix time, {column name: value}), empty if
+        the file has no `TIMEPOINT` column.
+    """
+    rows = []
+    with filepath.open('r', newline='') as fp:
+        for row in csv.DictReader(fp):
+            row = {
+                name.strip(): value for name, value in row.items()
+                if name is not None
+            }
+            timepoint = parse_timepoint(row.get(TIMEPOINT) or '', reference)
+            if timepoint is None:
+                continue
+            values = {}
+            for name, value in row.items():
+                try:
+                    values[name] = float(value)
+                except (TypeError, ValueError):
+                    continue
+            rows.append((timepoint, values))
+    return rows
+
+
+class Timeline:
+    """
+    Columns of values of several sources on one time index with
+    `resolution` seconds steps.
+    """
+
+    def __init__(self, resolution: float=RESOLUTION):
+        self.resolution = resolution
+        # {column name: {bin: value}}
+        self.columns = {}
+
+    def bin(self, timestamp: float):
+        return int(math.floor(timestamp / self.resolution))
+
+    def set(self, column: str, timestamp: float, value: float):
+        """
+        Sets the value of `column` in the bin of `timestamp`, the last
+        one is kept if several values fall into one bin.
+        """
+        self.columns.setdefault(column, {})[self.bin(timestamp)] = value
+
+    def add(self, column: str, timestamp: float, value: float):
+        """
+        Adds `value` to `column` in the bin of `timestamp`.
+        """
+        bins = self.columns.setdefault(column, {})
+        index = self.bin(timestamp)
+        bins[index] = bins.get(index, 0) + value
+
+    def to_arrays(self):
+        """
+        Returns:
+            A dictionary {column name: array of float64} including `time`
+            column with the start of the bins.
+        """
+        bins = [index for values in self.columns.values() for index in values]
+        if not bins:
+            return {'time': array.array('d')}
+        first, last = min(bins), max(bins)
+        arrays = {
+            'time': array.array('d', (
+                index * self.resolution for index in range(first, last + 1)
+            ))
+        }
+        for name in sorted(self.columns):
+            values = self.columns[name]
+            arrays[name] = array.array('d', (
+                values.get(index, math.nan) for index in range(first, last + 1)
+            ))
+        return arrays
+
+
+def save(filepath: pathlib.Path, arrays: typing.Dict[str, array.array], metadata: dict):
+    names = list(arrays)
+    header = json.dumps({
+        'columns': names,
+        'rows': len(arrays[names[0]]),
+        'metadata': metadata,
+    }).encode('utf-8')
+    with filepath.open('wb') as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack('<I', len(header)))
+        fp.write(header)
+        for name in names:
+            values = arrays[name]
+            if sys.byteorder != 'little':
+                values = array.array('d', values)
+                values.byteswap()
+            values.tofile(fp)
+
+
+def load(filepath: pathlib.Path, columns: typing.Optional[typing.List[str]]=None):
+    """
+    Returns:
+        A tuple (metadata, {column name: array of float64}) of the file
+        written by `save`, only `columns` are read if specified.
+    """
+    with filepath.open('rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{filepath} is not a timeline file')
+        header_length, = struct.unpack('<I', fp.read(4))
+        header = json.loads(fp.read(header_length).decode('utf-8'))
+        data_offset = len(MAGIC) + 4 + header_length
+        rows = header['rows']
+        arrays = {}
+        for number, name in enumerate(header['columns']):
+            if columns is not None and name not in columns:
+                continue
+            fp.seek(data_offset + number * rows * 8)
+            values = array.array('d')
+            values.fromfile(fp, rows)
+            if sys.byteorder != 'little':
+                values.byteswap()
+            arrays[name] = values
+    return (header['metadata'], arrays)
+
+
+def merge(results_dir: pathlib.Path, description: str, resolution: float=RESOLUTION):
+    """
+    Joins the data of an experiment onto one time index of the sender
+    (local) clock: sender statistics `snd{i}.{column}`, receiver
+    statistics `rcv.{column}` with receiver time corrected by the clock
+    offset, and the number of packets and bytes captured by tshark
+    `capture.packets`, `capture.bytes`. The result is saved into
+    `{description}-timeline.bin` file.
+
+    Statistics rows are placed by `TIMEPOINT` column, files without it
+    are skipped. Receiver statistics are merged only if downloaded
+    from a receiver side and the clock offset has been measured.
+
+    Returns:
+        The path to the timeline file or None if there is no data.
+    """
+    timeline = Timeline(resolution)
+    metadata = {'description': description, 'resolution': resolution, 'sources': []}
+    reference = time.time()
+
+    i = 0
+    while stats.sender_stats_filepath(results_dir, description, i).exists():
+        filepath = stats.sender_stats_filepath(results_dir, description, i)
+        rows = read_timed_stats(filepath, filepath.stat().st_mtime)
+        if not rows:
+            logger.info(f'No {TIMEPOINT} column, not merged: {filepath.name}')
+        for timestamp, values in rows:
+            for name, value in values.items():
+                timeline.set(f'snd{i}.{name}', timestamp, value)
+        if rows:
+            metadata['sources'].append(filepath.name)
+            reference = rows[0][0]
+        i += 1
+
+    filepath = stats.receiver_stats_filepath(results_dir, description)
+    clock = None
+    if clock_filepath(results_dir, description).exists():
+        clock = ClockSync.load(clock_filepath(results_dir, description))
+        metadata['clock'] = attr.asdict(clock)
+    if filepath.exists() and clock is not None and clock.offset_at(reference) is not None:
+        rows = read_timed_stats(filepath, reference + clock.offset_at(reference))
+        if not rows:
+            logger.info(f'No {TIMEPOINT} column, not merged: {filepath.name}')
+        for remote_time, values in rows:
+            local_time = remote_time - clock.offset_at(remote_time)
+            for name, value in values.items():
+                timeline.set(f'rcv.{name}', local_time, value)
+        if rows:
+            metadata['sources'].append(filepath.name)
+
+    filepath = results_dir / f'{description}-snd.pcapng'
+    if filepath.exists():
+        try:
+            for packet in pcapng.read_packets(filepath):
+                timeline.add('capture.packets', packet.timestamp, 1)
+                timeline.add('capture.bytes', packet.timestamp, packet.original_length)
+            metadata['sources'].append(filepath.name)
+        except pcapng.InvalidPcapng as error:
+            logger.info(f'Capture has not been merged: {error}')
+
+    if not timeline.columns:
+        return None
+    filepath = timeline_filepath(results_dir, description)
+    save(filepath, timeline.to_arrays(), metadata)
+    return filepath
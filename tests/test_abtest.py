@@ -0,0 +1,94 @@
+import pytest
+
+from srt_test_runner import abtest
+
+
+CONFIG = abtest.ABTestConfig('bw_loop_test', '.', '.', 'b', runs=6, alpha=0.05, threshold=5)
+
+
+def test_permutation_test_of_identical_builds():
+    assert abtest.paired_permutation_test([1, 2, 3], [1, 2, 3]) == 1.0
+
+
+def test_permutation_test_is_exact_for_few_pairs():
+    # Only the observed assignment and its mirror are as extreme
+    assert abtest.paired_permutation_test([10] * 6, [11] * 6) == pytest.approx(2 / 2 ** 6)
+    assert abtest.paired_permutation_test([10] * 5, [9] * 5) == pytest.approx(2 / 2 ** 5)
+
+
+def test_permutation_test_is_symmetric():
+    values_a = [10, 12, 11, 13, 10, 12]
+    values_b = [11, 12, 13, 13, 11, 14]
+
+    assert abtest.paired_permutation_test(values_a, values_b) == pytest.approx(
+        abtest.paired_permutation_test(values_b, values_a)
+    )
+
+
+def test_permutation_test_of_mixed_differences_is_not_significant():
+    assert abtest.paired_permutation_test([10, 10, 10, 10], [11, 9, 11, 9]) == 1.0
+
+
+def test_permutation_test_samples_many_pairs():
+    pairs = abtest.EXACT_PERMUTATION_PAIRS + 4
+    p_value = abtest.paired_permutation_test([10] * pairs, [12] * pairs)
+
+    assert p_value == pytest.approx(1 / (abtest.PERMUTATION_SAMPLES + 1), rel=0.5)
+    assert p_value == abtest.paired_permutation_test([10] * pairs, [12] * pairs)
+
+
+def test_lower_send_rate_is_regression():
+    comparison = abtest.compare('exp', 'send_rate', [10] * 6, [9] * 6, CONFIG)
+
+    assert comparison.change == pytest.approx(-10)
+    assert comparison.p_value < CONFIG.alpha
+    assert comparison.verdict == 'regression'
+
+
+def test_lower_extra_time_is_improvement():
+    comparison = abtest.compare('exp', 'extra_time', [10] * 6, [8] * 6, CONFIG)
+
+    assert comparison.verdict == 'improvement'
+
+
+def test_change_below_threshold_is_no_change():
+    comparison = abtest.compare('exp', 'send_rate', [100] * 6, [99] * 6, CONFIG)
+
+    assert comparison.p_value < CONFIG.alpha
+    assert comparison.verdict == 'no change'
+
+
+def test_pairs_with_missing_values_are_dropped():
+    comparison = abtest.compare('exp', 'send_rate', [10, None, 10], [9, 9, None], CONFIG)
+
+    assert comparison.values_a == [10]
+    assert comparison.values_b == [9]
+    assert comparison.p_value is None
+    assert comparison.verdict == 'insufficient data'
+
+
+def test_no_pairs_is_insufficient_data():
+    comparison = abtest.compare('exp', 'rtt_p99', [None] * 6, [None] * 6, CONFIG)
+
+    assert comparison.mean_a is None
+    assert comparison.verdict == 'insufficient data'
+
+
+def test_change_from_zero_baseline_is_undefined():
+    comparison = abtest.compare('exp', 'extra_time', [0] * 6, [3] * 6, CONFIG)
+
+    assert comparison.baseline_zero
+    assert comparison.change is None
+    assert comparison.verdict == 'regression'
+
+
+def test_both_zero_is_no_change():
+    comparison = abtest.compare('exp', 'extra_time', [0] * 6, [0] * 6, CONFIG)
+
+    assert not comparison.baseline_zero
+    assert comparison.change == 0.0
+    assert comparison.verdict == 'no change'
+
+
+def test_run_order_alternates_builds():
+    assert [abtest.run_order(run) for run in range(3)] == [['A', 'B'], ['B', 'A'], ['A', 'B']]
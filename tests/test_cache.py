@@ -0,0 +1,102 @@
+import os
+import time
+
+import pytest
+
+from srt_test_runner import cache
+
+
+@pytest.fixture
+def experiment_cache(tmp_path):
+    return cache.ExperimentCache(cache.CacheConfig(str(tmp_path / 'cache'), ttl=1, max_size=1))
+
+
+def write_artefacts(results_dir, description, size=10):
+    results_dir.mkdir(parents=True, exist_ok=True)
+    filepaths = [
+        results_dir / f'{description}-snd.pcapng',
+        results_dir / f'{description}-stats-snd-0.csv',
+    ]
+    for filepath in filepaths:
+        filepath.write_bytes(b'\0' * size)
+    return filepaths
+
+
+def set_last_access(experiment_cache, key, timestamp):
+    os.utime(experiment_cache.cache_dir / key / cache.ENTRY_FILENAME, (timestamp, timestamp))
+
+
+def test_fingerprint_does_not_depend_on_key_order():
+    assert cache.fingerprint({'a': 1, 'b': [2]}) == cache.fingerprint({'b': [2], 'a': 1})
+    assert cache.fingerprint({'a': 1}) != cache.fingerprint({'a': 2})
+
+
+def test_experiment_artefacts(tmp_path):
+    for name in ['exp-snd.pcapng', 'exp.json', 'exp-run-0-snd.pcapng', 'exp2-snd.pcapng', 'other.csv']:
+        (tmp_path / name).write_text('')
+
+    assert [filepath.name for filepath in cache.experiment_artefacts(tmp_path, 'exp')] == [
+        'exp-snd.pcapng', 'exp.json'
+    ]
+
+
+def test_store_restore(tmp_path, experiment_cache):
+    filepaths = write_artefacts(tmp_path / 'first', 'exp')
+
+    assert experiment_cache.store('key', 'exp', filepaths, {'bitrate': 1000})
+    restored = experiment_cache.restore('key', tmp_path / 'second')
+
+    assert [filepath.name for filepath in restored] == sorted(filepath.name for filepath in filepaths)
+    assert all(filepath.read_bytes() == b'\0' * 10 for filepath in restored)
+    assert experiment_cache.restore('other', tmp_path / 'third') is None
+
+
+def test_store_replaces_entry(tmp_path, experiment_cache):
+    experiment_cache.store('key', 'exp', write_artefacts(tmp_path / 'first', 'exp'))
+    experiment_cache.store('key', 'exp', write_artefacts(tmp_path / 'second', 'exp', size=20))
+
+    restored = experiment_cache.restore('key', tmp_path / 'third')
+
+    assert all(filepath.stat().st_size == 20 for filepath in restored)
+    assert [path.name for path in experiment_cache.cache_dir.iterdir()] == ['key']
+
+
+def test_expired_entries(tmp_path, experiment_cache, monkeypatch):
+    experiment_cache.store('key', 'exp', write_artefacts(tmp_path, 'exp'))
+    now = time.time()
+
+    monkeypatch.setattr(cache.time, 'time', lambda: now + 0.9 * 3600)
+    assert experiment_cache.restore('key', tmp_path / 'restored') is not None
+    assert experiment_cache.evict() == 0
+
+    monkeypatch.setattr(cache.time, 'time', lambda: now + 1.1 * 3600)
+    assert experiment_cache.restore('key', tmp_path / 'restored') is None
+    assert experiment_cache.evict() == 1
+    assert not (experiment_cache.cache_dir / 'key').exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, experiment_cache):
+    # Three entries of 2 * 200 KB do not fit into 1 MB
+    for key in ['a', 'b', 'c']:
+        experiment_cache.store(key, key, write_artefacts(tmp_path / key, key, size=200 * 1024))
+    now = time.time()
+    set_last_access(experiment_cache, 'a', now - 30)
+    set_last_access(experiment_cache, 'b', now - 20)
+    set_last_access(experiment_cache, 'c', now - 10)
+    # A hit makes the oldest entry the most recently used one
+    experiment_cache.restore('a', tmp_path / 'restored')
+
+    assert experiment_cache.evict() == 1
+    assert sorted(path.name for path in experiment_cache.cache_dir.iterdir()) == ['a', 'c']
+
+
+def test_stale_partial_writes_are_evicted(experiment_cache):
+    now = time.time()
+    stale = experiment_cache.cache_dir / f'a.1{cache.PART_SUFFIX}'
+    recent = experiment_cache.cache_dir / f'b.1{cache.PART_SUFFIX}'
+    stale.mkdir(parents=True)
+    recent.mkdir()
+    os.utime(stale, (now - cache.PART_GRACE_PERIOD - 1, now - cache.PART_GRACE_PERIOD - 1))
+
+    assert experiment_cache.evict() == 1
+    assert not stale.exists() and recent.exists()
@@ -0,0 +1,227 @@
+import struct
+
+import pytest
+
+from srt_test_runner import dissector
+from srt_test_runner import pcapng
+
+
+PORT = 4200
+# 2023-11-14 22:13:20 UTC
+START = 1700000000
+
+
+def block(block_type, body, endian='<'):
+    body += b'\0' * (-len(body) % 4)
+    total_length = len(body) + 12
+    return (
+        struct.pack(endian + 'II', block_type, total_length)
+        + body
+        + struct.pack(endian + 'I', total_length)
+    )
+
+
+def write_pcapng(filepath, packets, linktype=dissector.LINKTYPE_ETHERNET, endian='<', tsresol=None):
+    """
+    Writes (time (s), data, original length or None) `packets` into
+    .pcapng file with one interface.
+    """
+    units_per_second = 10 ** 6
+    options = b''
+    if tsresol is not None:
+        units_per_second = pcapng.parse_tsresol(tsresol)
+        options = struct.pack(endian + 'HHB3x', pcapng.IF_TSRESOL, 1, tsresol)
+        options += struct.pack(endian + 'HH', 0, 0)
+    content = block(
+        pcapng.SECTION_HEADER_BLOCK,
+        struct.pack(endian + 'IHHq', pcapng.BYTE_ORDER_MAGIC, 1, 0, -1),
+        endian
+    )
+    content += block(
+        pcapng.INTERFACE_DESCRIPTION_BLOCK,
+        struct.pack(endian + 'HHI', linktype, 0, 0) + options,
+        endian
+    )
+    for timestamp, data, original_length in packets:
+        units = int(round(timestamp * units_per_second))
+        content += block(
+            pcapng.ENHANCED_PACKET_BLOCK,
+            struct.pack(
+                endian + 'IIIII',
+                0,
+                units >> 32,
+                units & 0xFFFFFFFF,
+                len(data),
+                original_length or len(data)
+            ) + data,
+            endian
+        )
+    filepath.write_bytes(content)
+
+
+def udp_over_ethernet(payload, src_port=5000, dst_port=PORT, protocol=dissector.IPPROTO_UDP):
+    udp = struct.pack('!HHHH', src_port, dst_port, 8 + len(payload), 0) + payload
+    ip = struct.pack(
+        '!BBHHHBBH4s4s',
+        0x45, 0, 20 + len(udp), 0, 0, 64, protocol, 0, b'\1\2\3\4', b'\5\6\7\10'
+    ) + udp
+    return b'\0' * 12 + struct.pack('!H', dissector.ETHERTYPE_IPV4) + ip
+
+
+def data_packet(number, retransmitted=False, size=1456):
+    return struct.pack('!IIII', number, (1 << 26) if retransmitted else 0, 0, 0) + b'\0' * size
+
+
+def control_packet(control_type, body=b''):
+    return struct.pack('!IIII', 0x80000000 | (control_type << 16), 0, 0, 0) + body
+
+
+def nak_packet(*entries):
+    return control_packet(0x0003, b''.join(struct.pack('!I', entry) for entry in entries))
+
+
+def test_read_packets(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    write_pcapng(filepath, [(START + 0.25, b'\1\2\3', 60), (START + 1.5, b'\4' * 5, None)])
+
+    packets = list(pcapng.read_packets(filepath))
+
+    assert [packet.timestamp for packet in packets] == [START + 0.25, START + 1.5]
+    assert [packet.data for packet in packets] == [b'\1\2\3', b'\4' * 5]
+    assert [packet.original_length for packet in packets] == [60, 5]
+    assert {packet.linktype for packet in packets} == {dissector.LINKTYPE_ETHERNET}
+
+
+def test_read_packets_big_endian_with_nanosecond_timestamps(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    write_pcapng(filepath, [(START + 0.000000123, b'\1', None)], endian='>', tsresol=9)
+
+    packet, = pcapng.read_packets(filepath)
+
+    assert packet.timestamp == pytest.approx(START + 0.000000123, abs=1e-9)
+    assert packet.data == b'\1'
+
+
+def test_truncated_last_block_ends_the_file(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    write_pcapng(filepath, [(START, b'\1' * 8, None), (START + 1, b'\2' * 8, None)])
+    filepath.write_bytes(filepath.read_bytes()[:-6])
+
+    assert [packet.data for packet in pcapng.read_packets(filepath)] == [b'\1' * 8]
+
+
+def test_other_files_are_invalid(tmp_path):
+    filepath = tmp_path / 'capture.pcap'
+    filepath.write_bytes(struct.pack('<IHHiIII', 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+
+    with pytest.raises(pcapng.InvalidPcapng):
+        list(pcapng.read_packets(filepath))
+
+
+def test_udp_payload_over_ipv6_and_vlan():
+    payload = b'srt'
+    udp = struct.pack('!HHHH', 5000, PORT, 8 + len(payload), 0) + payload
+    ip = struct.pack('!IHBB16s16s', 0x60000000, len(udp), dissector.IPPROTO_UDP, 64, b'\0' * 16, b'\0' * 16) + udp
+    data = b'\0' * 12 + struct.pack('!HHH', 0x8100, 1, dissector.ETHERTYPE_IPV6) + ip
+
+    assert dissector.udp_payload(dissector.LINKTYPE_ETHERNET, data) == (5000, PORT, payload)
+
+
+def test_udp_payload_of_other_protocols():
+    data = udp_over_ethernet(b'\0' * 16, protocol=6)
+
+    assert dissector.udp_payload(dissector.LINKTYPE_ETHERNET, data) is None
+
+
+def test_decode_srt_headers(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    write_pcapng(filepath, [
+        (START, udp_over_ethernet(data_packet(100)), None),
+        (START + 0.1, udp_over_ethernet(data_packet(100, retransmitted=True)), None),
+        (START + 0.2, udp_over_ethernet(control_packet(0x0002, b'\0' * 28), PORT, 5000), None),
+        (START + 0.3, udp_over_ethernet(nak_packet(101, 0x80000000 | 105, 107), PORT, 5000), None),
+        # Not SRT port, not UDP, too short for SRT header
+        (START + 0.4, udp_over_ethernet(data_packet(1), 5000, 5001), None),
+        (START + 0.5, udp_over_ethernet(data_packet(2), protocol=6), None),
+        (START + 0.6, udp_over_ethernet(b'\0' * 8), None),
+    ])
+
+    decoded = dissector.decode(filepath, PORT)
+
+    assert list(decoded.time) == pytest.approx([START, START + 0.1, START + 0.2, START + 0.3])
+    assert list(decoded.kind) == [
+        dissector.DATA, dissector.RETRANSMITTED, dissector.CONTROL, dissector.CONTROL
+    ]
+    assert list(decoded.number) == [100, 100, 0x0002, 0x0003]
+    assert list(decoded.length) == [1472, 1472, 44, 28]
+    assert decoded.losses == [
+        (pytest.approx(START + 0.3), 101, 101),
+        (pytest.approx(START + 0.3), 105, 107),
+    ]
+
+
+def test_decode_uses_original_length_of_truncated_packets(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    data = udp_over_ethernet(data_packet(7))
+    write_pcapng(filepath, [(START, data[:80], len(data))])
+
+    decoded = dissector.decode(filepath, PORT)
+
+    assert list(decoded.number) == [7]
+    assert list(decoded.length) == [1472]
+
+
+def test_analyze_counts_each_loss_range_once():
+    decoded = dissector.DecodedCapture()
+    rows = [
+        (START, dissector.DATA, 1, 1000),
+        (START + 0.5, dissector.DATA, 2, 1000),
+        (START + 1.5, dissector.RETRANSMITTED, 2, 1000),
+        (START + 1.6, dissector.CONTROL, 0x0002, 44),
+        (START + 2.0, dissector.CONTROL, 0x0003, 24),
+    ]
+    for timestamp, kind, number, length in rows:
+        decoded.time.append(timestamp)
+        decoded.kind.append(kind)
+        decoded.number.append(number)
+        decoded.length.append(length)
+    decoded.losses = [(START + 1.0, 2, 2), (START + 1.2, 2, 2), (START + 2.0, 0x7FFFFFFF, 1)]
+
+    summary, intervals = dissector.analyze(decoded)
+
+    assert summary.data_packets == 2
+    assert summary.retransmitted_packets == 1
+    assert summary.retransmission_ratio == pytest.approx(1 / 3)
+    assert summary.control_packets == {'ack': 1, 'nak': 1}
+    assert summary.ack_rate == pytest.approx(0.5)
+    assert summary.control_overhead == pytest.approx(68 / 3068)
+    # The second range wraps around the sequence numbers
+    assert summary.loss_bursts == 2
+    assert summary.max_loss_burst == 3
+    assert summary.duration == pytest.approx(2.0)
+    assert [(stats.data, stats.retransmitted, stats.lost) for stats in intervals] == [
+        (2, 0, 0), (0, 1, 1), (0, 0, 3)
+    ]
+
+
+def test_analyze_without_packets():
+    assert dissector.analyze(dissector.DecodedCapture()) == (None, [])
+
+
+def test_handshake_durations(tmp_path):
+    filepath = tmp_path / 'capture.pcapng'
+    handshake = control_packet(0x0000, b'\0' * 48)
+    write_pcapng(filepath, [
+        (START, udp_over_ethernet(handshake, 5000, PORT), None),
+        (START + 0.01, udp_over_ethernet(handshake, PORT, 5000), None),
+        (START + 0.03, udp_over_ethernet(handshake, 5000, PORT), None),
+        (START + 0.04, udp_over_ethernet(data_packet(1), 5000, PORT), None),
+        # The peer port is reused by the next connection
+        (START + 1, udp_over_ethernet(handshake, 5000, PORT), None),
+        (START + 1.02, udp_over_ethernet(handshake, PORT, 5000), None),
+        (START + 2, udp_over_ethernet(handshake, 5001, PORT), None),
+    ])
+
+    durations = dissector.handshake_durations(filepath, PORT)
+
+    assert sorted(durations) == pytest.approx([0, 0.02, 0.03])
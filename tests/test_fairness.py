@@ -0,0 +1,53 @@
+import pytest
+
+from srt_test_runner import fairness
+
+
+def test_jain_index_of_equal_shares_is_one():
+    assert fairness.jain_index([5, 5, 5]) == pytest.approx(1)
+
+
+def test_jain_index_of_one_flow_getting_everything():
+    assert fairness.jain_index([9, 0, 0]) == pytest.approx(1 / 3)
+
+
+def test_jain_index_of_unequal_shares():
+    assert fairness.jain_index([1, 3]) == pytest.approx(16 / 20)
+
+
+def test_jain_index_is_undefined_without_throughput():
+    assert fairness.jain_index([]) is None
+    assert fairness.jain_index([0, 0]) is None
+
+
+def test_convergence_time_from_the_last_settling():
+    jain_series = [(10, 0.5), (11, 0.95), (12, 0.6), (13, 0.92), (14, 0.99), (15, 0.9)]
+
+    assert fairness.convergence_time(jain_series, 10, 0.9) == 3
+
+
+def test_convergence_time_when_fair_from_the_start():
+    jain_series = [(11, 0.99), (12, 0.98)]
+
+    assert fairness.convergence_time(jain_series, 10, 0.9) == 1
+    assert fairness.convergence_time(jain_series, 20, 0.9) == 0
+
+
+def test_convergence_time_when_index_never_settles():
+    jain_series = [(1, 0.95), (2, 0.95), (3, 0.5)]
+
+    assert fairness.convergence_time(jain_series, 0, 0.9) is None
+    assert fairness.convergence_time([(1, 0.95), (2, None)], 0, 0.9) is None
+    assert fairness.convergence_time([], 0, 0.9) is None
+
+
+def test_throughput_series_is_shifted_by_start_offset(tmp_path):
+    filepath = tmp_path / 'flow-stats-snd-0.csv'
+    filepath.write_text(
+        'Time,mbpsSendRate\n'
+        '1000,4.5\n'
+        '2010,5.0\n'
+    )
+
+    assert fairness.read_throughput_series(filepath, 10) == {11: 4.5, 12: 5.0}
+    assert fairness.read_throughput_series(tmp_path / 'missing.csv', 0) == {}
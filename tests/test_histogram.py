@@ -0,0 +1,120 @@
+import pytest
+
+from srt_test_runner import histogram
+from srt_test_runner import latency
+
+
+def test_percentiles_of_small_values_are_exact():
+    hist = histogram.Histogram()
+    for value in range(256):
+        hist.record(value)
+
+    assert hist.total == 256
+    assert hist.percentile(0) == 0
+    assert hist.percentile(50) == 127
+    assert hist.percentile(100) == 255
+
+
+def test_percentiles_of_large_values_are_within_relative_error():
+    hist = histogram.Histogram()
+    values = [1000003 * i for i in range(1, 101)]
+    for value in values:
+        hist.record(value)
+
+    for percentile in [1, 50, 90, 99]:
+        expected = values[int(percentile) - 1]
+        assert expected <= hist.percentile(percentile) <= expected * (1 + 1 / hist.sub_bucket_half)
+
+
+def test_percentile_does_not_exceed_maximum():
+    hist = histogram.Histogram()
+    hist.record(1000001)
+
+    assert hist.percentile(99.9) == 1000001
+    assert hist.max == 1000001
+
+
+def test_negative_values_are_recorded_as_zero():
+    hist = histogram.Histogram()
+    hist.record(-5)
+
+    assert hist.percentile(50) == 0
+
+
+def test_empty_histogram_has_no_percentiles():
+    assert histogram.Histogram().percentile(50) is None
+
+
+def test_merge_adds_counts():
+    a = histogram.Histogram()
+    b = histogram.Histogram()
+    a.record(10, 3)
+    b.record(20)
+    b.record(10)
+    a.merge(b)
+
+    assert a.total == 5
+    assert a.max == 20
+    assert a.percentile(80) == 10
+    assert a.percentile(100) == 20
+
+
+def test_save_load_round_trip(tmp_path):
+    rtt = histogram.Histogram()
+    snd_buffer = histogram.Histogram(sub_bucket_bits=10)
+    for value in range(0, 500000, 997):
+        rtt.record(value)
+        snd_buffer.record(value // 3)
+    filepath = tmp_path / 'latency.hist'
+    histogram.save(filepath, {'rtt': rtt, 'snd_buffer': snd_buffer})
+
+    loaded = histogram.load(filepath)
+
+    assert list(loaded) == ['rtt', 'snd_buffer']
+    for name, original in [('rtt', rtt), ('snd_buffer', snd_buffer)]:
+        assert loaded[name].sub_bucket_bits == original.sub_bucket_bits
+        assert loaded[name].counts == original.counts
+        assert loaded[name].total == original.total
+        for percentile in [50, 99, 99.9]:
+            assert loaded[name].percentile(percentile) >= original.percentile(percentile)
+
+
+def test_load_rejects_other_files(tmp_path):
+    filepath = tmp_path / 'other.hist'
+    filepath.write_bytes(b'not a histogram')
+
+    with pytest.raises(ValueError):
+        histogram.load(filepath)
+
+
+def test_latency_summary_is_in_milliseconds():
+    hist = histogram.Histogram()
+    for value in range(1000, 1001000, 1000):
+        hist.record(value)
+
+    summary = latency.LatencySummary.from_histogram(hist)
+
+    assert summary.count == 1000
+    assert summary.max == 1000
+    assert summary.p50 == pytest.approx(500, rel=0.01)
+    assert summary.p99 == pytest.approx(990, rel=0.01)
+    assert summary.low_count == []
+
+
+def test_latency_summary_lists_percentiles_of_too_few_values():
+    hist = histogram.Histogram()
+    for value in range(60):
+        hist.record(value * 1000)
+
+    summary = latency.LatencySummary.from_histogram(hist)
+
+    assert summary.p99_9 is not None
+    assert summary.low_count == [99, 99.9]
+
+
+def test_latency_summary_of_empty_histogram():
+    summary = latency.LatencySummary.from_histogram(histogram.Histogram())
+
+    assert summary.count == 0
+    assert summary.p50 is None
+    assert summary.max is None
@@ -0,0 +1,117 @@
+import pytest
+
+from srt_test_runner import generators
+from srt_test_runner import planner
+
+
+def experiment(description, time_to_stream=10, max_extra_time=None):
+    return generators.ExperimentParams(
+        None,
+        None,
+        None,
+        None,
+        1000000,
+        description,
+        time_to_stream,
+        max_extra_time
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    return planner.History.load(planner.PlannerConfig(
+        history_filepath=str(tmp_path / 'history.json'),
+        default_overhead=10
+    ))
+
+
+def test_coarse_to_fine_of_few_points():
+    assert planner.coarse_to_fine(0) == []
+    assert planner.coarse_to_fine(1) == [0]
+    assert planner.coarse_to_fine(2) == [0, 1]
+
+
+def test_coarse_to_fine_covers_ends_then_middles():
+    assert planner.coarse_to_fine(5) == [0, 4, 2, 1, 3]
+    assert planner.coarse_to_fine(9)[:5] == [0, 8, 4, 2, 6]
+
+
+@pytest.mark.parametrize('quantity', range(3, 40))
+def test_coarse_to_fine_is_a_permutation(quantity):
+    assert sorted(planner.coarse_to_fine(quantity)) == list(range(quantity))
+
+
+def test_plan_without_budget_keeps_all_points(history):
+    points = [experiment(f'exp-{i}') for i in range(4)]
+
+    exper_plan = planner.plan(points, planner.DurationEstimator(history, 1, 'serial'), planner.Budget())
+
+    assert exper_plan.points == points
+    assert exper_plan.skipped == []
+    assert exper_plan.projected == 4 * 20
+
+
+def test_plan_of_sweep_covers_the_range_within_budget(history):
+    points = [experiment(f'exp-{i}') for i in range(5)]
+
+    # Each experiment takes 10 s of streaming and 10 s of overhead
+    exper_plan = planner.plan(
+        points,
+        planner.DurationEstimator(history, 1, 'serial'),
+        planner.Budget(70),
+        sweep=True
+    )
+
+    assert [p.description for p in exper_plan.points] == ['exp-0', 'exp-2', 'exp-4']
+    assert exper_plan.skipped == ['exp-1', 'exp-3']
+    assert exper_plan.projected == 60
+    assert exper_plan.projected_all == 100
+
+
+def test_plan_of_list_keeps_the_first_points(history):
+    points = [experiment(f'exp-{i}') for i in range(5)]
+
+    exper_plan = planner.plan(
+        points,
+        planner.DurationEstimator(history, 1, 'serial'),
+        planner.Budget(70),
+        runs=2
+    )
+
+    assert [p.description for p in exper_plan.points] == ['exp-0']
+    assert exper_plan.projected == 40
+
+
+def test_estimate_uses_measured_overhead_and_extra_time(history):
+    history.add(planner.ExperimentRecord('exp-0', 10, 4, 1, 'serial', 19))
+    history.add(planner.ExperimentRecord('exp-1', 10, 0, 1, 'serial', 15))
+    history.add(planner.ExperimentRecord('exp-1', 10, 0, 8, 'parallel', 40))
+    estimator = planner.DurationEstimator(history, 1, 'serial')
+
+    assert estimator.overhead() == 5
+    assert estimator.estimate(experiment('exp-0')) == 10 + 5 + 4
+    assert estimator.estimate(experiment('exp-2')) == 10 + 5
+    assert planner.DurationEstimator(history, 8, 'parallel').overhead() == 30
+    assert planner.DurationEstimator(history, 2, 'serial').overhead() == 5
+
+
+def test_history_is_read_back(history):
+    history.add(planner.ExperimentRecord('exp-0', 10, 4, 1, 'serial', 19))
+
+    loaded = planner.History.load(history.config)
+
+    assert [record.description for record in loaded.records] == ['exp-0']
+
+
+def test_budget_caps_extra_time():
+    budget = planner.Budget(60)
+    capped = budget.cap(experiment('exp', 30), 10)
+
+    assert 0 < capped.max_extra_time <= 20
+    assert budget.cap(experiment('exp', 30, max_extra_time=5), 10).max_extra_time == 5
+    assert planner.Budget().cap(experiment('exp', 30), 10).max_extra_time is None
+
+
+def test_format_duration():
+    assert planner.format_duration(3725.4) == '1:02:05'
+    assert planner.format_duration(float('inf')) == 'unlimited'
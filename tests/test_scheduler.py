@@ -0,0 +1,104 @@
+import pytest
+
+from srt_test_runner import scheduler
+
+
+START = 1700000000
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        assert seconds > 0
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(START)
+    monkeypatch.setattr(scheduler.time, 'time', clock.time)
+    return clock
+
+
+def run(clock, fixed_rate_scheduler, durations):
+    """
+    Returns:
+        A list of (slot, time) of the iterations taking `durations` (s).
+    """
+    fired = []
+    for duration in durations:
+        slot = fixed_rate_scheduler.wait(clock.sleep)
+        fired.append((slot, clock.now))
+        clock.now += duration
+    return fired
+
+
+def test_no_drift(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(60)
+
+    fired = run(clock, fixed_rate_scheduler, [12.3, 0.1, 59.9, 30] * 250)
+
+    assert fired == [(slot, START + slot * 60) for slot in range(1000)]
+    assert fixed_rate_scheduler.missed == 0
+
+
+def test_skip_missed_slots(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(60, 'skip')
+
+    fired = run(clock, fixed_rate_scheduler, [10, 150, 10, 10])
+
+    assert fired == [(0, START), (1, START + 60), (4, START + 240), (5, START + 300)]
+    assert fixed_rate_scheduler.missed == 2
+
+
+def test_catch_up_missed_slots(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(60, 'catch-up')
+
+    fired = run(clock, fixed_rate_scheduler, [130, 1, 1, 1])
+
+    assert fired == [(0, START), (1, START + 130), (2, START + 131), (3, START + 180)]
+    assert fixed_rate_scheduler.missed == 0
+
+
+def test_catch_up_is_limited(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(60, 'catch-up')
+
+    # E.g. suspended for an hour
+    fired = run(clock, fixed_rate_scheduler, [3600, 1, 1, 1, 1, 1])
+
+    assert fired == [
+        (0, START),
+        (57, START + 3600),
+        (58, START + 3601),
+        (59, START + 3602),
+        (60, START + 3603),
+        (61, START + 3660),
+    ]
+    assert fixed_rate_scheduler.missed == 56
+
+
+def test_slightly_late_slot_is_not_missed(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(60)
+
+    fired = run(clock, fixed_rate_scheduler, [60.5, 1])
+
+    assert fired == [(0, START), (1, START + 60.5)]
+    assert fixed_rate_scheduler.missed == 0
+
+
+def test_align(clock):
+    fixed_rate_scheduler = scheduler.FixedRateScheduler(600, start=START + 1, align=True)
+
+    assert fixed_rate_scheduler.start % 600 == 0
+    assert START < fixed_rate_scheduler.start <= START + 600
+
+
+@pytest.mark.parametrize('period, policy', [(0, 'skip'), (60, 'never')])
+def test_invalid_config(period, policy):
+    with pytest.raises(ValueError):
+        scheduler.FixedRateScheduler(period, policy)
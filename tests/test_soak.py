@@ -0,0 +1,111 @@
+import os
+import pathlib
+import random
+import statistics
+
+import attr
+import pytest
+
+from srt_test_runner import soak
+
+
+def test_trend_of_a_line():
+    trend = soak.OnlineTrend()
+    for x in range(10):
+        trend.add(x, 3 * x + 5)
+
+    assert trend.count == 10
+    assert trend.slope == pytest.approx(3)
+    assert trend.value_at(0) == pytest.approx(5)
+    assert trend.value_at(9) == pytest.approx(32)
+
+
+def test_trend_matches_least_squares():
+    rng = random.Random(1)
+    xs = [i * 10.0 for i in range(1000)]
+    ys = [0.5 * x + 100 + rng.gauss(0, 20) for x in xs]
+    trend = soak.OnlineTrend()
+    for x, y in zip(xs, ys):
+        trend.add(x, y)
+
+    mean_x = statistics.mean(xs)
+    mean_y = statistics.mean(ys)
+    slope = (
+        sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        / sum((x - mean_x) ** 2 for x in xs)
+    )
+    intercept = mean_y - slope * mean_x
+    assert trend.slope == pytest.approx(slope)
+    assert trend.value_at(0) == pytest.approx(intercept)
+
+
+def test_trend_is_undefined_without_spread():
+    trend = soak.OnlineTrend()
+    assert trend.slope is None
+    trend.add(1, 10)
+    assert trend.slope is None
+    trend.add(1, 20)
+    assert trend.slope is None
+    assert trend.value_at(1) is None
+
+
+def test_trend_summary_is_per_hour():
+    trend = soak.OnlineTrend()
+    # 100 kB at the start, growing by 1 kB per minute
+    for minute in range(61):
+        trend.add(minute * 60, 100 + minute)
+
+    summary = soak.TrendSummary.from_trend(trend)
+
+    assert summary.samples == 61
+    assert summary.start == pytest.approx(100)
+    assert summary.end == pytest.approx(160)
+    assert summary.slope == pytest.approx(60)
+    assert summary.change == pytest.approx(60)
+
+
+def test_trend_summary_without_slope():
+    trend = soak.OnlineTrend()
+    trend.add(0, 1)
+
+    assert soak.TrendSummary.from_trend(trend) == soak.TrendSummary(1, None, None, None, None)
+
+
+def test_parse_process_sample():
+    stat = (
+        '4242 (srt test) messaging) S 1 4242 4242 0 -1 4194560 1500 0 0 0 '
+        '250 75 0 0 20 0 3 0 12345 1000000 2000 18446744073709551615'
+    )
+    status = 'Name:\tsrt-test-messag\nVmPeak:\t  20000 kB\nVmRSS:\t   8192 kB\nThreads:\t3\n'
+
+    assert soak.parse_process_sample(stat, status, 12) == (8192.0, 12, 325)
+
+
+def test_parse_process_sample_without_rss():
+    stat = '1 (kworker) I 2 0 0 0 -1 69238880 0 0 0 0 7 9 0 0 20 0 1 0 3 0 0'
+
+    assert soak.parse_process_sample(stat, 'Name:\tkworker\n', 0) == (None, 0, 16)
+
+
+@pytest.mark.skipif(not pathlib.Path('/proc/self/stat').exists(), reason='no procfs')
+def test_parse_process_sample_of_this_process():
+    proc = pathlib.Path(f'/proc/{os.getpid()}')
+    rss, fds, cpu_time = soak.parse_process_sample(
+        (proc / 'stat').read_text(),
+        (proc / 'status').read_text(),
+        len(os.listdir(proc / 'fd'))
+    )
+
+    assert rss > 0
+    assert fds > 0
+    assert cpu_time >= 0
+
+
+def test_soak_report_round_trip():
+    report = soak.SoakReport(
+        120,
+        {'snd0.rss': soak.TrendSummary(120, 100.0, 160.0, 60.0, 60.0)},
+        ['snd0.rss']
+    )
+
+    assert soak.SoakReport.from_dict(attr.asdict(report)) == report
@@ -0,0 +1,142 @@
+import array
+import datetime
+import math
+import os
+
+import pytest
+
+from srt_test_runner import stats
+from srt_test_runner import timeline
+
+
+# 2023-11-14 22:13:20 UTC
+START = 1700000000
+
+
+def test_save_load_round_trip(tmp_path):
+    filepath = tmp_path / 'timeline.bin'
+    arrays = {
+        'time': array.array('d', [0.0, 1.0, 2.0]),
+        'snd0.mbpsSendRate': array.array('d', [10.5, math.nan, 12.25]),
+        'rcv.msRTT': array.array('d', [1.0, 2.0, 3.0]),
+    }
+    metadata = {'description': 'test', 'sources': ['a.csv']}
+
+    timeline.save(filepath, arrays, metadata)
+    loaded_metadata, loaded = timeline.load(filepath)
+
+    assert loaded_metadata == metadata
+    assert list(loaded) == list(arrays)
+    assert list(loaded['time']) == [0.0, 1.0, 2.0]
+    assert list(loaded['rcv.msRTT']) == [1.0, 2.0, 3.0]
+    send_rate = loaded['snd0.mbpsSendRate']
+    assert send_rate[0] == 10.5 and math.isnan(send_rate[1]) and send_rate[2] == 12.25
+
+
+def test_load_selected_columns(tmp_path):
+    filepath = tmp_path / 'timeline.bin'
+    timeline.save(filepath, {
+        'time': array.array('d', [0.0, 1.0]),
+        'a': array.array('d', [1.0, 2.0]),
+        'b': array.array('d', [3.0, 4.0]),
+    }, {})
+
+    _, loaded = timeline.load(filepath, ['b'])
+
+    assert {name: list(values) for name, values in loaded.items()} == {'b': [3.0, 4.0]}
+
+
+def test_load_other_files(tmp_path):
+    filepath = tmp_path / 'timeline.bin'
+    filepath.write_bytes(b'not a timeline')
+
+    with pytest.raises(ValueError):
+        timeline.load(filepath)
+
+
+def test_timeline_to_arrays():
+    data = timeline.Timeline()
+    data.set('a', START + 0.2, 1)
+    data.set('a', START + 0.7, 2)
+    data.add('b', START + 2.1, 3)
+    data.add('b', START + 2.9, 4)
+
+    arrays = data.to_arrays()
+
+    assert list(arrays['time']) == [START, START + 1, START + 2]
+    assert list(arrays['a'])[0] == 2 and math.isnan(arrays['a'][1])
+    assert list(arrays['b'])[2] == 7
+
+
+def test_offset_at_interpolates_drift():
+    clock = timeline.ClockSync(
+        timeline.ClockOffset(START, 0.5, 0.001),
+        timeline.ClockOffset(START + 100, 0.6, 0.002)
+    )
+
+    assert clock.offset_at(START) == pytest.approx(0.5)
+    assert clock.offset_at(START + 50) == pytest.approx(0.55)
+    assert clock.offset_at(START + 200) == pytest.approx(0.7)
+
+
+def test_offset_at_with_one_measurement():
+    offset = timeline.ClockOffset(START, 0.5, 0.001)
+
+    assert timeline.ClockSync(offset, None).offset_at(START + 100) == 0.5
+    assert timeline.ClockSync(None, offset).offset_at(START - 100) == 0.5
+    assert timeline.ClockSync(offset, offset).offset_at(START + 100) == 0.5
+    assert timeline.ClockSync(None, None).offset_at(START) is None
+
+
+def test_clock_sync_save_load(tmp_path):
+    filepath = tmp_path / 'clock.json'
+    clock = timeline.ClockSync(timeline.ClockOffset(START, -0.25, 0.003), None)
+
+    clock.save(filepath)
+
+    assert timeline.ClockSync.load(filepath) == clock
+
+
+def test_parse_timepoint_on_the_closest_date():
+    utc = datetime.timezone.utc
+    reference = datetime.datetime(2023, 11, 14, 23, 59, 59, tzinfo=utc).timestamp()
+
+    assert timeline.parse_timepoint('23:59:58.500000+0000', reference) == reference - 0.5
+    # Past midnight, the next day
+    assert timeline.parse_timepoint(' 00:00:01.000000+0000', reference) == reference + 2
+    assert timeline.parse_timepoint('time', reference) is None
+
+
+def test_merge_sender_and_receiver_stats(tmp_path):
+    description = 'test'
+    stats.sender_stats_filepath(tmp_path, description).write_text(
+        'Timepoint,Time,mbpsSendRate\n'
+        '22:13:20.100000+0000,100,10\n'
+        '22:13:21.100000+0000,1100,11\n'
+    )
+    # Rows are placed on the date of the file modification
+    os.utime(stats.sender_stats_filepath(tmp_path, description), (START, START))
+    # Receiver clock is 1 s ahead
+    stats.receiver_stats_filepath(tmp_path, description).write_text(
+        'Timepoint,Time,mbpsRecvRate\n'
+        '22:13:22.100000+0000,1100,9\n'
+    )
+    timeline.ClockSync(timeline.ClockOffset(START, 1.0, 0.001), None).save(
+        timeline.clock_filepath(tmp_path, description)
+    )
+
+    filepath = timeline.merge(tmp_path, description)
+    metadata, arrays = timeline.load(filepath)
+
+    assert filepath == timeline.timeline_filepath(tmp_path, description)
+    assert metadata['sources'] == [
+        f'{description}-stats-snd-0.csv', f'{description}-stats-rcv.csv'
+    ]
+    assert list(arrays['time']) == [START, START + 1]
+    assert list(arrays['snd0.mbpsSendRate']) == [10, 11]
+    assert math.isnan(arrays['rcv.mbpsRecvRate'][0])
+    assert arrays['rcv.mbpsRecvRate'][1] == 9
+
+
+def test_merge_without_data(tmp_path):
+    assert timeline.merge(tmp_path, 'test') is None